@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 # Facilitates the work of an interface for event handling in a system.
 class AbstractEvent(ABC):
+    __slots__ = ()
 
     @abstractmethod
     def get_event_name(self):
@@ -22,4 +23,16 @@ class AbstractEvent(ABC):
         """
         Convert the event to a dictionary representation.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_event_code(self):
+        """
+        Get the integer code of the event activity, if assigned by a SymbolTable.
+        """
+        return None
+
+    def get_symbol_table(self):
+        """
+        Get the SymbolTable which assigned the codes of the event, if any.
+        """
+        return None
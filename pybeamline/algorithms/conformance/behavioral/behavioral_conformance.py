@@ -1,6 +1,8 @@
 import sys
-from collections import defaultdict
-from typing import Optional, List
+from collections import defaultdict, deque, OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional, List, Callable, Hashable, Union
 
 from typing_extensions import override
 
@@ -10,28 +12,67 @@ from pm4py.objects.petri_net.obj import PetriNet, Marking
 
 
 
-class BehavioralConformanceChecker(BaseMap[BEvent, tuple]):
+@dataclass(frozen=True)
+class FinalConformance:
+    """
+    Last conformance values of a case, emitted when the case is evicted.
+    It is not a tuple, so that it cannot be unpacked as the regular
+    (conformance, confidence, completeness, observed_events) results.
+    """
+    case_id: Hashable
+    conformance: float
+    confidence: float
+    completeness: float
 
-    def __init__(self, model):
+
+class BehavioralConformanceChecker(BaseMap[BEvent, Union[tuple, FinalConformance]]):
+
+    def __init__(self, model, max_cases: Optional[int] = None, case_ttl: Optional[timedelta] = None,
+                 is_case_end: Optional[Callable[[BEvent], bool]] = None, emit_on_eviction: bool = False):
         self.model = model
         self.observed_events = 0
-        self.bc = BehavioralConformance(M=model)
+        self.is_case_end = is_case_end
+        self._evicted: List[FinalConformance] = []
+        self.bc = BehavioralConformance(M=model, max_cases=max_cases, case_ttl=case_ttl,
+                                        on_case_evicted=self._case_evicted if emit_on_eviction else None)
+
+    def _case_evicted(self, case_id, result: Optional[tuple]) -> None:
+        if result is not None:
+            self._evicted.append(FinalConformance(case_id, *result))
 
     @override
-    def transform(self, event: BEvent) -> Optional[List[tuple]]:
+    def transform(self, event: BEvent) -> Optional[List[Union[tuple, FinalConformance]]]:
         self.observed_events += 1
         self.bc.ingest_event(event)
         case_id = event.get_trace_name()
+        results = self._evicted
         if case_id in self.bc.get_conformance():
-            return [(self.bc.get_conformance(case_id),
-                     self.bc.get_confidence(case_id),
-                     self.bc.get_completeness(case_id),
-                     self.observed_events)]
+            results.append((self.bc.get_conformance(case_id),
+                            self.bc.get_confidence(case_id),
+                            self.bc.get_completeness(case_id),
+                            self.observed_events))
+        if self.is_case_end is not None and self.is_case_end(event):
+            self.bc.close_case(case_id)
+        if results:
+            self._evicted = []
+            return results
         return None
 
 
-def behavioral_conformance(model) -> BehavioralConformanceChecker:
-    return BehavioralConformanceChecker(model)
+def behavioral_conformance(model, max_cases: Optional[int] = None, case_ttl: Optional[timedelta] = None,
+                           is_case_end: Optional[Callable[[BEvent], bool]] = None,
+                           emit_on_eviction: bool = False) -> BehavioralConformanceChecker:
+    """
+    Computes conformance, confidence and completeness of each case against a behavioral model, emitting
+    a (conformance, confidence, completeness, observed_events) tuple for each event.
+    By default the state of every case is kept forever; to bound it:
+    :param max_cases: maximum number of cases to track, the least recently updated one is evicted first
+    :param case_ttl: cases not updated for longer than this (according to the event times) are evicted
+    :param is_case_end: predicate identifying the last event of a case, after which the case is evicted
+    :param emit_on_eviction: if True, a FinalConformance with the last values of each evicted case is emitted,
+        in the same stream as the tuples: consumers tell them apart with isinstance(result, FinalConformance)
+    """
+    return BehavioralConformanceChecker(model, max_cases, case_ttl, is_case_end, emit_on_eviction)
 
 
 def mine_behavioral_model_from_stream(source) -> tuple:
@@ -56,14 +97,18 @@ def petri_net_2_behavioral_model(petri_net: PetriNet, init_marking: Marking, fin
 # Class originally developed by Magnus Frederiksen as part of his BSc project at DTU entitled
 # "Development of Process Mining and Complex Event Processing using Python"
 class BehavioralConformance:
-    def __init__(self, M=([], defaultdict(list), defaultdict(list))):
+    def __init__(self, M=([], defaultdict(list), defaultdict(list)), max_cases=None, case_ttl=None, on_case_evicted=None):
         # the input is expecting to be the model
         self.set_model(M)  # calls method to set, B, P, and F
+        self.__max_cases = max_cases  # if set, the least recently updated case is evicted beyond this number
+        self.__case_ttl = case_ttl  # if set, cases not updated for this long (in event time) are evicted
+        self.__on_case_evicted = on_case_evicted  # called with the case id and its final values, if any
+        self.__last_seen = OrderedDict()  # event time of the latest event of each case, least recent first
         self.__trace_last_event = dict()  # recalls last event for trace to find relation
         self.__conformance = dict()  # saves a traces' conformance
         self.__completeness = dict()  # saves a traces' completeness
         self.__confidence = dict()  # saves a traces' confidence
-        self.__obs = defaultdict(list)  # saves all distinct relations in a trace that has occurred
+        self.__obs = defaultdict(set)  # saves all distinct relations in a trace that has occurred
         self.__inc = dict()  # saves amount of incorrect relations according to the reference model of a trace
 
     def ingest_event(self, event):
@@ -71,6 +116,9 @@ class BehavioralConformance:
         event_name = event.get_event_name()  # easier trefermce to eventNa,e
 
         if case_id not in self.__trace_last_event:  # if this is first time caseID appears
+            if self.__max_cases is not None:
+                while self.__last_seen and len(self.__last_seen) >= self.__max_cases:
+                    self.close_case(next(iter(self.__last_seen)))
             self.__trace_last_event[case_id] = event_name  # save current event
 
             # self.__obs[caseID] = []
@@ -80,9 +128,9 @@ class BehavioralConformance:
 
             new_pattern = (self.__trace_last_event[case_id], event_name)  # locally save the relation
             # Step 1: update internal data structures
-            if new_pattern in self.__B:  # if the relation is in the approved relation list
-                if new_pattern not in self.__obs[case_id]:  # and that relation has not occurred for that caseID before
-                    self.__obs[case_id].append(new_pattern)  # save the relation to that CaseId
+            is_allowed = new_pattern in self.__B_set
+            if is_allowed:  # if the relation is in the approved relation list
+                self.__obs[case_id].add(new_pattern)  # save the relation to that CaseId, if not occurred before
             else:  # if the relation is "illegal" according to B
                 self.__inc[case_id] += 1  # increment incorrect for that caseID
 
@@ -90,7 +138,7 @@ class BehavioralConformance:
             self.__conformance[case_id] = len(self.__obs[case_id]) / (
                     len(self.__obs[case_id]) + self.__inc[case_id])  # calculated conformance
 
-            if new_pattern in self.__B:  # if the relation is legal in B
+            if is_allowed:  # if the relation is legal in B
                 # if the relation occurrence is within P_min and P_max
                 if self.__P[new_pattern][0] <= len(self.__obs[case_id]) <= self.__P[new_pattern][1]:
                     self.__completeness[case_id] = 1  # set completeness for that caseID
@@ -106,6 +154,41 @@ class BehavioralConformance:
             # Step 3: cleanup
             self.__trace_last_event[case_id] = event_name
 
+        if self.__max_cases is not None or self.__case_ttl is not None:
+            self.__touch(case_id, event.get_event_time())
+
+    def __touch(self, case_id, event_time):
+        self.__last_seen[case_id] = event_time
+        self.__last_seen.move_to_end(case_id)
+        if self.__case_ttl is not None and event_time is not None:
+            expiration = event_time - self.__case_ttl
+            while self.__last_seen:
+                oldest_case, oldest_time = next(iter(self.__last_seen.items()))
+                if oldest_time is None or oldest_time >= expiration:
+                    break
+                self.close_case(oldest_case)
+
+    def close_case(self, case_id):
+        """
+        Forgets all the state of a case.
+        :return: the last (conformance, confidence, completeness) of the case, or None if never computed
+        """
+        if case_id not in self.__trace_last_event:
+            return None
+        result = None
+        if case_id in self.__conformance:
+            result = (self.__conformance[case_id], self.__confidence.get(case_id), self.__completeness.get(case_id))
+        self.__trace_last_event.pop(case_id, None)
+        self.__conformance.pop(case_id, None)
+        self.__completeness.pop(case_id, None)
+        self.__confidence.pop(case_id, None)
+        self.__obs.pop(case_id, None)
+        self.__inc.pop(case_id, None)
+        self.__last_seen.pop(case_id, None)
+        if self.__on_case_evicted is not None:
+            self.__on_case_evicted(case_id, result)
+        return result
+
     def get_conformance(self, case_id=None):
         if case_id is None:
             return self.__conformance
@@ -126,6 +209,7 @@ class BehavioralConformance:
 
     def set_model(self, M):
         self.__B = M[0]
+        self.__B_set = set(M[0])  # for constant time lookups of the allowed relations
         self.__P = M[1]
         self.__F = M[2]
         self.__maxOfMinRelationsAfter = 0
@@ -156,11 +240,12 @@ class BehavioralModelBuilder:
 
     def __init__(self):
         self.__B = []
+        self.__B_set = set()  # same relations as B, for constant time lookups
         self.__P = dict()
         self.__F = dict()
         self.__trace_logs = defaultdict(list)
-        self.__mark = []  # used to find P_max for all relation
-        self.__mark2 = []
+        self.__starting_at = defaultdict(list)  # relations of B, indexed by their first activity
+        self.__ending_in = defaultdict(list)  # relations of B, indexed by their second activity
 
     def get_model(self):
         return self.__B, self.__P, self.__F
@@ -171,97 +256,146 @@ class BehavioralModelBuilder:
         if case_id in self.__trace_logs:  # if this caseID has occurred before
             relation = (self.__trace_logs[case_id][-1], event_name)  # find relation based on former event
             trace_length = len(self.__trace_logs[case_id]) - 1  # find the length of the trace so far
-            if relation not in self.__B:  # if this relation already exist
-                self.__B.append(relation)  # add relation
+            self.__add_relation(relation)  # add relation, if it doesn't already exist
 
         else:  # if the trace hasn't been seen yet
             self.__trace_logs[case_id] = []
 
         self.__trace_logs[case_id].append(event_name)  # add the event to the trace log
 
-    def __set_f(self, relation):
-        queue = []  # breath first search from an accepting state
-        bfs_mark = []
-        bfs_mark.append(relation)
-        queue.append((relation, 0))
+    def __add_relation(self, relation):
+        if relation not in self.__B_set:
+            self.__B.append(relation)
+            self.__B_set.add(relation)
+            self.__starting_at[relation[0]].append(relation)
+            self.__ending_in[relation[1]].append(relation)
+
+    def __set_f(self, end_relations):
+        # multi-source breath first search backwards from the accepting relations: the first visit of
+        # a relation gives its minimum distance from any of them
+        queue = deque()
+        for relation in end_relations:
+            if relation not in self.__F or self.__F[relation] != 0:
+                self.__F[relation] = 0
+                queue.append(relation)
         while len(queue) > 0:
-            ((A, B), depth) = queue.pop(0)
-            self.__F[(A, B)] = min(self.__F[(A, B)], depth)
-            for (C, D) in self.__B:
-                if D == A and (C, D) not in bfs_mark:
-                    bfs_mark.append((C, D))
-                    queue.append(((C, D), depth + 1))
-
-    def __find_p_max(self, relation, depth):
-        if relation not in self.__mark:  # brute force to find the longest path
-            self.__mark.append(relation)
-
-            (p_min, p_max) = self.__P[relation]
-            self.__P[relation] = (p_min, max(depth, p_max))
-
-            (A, B) = relation
-            for (C, D) in self.__B:
-                if C == B and depth <= 5:
-                    self.__find_p_max((C, D), depth + 1)
-
-            self.__mark.remove(relation)
-        else:
-            if relation in self.__mark2:
-                return
-            self.__mark2.append(relation)
-
-            (p_min, p_max) = self.__P[relation]
-            self.__P[relation] = (p_min, max(depth, p_max))
-            (A, B) = relation
-            for (C, D) in self.__B:
-                if C == B and depth <= 5:
-                    self.__find_p_max((C, D), depth)
-
-            self.__mark2.remove(relation)
-
-    def __set_p(self, relation):
-        queue = []  # breath first state from beggining state
-        bfs_mark = []
-        bfs_mark.append(relation)
-        queue.append((relation, 0))
+            (A, B) = queue.popleft()
+            depth = self.__F[(A, B)] + 1
+            for (C, D) in self.__ending_in.get(A, ()):
+                if self.__F[(C, D)] > depth:
+                    self.__F[(C, D)] = depth
+                    queue.append((C, D))
+
+    def __set_p(self, start_relations):
+        # P_min: multi-source breath first search from the starting relations
+        p_min = dict()
+        queue = deque()
+        for relation in start_relations:
+            if relation not in p_min:
+                p_min[relation] = 0
+                queue.append(relation)
         while len(queue) > 0:
-            ((a, b), depth) = queue.pop(0)
-            (p_min, p_max) = self.__P[(a, b)]
-            self.__P[(a, b)] = (min(depth, p_min), max(depth, p_max))
-            for (C, D) in self.__B:
-                if C == b and (C, D) not in bfs_mark:
-                    bfs_mark.append((C, D))
-                    queue.append(((C, D), depth + 1))
-
-        self.__find_p_max(relation, 0)
+            (a, b) = queue.popleft()
+            for (C, D) in self.__starting_at.get(b, ()):
+                if (C, D) not in p_min:
+                    p_min[(C, D)] = p_min[(a, b)] + 1
+                    queue.append((C, D))
+
+        # P_max: longest path from the starting relations in the condensation of the relation graph
+        p_max = self.__longest_distances(start_relations)
+        for relation, depth in p_min.items():
+            self.__P[relation] = (depth, p_max[relation])
+
+    def __longest_distances(self, start_relations):
+        # the strongly connected components of the relations reachable from the starting ones form a DAG;
+        # a path enters a component at most once and visits at most all its relations before leaving it, so
+        # it leaves at the longest distance to its entry plus its size - 1. As in the original brute-force
+        # search, the relations of a cycle also count the edge closing it once more. On acyclic models every
+        # component is a single relation and this is the plain longest path; the result does not depend on
+        # the order in which the relations were observed.
+        components = self.__strongly_connected_components(start_relations)
+        component_of = dict()
+        for position, component in enumerate(components):
+            for relation in component:
+                component_of[relation] = position
+
+        entry = [0] * len(components)  # longest distance to the first relation of the component visited by a path
+        distances = dict()
+        for position in range(len(components) - 1, -1, -1):  # Tarjan's algorithm yields them in reverse topological order
+            component = components[position]
+            depth = entry[position] + len(component) - 1
+            cyclic = len(component) > 1 or component[0] in self.__starting_at.get(component[0][1], ())
+            for relation in component:
+                distances[relation] = depth + 1 if cyclic else depth
+                for successor in self.__starting_at.get(relation[1], ()):
+                    target = component_of[successor]
+                    if target != position and entry[target] < depth + 1:
+                        entry[target] = depth + 1
+        return distances
+
+    def __strongly_connected_components(self, start_relations):
+        # iterative Tarjan's algorithm over the relations reachable from the starting ones
+        index = dict()
+        low_link = dict()
+        on_stack = set()
+        stack = []
+        components = []
+        for start in start_relations:
+            if start in index:
+                continue
+            index[start] = low_link[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(self.__starting_at.get(start[1], ())))]
+            while work:
+                relation, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = low_link[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(self.__starting_at.get(successor[1], ()))))
+                        break
+                    if successor in on_stack:
+                        low_link[relation] = min(low_link[relation], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[relation])
+                    if low_link[relation] == index[relation]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == relation:
+                                break
+                        components.append(component)
+        return components
 
     def end_xes_to_model(self):
 
-        end_state = []
-        start_state = []
+        end_state = set()
+        start_state = set()
 
         for caseID, trace in self.__trace_logs.items():
-            if trace[-1] not in end_state:
-                end_state.append(trace[-1])
-            if trace[0] not in start_state:
-                start_state.append(trace[0])
+            end_state.add(trace[-1])
+            start_state.add(trace[0])
 
         self.__set_p_and_a(start_state, end_state)
 
 
 
-    def __set_p_and_a(self, start_states: list, end_states: list):
+    def __set_p_and_a(self, start_states, end_states):
+        start_states = set(start_states)
+        end_states = set(end_states)
         for relation in self.__B:
             self.__F[relation] = sys.maxsize
             self.__P[relation] = (sys.maxsize, -1)
 
-        for (A, B) in self.__B:
-            if A in start_states:
-                self.__set_p((A, B))
-
-        for (A, B) in self.__B:
-            if B in end_states:
-                self.__set_f((A, B))
+        self.__set_p([(A, B) for (A, B) in self.__B if A in start_states])
+        self.__set_f([(A, B) for (A, B) in self.__B if B in end_states])
 
 
     def from_petri_net(self, petri_net: PetriNet, init_marking: Marking, final_marking: Marking):
@@ -272,7 +406,7 @@ class BehavioralModelBuilder:
             for t_incoming in incoming_transitions:
                 for t_outgoing in outgoing_transitions:
                     if t_incoming.label and t_outgoing.label:
-                        self.__B.append((t_incoming.label, t_outgoing.label))
+                        self.__add_relation((t_incoming.label, t_outgoing.label))
 
         start_activities = []
         for place in init_marking.keys():
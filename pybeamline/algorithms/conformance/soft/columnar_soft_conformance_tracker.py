@@ -0,0 +1,304 @@
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+
+from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport, ReportMode
+from pybeamline.algorithms.conformance.soft.soft_conformance_status import SoftConformanceStatus
+from pybeamline.models.incremental_mean import IncrementalMean
+from pybeamline.models.pdfa.compiled_pdfa import CompiledPdfa
+
+
+class ColumnarSoftConformanceTracker:
+    """
+    Alternative to SoftConformanceTracker storing the state of all the cases in preallocated
+    NumPy arrays (one slot per case) instead of one SoftConformanceStatus object per case.
+    Statuses are exposed through ColumnarSoftConformanceStatus views, created on demand;
+    a view refers to a slot and raises a KeyError once its case is evicted, while FULL and
+    DELTA reports copy the columns of the reported cases, so their views can be kept.
+    Cases are evicted in least recently updated order, as in SoftConformanceTracker.
+    """
+
+    def __init__(self, model: CompiledPdfa, max_cases_to_store: int = 1000):
+        self.model = model
+        self.max_cases_to_store = max_cases_to_store
+        self._slots: OrderedDict[str, int] = OrderedDict()  # from the least to the most recently updated
+        self._free_slots: List[int] = list(range(max_cases_to_store - 1, -1, -1))
+        self._dirty: Dict[str, None] = {}  # cases updated since the previous report, in update order
+        self._removed: Dict[str, None] = {}  # cases no longer tracked since the previous report
+
+        self.case_ids = np.empty(max_cases_to_store, dtype=object)
+        self.last_acts = np.empty(max_cases_to_store, dtype=object)
+        self.last_indices = np.full(max_cases_to_store, -1, dtype=np.int64)  # -1 if unknown to the model
+        self.last_probs = np.zeros(max_cases_to_store, dtype=np.float64)
+        self.probs = np.ones(max_cases_to_store, dtype=np.float64)
+        self.log_probs = np.ones(max_cases_to_store, dtype=np.float64)
+        self.means = np.zeros(max_cases_to_store, dtype=np.float64)
+        self.counts = np.zeros(max_cases_to_store, dtype=np.int64)
+        self.last_updates = np.zeros(max_cases_to_store, dtype=np.float64)
+        self.generations = np.zeros(max_cases_to_store, dtype=np.int64)  # incremented whenever a slot is released
+
+    def replay(self, case_id: str, new_event_name: str) -> 'ColumnarSoftConformanceStatus':
+        index = self.model.index.get(new_event_name)
+        slot = self._slots.get(case_id)
+        if slot is not None:
+            self._slots.move_to_end(case_id)
+            last_index = self.last_indices[slot]
+            if last_index >= 0 and index is not None:
+                last_prob = self.model.probabilities.item(last_index, index)
+                self.log_probs[slot] += self.model.neg_log_probabilities.item(last_index, index)
+            else:
+                last_prob = 0.0
+                self.log_probs[slot] = float("inf")
+            self.last_probs[slot] = last_prob
+            self.probs[slot] *= last_prob
+            count = self.counts[slot] + 1
+            self.counts[slot] = count
+            self.means[slot] += (last_prob - self.means[slot]) / count
+        else:
+            slot = self._allocate(case_id)
+
+        self.last_acts[slot] = new_event_name
+        self.last_indices[slot] = -1 if index is None else index
+        self.last_updates[slot] = time.time()
+        self._dirty[case_id] = None
+        return ColumnarSoftConformanceStatus(self, case_id, slot)
+
+    def _allocate(self, case_id: str) -> int:
+        if not self._free_slots:
+            oldest_case, slot = self._slots.popitem(last=False)
+            self._dirty.pop(oldest_case, None)
+            self._removed[oldest_case] = None
+            self.generations[slot] += 1
+        else:
+            slot = self._free_slots.pop()
+        self._slots[case_id] = slot
+        self._removed.pop(case_id, None)
+        self.case_ids[slot] = case_id
+        self.last_probs[slot] = 0.0
+        self.probs[slot] = 1.0
+        self.log_probs[slot] = 1.0
+        self.means[slot] = 0.0
+        self.counts[slot] = 0
+        return slot
+
+    def active_slots(self) -> np.ndarray:
+        return np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+
+    def soft_conformances(self) -> np.ndarray:
+        """
+        Returns the soft conformance of all the tracked cases, in the order of keys().
+        """
+        nodes = len(self.model.nodes)
+        if nodes == 0:
+            return np.zeros(len(self._slots), dtype=np.float64)
+        weight = self.model.weight_factor
+        best = weight + ((1.0 / nodes) * (1.0 - weight))
+        if best <= 0.0:
+            return np.zeros(len(self._slots), dtype=np.float64)
+        return self.means[self.active_slots()] / best
+
+    def get_report(self, mode: ReportMode = ReportMode.FULL) -> SoftConformanceReport:
+        """
+        Returns the statuses of the tracked cases, according to the report mode (see ReportMode).
+        Every call starts a new delta, regardless of the mode.
+        """
+        if mode == ReportMode.VIEW:
+            report = SoftConformanceReport.view(_StatusesView(self))
+        else:
+            if mode == ReportMode.DELTA:
+                case_ids = list(self._dirty)
+                slots = np.fromiter((self._slots[case_id] for case_id in case_ids), dtype=np.int64,
+                                    count=len(case_ids))
+            else:
+                case_ids = list(self._slots)
+                slots = self.active_slots()
+            report = SoftConformanceReport.backed_by(_ReportStatuses(_ColumnsCopy(self, slots), case_ids))
+            if mode == ReportMode.DELTA:
+                report.removed_keys = set(self._removed)
+        self._dirty = {}
+        self._removed = {}
+        return report
+
+    def __getitem__(self, case_id: str) -> 'ColumnarSoftConformanceStatus':
+        return ColumnarSoftConformanceStatus(self, case_id, self._slots[case_id])
+
+    def __delitem__(self, case_id: str):
+        slot = self._slots.pop(case_id, None)
+        if slot is not None:
+            self._free_slots.append(slot)
+            self._removed[case_id] = None
+            self.generations[slot] += 1
+            self.case_ids[slot] = None
+            self.last_acts[slot] = None
+        self._dirty.pop(case_id, None)
+
+    def __contains__(self, case_id: str) -> bool:
+        return case_id in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def items(self):
+        return [(case_id, self[case_id]) for case_id in self._slots]
+
+    def keys(self):
+        return self._slots.keys()
+
+    def values(self):
+        return [self[case_id] for case_id in self._slots]
+
+    def is_empty(self) -> bool:
+        return len(self._slots) == 0
+
+
+class ColumnarSoftConformanceStatus:
+    """
+    SoftConformanceStatus-compatible view over the slot of a case in a ColumnarSoftConformanceTracker
+    (or in the columns copied by one of its reports).
+    A view on the tracker raises a KeyError once its case is evicted (that is, once the slot is released);
+    use snapshot() to keep the status of a case.
+    """
+
+    __slots__ = ('_tracker', 'case_id', '_slot', '_generation')
+
+    def __init__(self, tracker: Union[ColumnarSoftConformanceTracker, '_ColumnsCopy'], case_id: str, slot: int):
+        self._tracker = tracker
+        self.case_id = case_id
+        self._slot = slot
+        self._generation = tracker.generations.item(slot)
+
+    def _checked_slot(self) -> int:
+        if self._tracker.generations.item(self._slot) != self._generation:
+            raise KeyError(f"Case {self.case_id} is no longer tracked")
+        return self._slot
+
+    @property
+    def model(self) -> CompiledPdfa:
+        return self._tracker.model
+
+    @property
+    def last_act(self) -> str:
+        return self._tracker.last_acts[self._checked_slot()]
+
+    def get_last_probability(self) -> float:
+        return self._tracker.last_probs.item(self._checked_slot())
+
+    def get_sequence_probability(self) -> float:
+        return self._tracker.probs.item(self._checked_slot())
+
+    def get_sequence_log_probability(self) -> float:
+        return self._tracker.log_probs.item(self._checked_slot())
+
+    def get_mean_probabilities(self) -> float:
+        return self._tracker.means.item(self._checked_slot())
+
+    def get_soft_conformance(self) -> float:
+        mean_local = self.get_mean_probabilities()
+        nodes = len(self.model.nodes)
+        weight = self.model.weight_factor
+
+        best = weight + ((1.0 / nodes) * (1.0 - weight))
+        return mean_local / best if best > 0.0 else 0.0
+
+    def get_last_update(self) -> datetime:
+        return datetime.fromtimestamp(self._tracker.last_updates.item(self._checked_slot()))
+
+    def get_case_id(self) -> str:
+        return self.case_id
+
+    def snapshot(self) -> SoftConformanceStatus:
+        """
+        Copies the current values of the slot into a SoftConformanceStatus, independent of the tracker.
+        """
+        tracker = self._tracker
+        slot = self._checked_slot()
+        status = SoftConformanceStatus(tracker.model, self.case_id)
+        status.last_act = tracker.last_acts[slot]
+        last_index = tracker.last_indices.item(slot)
+        status._last_index = None if last_index < 0 else last_index
+        status.last_prob = tracker.last_probs.item(slot)
+        status.prob = tracker.probs.item(slot)
+        status.log_prob = tracker.log_probs.item(slot)
+        status.mean = IncrementalMean(tracker.counts.item(slot), tracker.means.item(slot))
+        status.last_update = tracker.last_updates.item(slot)
+        return status
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, (ColumnarSoftConformanceStatus, SoftConformanceStatus))
+            and self.case_id == other.case_id
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.case_id)
+
+    def __str__(self) -> str:
+        return (
+            f"soft conformance: {self.get_soft_conformance()}, "
+            f"mean of probabilities: {self.get_mean_probabilities()}"
+        )
+
+
+class _StatusesView(Mapping):
+    # Live, read-only mapping from case ids to status views
+
+    def __init__(self, tracker: ColumnarSoftConformanceTracker):
+        self._tracker = tracker
+
+    def __getitem__(self, case_id: str) -> ColumnarSoftConformanceStatus:
+        return self._tracker[case_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tracker.keys())
+
+    def __len__(self) -> int:
+        return len(self._tracker)
+
+
+class _ColumnsCopy:
+    # Columns of the given slots of a tracker, copied at once; the i-th slot is found at position i, and
+    # positions are never released
+
+    def __init__(self, tracker: ColumnarSoftConformanceTracker, slots: np.ndarray):
+        self.model = tracker.model
+        self.last_acts = tracker.last_acts[slots]
+        self.last_indices = tracker.last_indices[slots]
+        self.last_probs = tracker.last_probs[slots]
+        self.probs = tracker.probs[slots]
+        self.log_probs = tracker.log_probs[slots]
+        self.means = tracker.means[slots]
+        self.counts = tracker.counts[slots]
+        self.last_updates = tracker.last_updates[slots]
+        self.generations = np.zeros(len(slots), dtype=np.int64)
+
+
+class _ReportStatuses(MutableMapping):
+    # Content of FULL and DELTA reports: case ids mapped to their position in the copied columns, the
+    # status views being created on access; statuses put in the report afterward are stored as they are
+
+    def __init__(self, columns: _ColumnsCopy, case_ids: List[str]):
+        self._columns = columns
+        self._content: Dict[str, Union[int, ColumnarSoftConformanceStatus, SoftConformanceStatus]] = \
+            dict(zip(case_ids, range(len(case_ids))))
+
+    def __getitem__(self, case_id: str) -> Union[ColumnarSoftConformanceStatus, SoftConformanceStatus]:
+        value = self._content[case_id]
+        if isinstance(value, int):
+            return ColumnarSoftConformanceStatus(self._columns, case_id, value)
+        return value
+
+    def __setitem__(self, case_id: str, status: Union[ColumnarSoftConformanceStatus, SoftConformanceStatus]):
+        self._content[case_id] = status
+
+    def __delitem__(self, case_id: str):
+        del self._content[case_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._content)
+
+    def __len__(self) -> int:
+        return len(self._content)
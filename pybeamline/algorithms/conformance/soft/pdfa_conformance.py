@@ -1,22 +1,25 @@
 from typing import Optional, List
 
-from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport
+from pybeamline.algorithms.conformance.soft.columnar_soft_conformance_tracker import ColumnarSoftConformanceTracker
+from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport, ReportMode
 from pybeamline.algorithms.conformance.soft.soft_conformance_tracker import SoftConformanceTracker
 from pybeamline.algorithms.conformance.soft.weights_normalizer import WeightsNormalizer
 from pybeamline.bevent import BEvent
+from pybeamline.models.pdfa.compiled_pdfa import CompiledPdfa
 from pybeamline.models.pdfa.pdfa import Pdfa
 from pybeamline.stream.base_map import BaseMap
 
 
-def soft_conformance(model: Pdfa, alpha: float, max_cases_to_store: int = 1000, result_refresh_rate = 10) -> "PdfaConformanceMapper":
-	return PdfaConformanceMapper(model, alpha, max_cases_to_store, result_refresh_rate)
+def soft_conformance(model: Pdfa, alpha: float, max_cases_to_store: int = 1000, result_refresh_rate = 10, report_mode: ReportMode = ReportMode.FULL, columnar: bool = False) -> "PdfaConformanceMapper":
+	return PdfaConformanceMapper(model, alpha, max_cases_to_store, result_refresh_rate, report_mode, columnar)
 
 
 class PdfaConformanceMapper(BaseMap[BEvent, SoftConformanceReport]):
 
-    def __init__(self, model: Pdfa, alpha: float, max_cases_to_store: int = 1000, result_refresh_rate = 10):
-        self.pdfa_conformance = PdfaConformance(model, alpha, max_cases_to_store)
+    def __init__(self, model: Pdfa, alpha: float, max_cases_to_store: int = 1000, result_refresh_rate = 10, report_mode: ReportMode = ReportMode.FULL, columnar: bool = False):
+        self.pdfa_conformance = PdfaConformance(model, alpha, max_cases_to_store, columnar)
         self.pdfa_conformance.set_results_refresh_rate(result_refresh_rate)
+        self.pdfa_conformance.set_report_mode(report_mode)
 
     def transform(self, value: BEvent) -> Optional[List[SoftConformanceReport]]:
         result = self.pdfa_conformance.ingest(value)
@@ -26,12 +29,19 @@ class PdfaConformanceMapper(BaseMap[BEvent, SoftConformanceReport]):
 
 class PdfaConformance:
 
-    def __init__(self, model: Pdfa, alpha: float, max_cases_to_store: int = 1000):
+    def __init__(self, model: Pdfa, alpha: float, max_cases_to_store: int = 1000, columnar: bool = False):
         if alpha is not None:
-            model = WeightsNormalizer.normalize(model, alpha)
-        self.tracker = SoftConformanceTracker(model, max_cases_to_store)
+            model = WeightsNormalizer.compile(model, alpha)
+        else:
+            model = CompiledPdfa.compile(model)
+        if columnar:
+            # case states kept in preallocated arrays rather than one object per case
+            self.tracker = ColumnarSoftConformanceTracker(model, max_cases_to_store)
+        else:
+            self.tracker = SoftConformanceTracker(model, max_cases_to_store)
         self.attribute_for_discovery: Optional[str] = None
         self.results_refresh_rate: int = 10
+        self.report_mode: ReportMode = ReportMode.FULL
         self._processed_events: int = 0
 
 
@@ -39,6 +49,10 @@ class PdfaConformance:
         self.results_refresh_rate = results_refresh_rate
         return self
 
+    def set_report_mode(self, report_mode: ReportMode) -> 'PdfaConformance':
+        self.report_mode = ReportMode(report_mode)
+        return self
+
     def set_attribute_for_discovery(self, attribute_for_discovery: str) -> 'PdfaConformance':
         self.attribute_for_discovery = attribute_for_discovery
         return self
@@ -59,7 +73,7 @@ class PdfaConformance:
         self._processed_events += 1
 
         if self._processed_events % self.results_refresh_rate == 0:
-            return self.tracker.get_report()
+            return self.tracker.get_report(self.report_mode)
 
         return None
 
@@ -1,13 +1,23 @@
 from collections.abc import MutableMapping
-from typing import Dict, Iterator, Optional
+from enum import Enum
+from types import MappingProxyType
+from typing import Dict, Iterator, Optional, Mapping, Set
 
 from pybeamline.algorithms.conformance.soft.soft_conformance_status import SoftConformanceStatus
 
 
+class ReportMode(Enum):
+    FULL = "full"  # copy of the statuses of all the tracked cases
+    DELTA = "delta"  # only the cases updated since the previous report, and the ones no longer tracked
+    VIEW = "view"  # read-only view over the live statuses of the tracked cases
+
+
 class SoftConformanceReport(MutableMapping):
 
     def __init__(self, *args, **kwargs):
         self._content: Dict[str, SoftConformanceStatus] = dict()
+        # in DELTA reports, the cases evicted or removed since the previous report (and not tracked again)
+        self.removed_keys: Set[str] = set()
         if args:
             if len(args) > 1:
                 raise TypeError(f"expected at most 1 arguments, got {len(args)}")
@@ -16,6 +26,24 @@ class SoftConformanceReport(MutableMapping):
         if kwargs:
             self.update(kwargs)
 
+    @classmethod
+    def view(cls, content: Mapping[str, SoftConformanceStatus]) -> 'SoftConformanceReport':
+        """
+        Returns a read-only report backed by the given mapping, without copying it.
+        """
+        report = cls()
+        report._content = MappingProxyType(content)
+        return report
+
+    @classmethod
+    def backed_by(cls, content: MutableMapping) -> 'SoftConformanceReport':
+        """
+        Returns a report backed by the given mapping, without copying it.
+        """
+        report = cls()
+        report._content = content
+        return report
+
     def __getitem__(self, key: str) -> SoftConformanceStatus:
         return self._content[key]
 
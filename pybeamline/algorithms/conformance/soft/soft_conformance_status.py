@@ -1,19 +1,22 @@
 import math
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 from pybeamline.models.incremental_mean import IncrementalMean
+from pybeamline.models.pdfa.compiled_pdfa import CompiledPdfa
 from pybeamline.models.pdfa.pdfa import Pdfa
 
 
 class SoftConformanceStatus:
 
-    def __init__(self, model: Pdfa, case_id: str):
-        self.model: Pdfa = model
+    def __init__(self, model: Union[Pdfa, CompiledPdfa], case_id: str):
+        self.model: Union[Pdfa, CompiledPdfa] = model
         self.case_id: str = case_id
 
         self.last_act: Optional[str] = None
+        self._compiled: bool = isinstance(model, CompiledPdfa)
+        self._last_index: Optional[int] = None  # index of last_act in the compiled model
         self.last_prob: float = 0.0
         self.prob: float = 1.0
         self.log_prob: float = 1.0
@@ -23,6 +26,10 @@ class SoftConformanceStatus:
 
 
     def replay_event(self, event_name: str) -> None:
+        if self._compiled:
+            self._replay_compiled_event(event_name)
+            return
+
         if self.last_act is not None:
             self.last_prob = self.model.get_sequence_probability(
                 self.last_act, event_name
@@ -41,6 +48,23 @@ class SoftConformanceStatus:
         self.last_update = time.time()
         self.last_act = event_name
 
+    def _replay_compiled_event(self, event_name: str) -> None:
+        index = self.model.index.get(event_name)
+        if self.last_act is not None:
+            if self._last_index is not None and index is not None:
+                self.last_prob = self.model.probabilities.item(self._last_index, index)
+                self.log_prob += self.model.neg_log_probabilities.item(self._last_index, index)
+            else:
+                self.last_prob = 0.0
+                self.log_prob = float("inf")
+
+            self.prob *= self.last_prob
+            self.mean.increment(self.last_prob)
+
+        self.last_update = time.time()
+        self.last_act = event_name
+        self._last_index = index
+
     def get_last_probability(self) -> float:
         return self.last_prob
 
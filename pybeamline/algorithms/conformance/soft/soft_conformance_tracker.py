@@ -1,43 +1,57 @@
-from collections import deque
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Union
 
-from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport
+from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport, ReportMode
 from pybeamline.algorithms.conformance.soft.soft_conformance_status import SoftConformanceStatus
+from pybeamline.models.pdfa.compiled_pdfa import CompiledPdfa
 from pybeamline.models.pdfa.pdfa import Pdfa
 
 
 class SoftConformanceTracker:
 
-    def __init__(self, model: Pdfa, max_cases_to_store: int = 1000):
-        self._content: Dict[str, SoftConformanceStatus] = {}
-        self._case_id_history: deque[str] = deque()
+    def __init__(self, model: Union[Pdfa, CompiledPdfa], max_cases_to_store: int = 1000):
+        # cases ordered from the least to the most recently updated
+        self._content: OrderedDict[str, SoftConformanceStatus] = OrderedDict()
+        self._dirty: Dict[str, None] = {}  # cases updated since the previous report, in update order
+        self._removed: Dict[str, None] = {}  # cases no longer tracked since the previous report
         self.model = model
         self.max_cases_to_store = max_cases_to_store
 
     def replay(self, case_id: str, new_event_name: str) -> SoftConformanceStatus:
-        if case_id in self._content:
-            cs = self._content[case_id]
+        cs = self._content.get(case_id)
+        if cs is not None:
             cs.replay_event(new_event_name)
-            try:
-                self._case_id_history.remove(case_id)
-            except ValueError:
-                pass
+            self._content.move_to_end(case_id)
         else:
-            if len(self._case_id_history) >= self.max_cases_to_store:
-                oldest_case = self._case_id_history.popleft()
-                self._content.pop(oldest_case, None)
+            if len(self._content) >= self.max_cases_to_store:
+                oldest_case, _ = self._content.popitem(last=False)
+                self._dirty.pop(oldest_case, None)
+                self._removed[oldest_case] = None
 
             cs = SoftConformanceStatus(self.model, case_id)
             cs.replay_event(new_event_name)
             self._content[case_id] = cs
-
-        self._case_id_history.append(case_id)
-
-        return self._content[case_id]
-
-    def get_report(self) -> SoftConformanceReport:
-        report = SoftConformanceReport()
-        report.put_all(self._content)
+            self._removed.pop(case_id, None)
+
+        self._dirty[case_id] = None
+        return cs
+
+    def get_report(self, mode: ReportMode = ReportMode.FULL) -> SoftConformanceReport:
+        """
+        Returns the statuses of the tracked cases, according to the report mode (see ReportMode).
+        Every call starts a new delta, regardless of the mode.
+        """
+        if mode == ReportMode.VIEW:
+            report = SoftConformanceReport.view(self._content)
+        else:
+            report = SoftConformanceReport()
+            if mode == ReportMode.DELTA:
+                report.put_all({case_id: self._content[case_id] for case_id in self._dirty})
+                report.removed_keys = set(self._removed)
+            else:
+                report.put_all(self._content)
+        self._dirty = {}
+        self._removed = {}
         return report
 
     def __getitem__(self, case_id: str) -> SoftConformanceStatus:
@@ -45,15 +59,13 @@ class SoftConformanceTracker:
 
     def __setitem__(self, case_id: str, value: SoftConformanceStatus):
         self._content[case_id] = value
-        if case_id not in self._case_id_history:
-            self._case_id_history.append(case_id)
+        self._dirty[case_id] = None
+        self._removed.pop(case_id, None)
 
     def __delitem__(self, case_id: str):
-        self._content.pop(case_id, None)
-        try:
-            self._case_id_history.remove(case_id)
-        except ValueError:
-            pass
+        if self._content.pop(case_id, None) is not None:
+            self._removed[case_id] = None
+        self._dirty.pop(case_id, None)
 
     def __contains__(self, case_id: str) -> bool:
         return case_id in self._content
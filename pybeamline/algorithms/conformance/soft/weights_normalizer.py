@@ -1,4 +1,6 @@
 from typing import Optional
+
+from pybeamline.models.pdfa.compiled_pdfa import CompiledPdfa
 from pybeamline.models.pdfa.pdfa import Pdfa
 
 class WeightsNormalizer:
@@ -26,3 +28,15 @@ class WeightsNormalizer:
                     new_pdfa.add_edge(source, target, (1 - alpha) * ratio)
 
         return new_pdfa
+
+    @staticmethod
+    def compile(pdfa: Pdfa, alpha: float) -> CompiledPdfa:
+        """
+        Same smoothing as normalize, computed directly on the dense matrix of a CompiledPdfa.
+        """
+        nodes, probabilities = CompiledPdfa.dense_matrix(pdfa)
+        if len(nodes) == 0:
+            return CompiledPdfa(nodes, probabilities, alpha)
+
+        ratio = 1.0 / len(nodes)
+        return CompiledPdfa(nodes, alpha * probabilities + (1 - alpha) * ratio, alpha)
@@ -1,63 +1,146 @@
-from typing import Optional, List, Any, Dict
-
-from pm4py.streaming.algo.conformance.temporal import algorithm as temporal_conformance_checker
-from pm4py.streaming.algo.conformance.temporal.variants.classic import TemporalProfileStreamingConformance
-from pm4py.util.typing import TemporalProfile
-
-from pybeamline.bevent import (
-	BEvent,
-	DEFAULT_NAME_KEY,
-	DEFAULT_TIMESTAMP_KEY,
-	DEFAULT_TRACEID_KEY,
-)
+import sys
+from collections import OrderedDict, defaultdict
+from typing import Optional, List, Any, Dict, Tuple, Hashable
+
+from pm4py.streaming.algo.conformance.temporal.variants.classic import Parameters
+from pm4py.util import exec_utils
+from pm4py.util.typing import TemporalProfile, TemporalProfileStreamingConfResults
+
+from pybeamline.bevent import BEvent, DEFAULT_TIMESTAMP_KEY
 from pybeamline.stream.base_map import BaseMap
 
 
-def temporal_profile_conformance(temporal_profile: TemporalProfile, parameters: Optional[Dict] = None) -> "TemporalProfileConformanceMapper":
-	if parameters is not None:
-		return TemporalProfileConformanceMapper(temporal_profile, parameters)
-	return TemporalProfileConformanceMapper(temporal_profile)
+def temporal_profile_conformance(temporal_profile: TemporalProfile, parameters: Optional[Dict] = None,
+								 max_cases: Optional[int] = None) -> "TemporalProfileConformanceMapper":
+	return TemporalProfileConformanceMapper(temporal_profile, parameters, max_cases)
 
 
 class TemporalProfileConformanceMapper(BaseMap[BEvent, Any]):
 
-	def __init__(self, temporal_profile: TemporalProfile, parameters: Optional[Dict] = None):
- 		# print("params",parameters)
-		if parameters is not None:
-			self._streaming: TemporalProfileStreamingConformance  = temporal_conformance_checker.apply(temporal_profile, parameters=parameters)
-		else:
-			self._streaming: TemporalProfileStreamingConformance = temporal_conformance_checker.apply(temporal_profile)
+	def __init__(self, temporal_profile: TemporalProfile, parameters: Optional[Dict] = None,
+				 max_cases: Optional[int] = None):
+		self._streaming = TemporalProfileConformance(temporal_profile, parameters, max_cases)
 		self._processed_events: int = 0
 
 	def transform(self, value: BEvent) -> Optional[List[Any]]:
-		ev = self._b_event_to_pm4py_event(value)
-		self._streaming.receive(ev)
+		deviations = self._streaming.ingest_event(value)
 		self._processed_events += 1
-		res = self._streaming.get()
-		# print('res:', res)
-		return [res] if res is not None else None
+		# Only the deviations raised by the event are emitted (none as an empty result), the deviations of all the
+		# cases are available through get_deviations()
+		return [{str(value.get_trace_name()): deviations} if deviations else {}]
 
 	def get_processed_event_num(self) -> int:
 		return self._processed_events
 
-	@staticmethod
-	def _b_event_to_pm4py_event(e: BEvent) -> dict:
-		ev = {
-			DEFAULT_NAME_KEY: e.get_event_name(),
-			DEFAULT_TIMESTAMP_KEY: e.get_event_time(),
-			f"case:{DEFAULT_TRACEID_KEY}": e.get_trace_name(),
-		}
-		start_keys = {"start_timestamp", "start:timestamp", "time:start"}
-		for sk in start_keys:
-			if sk in e.event_attributes:
-				ev["start_timestamp"] = e.event_attributes[sk]
-				break
+	def get_deviations(self, case: Optional[Hashable] = None) -> TemporalProfileStreamingConfResults:
+		return self._streaming.get_deviations(case)
+
+
+# Attributes holding the start timestamp of an event, all accepted when one of them is given as START_TIMESTAMP_KEY
+_START_TIMESTAMP_KEYS = ("start_timestamp", "start:timestamp", "time:start")
+
+
+class TemporalProfileConformance:
+	"""
+	Temporal conformance checking at runtime (Stertz et al., 2020) as in pm4py's
+	TemporalProfileStreamingConformance, reading activity, case and timestamps directly from the
+	BEvents: every event is compared with all the previous events of its case for which the
+	temporal profile has an entry, and a deviation is recorded when the time elapsed is outside
+	mean +- zeta * std.
+	The profile is compiled into, for each activity, the bounds towards its predecessors, and each
+	case keeps the end times of its events per activity, so only the relevant previous events are
+	visited. If max_cases is set, the least recently updated case (with its deviations) is
+	forgotten once more cases are observed.
+	"""
+
+	def __init__(self, temporal_profile: TemporalProfile, parameters: Optional[Dict] = None,
+				 max_cases: Optional[int] = None):
+		if parameters is None:
+			parameters = {}
+		self.zeta = exec_utils.get_param_value(Parameters.ZETA, parameters, 6.0)
+		# The start timestamp is read from the attributes of the event only if a key is given, as pm4py
+		# otherwise uses the timestamp of the event
+		self.start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters, None)
+		if self.start_timestamp_key == DEFAULT_TIMESTAMP_KEY:
+			self.start_timestamp_key = None
+		if self.start_timestamp_key is None:
+			self._start_timestamp_keys: Tuple[str, ...] = ()
+		elif self.start_timestamp_key in _START_TIMESTAMP_KEYS:
+			self._start_timestamp_keys = _START_TIMESTAMP_KEYS
+		else:
+			self._start_timestamp_keys = (self.start_timestamp_key,)
+		self.max_cases = max_cases
+
+		# activity -> list of (previous activity, mean, std, lower bound, upper bound)
+		self._bounds: Dict[str, List[Tuple[str, float, float, float, float]]] = defaultdict(list)
+		for (a, b), (mean, std) in temporal_profile.items():
+			self._bounds[b].append((a, mean, std, mean - self.zeta * std, mean + self.zeta * std))
+
+		self._cases: OrderedDict[str, _CaseHistory] = OrderedDict()  # from the least to the most recently updated
+		self._deviations: Dict[str, List[Tuple[str, str, str, float, float]]] = dict()
+
+	def ingest_event(self, event: BEvent) -> List[Tuple[str, str, str, float, float]]:
+		"""
+		Checks the event against the previous events of its case and returns the deviations it raised.
+		"""
+		case = str(event.get_trace_name())
+		activity = str(event.get_event_name())
+		end_timestamp = event.get_event_time().timestamp()
+		start_timestamp = end_timestamp
+		if self._start_timestamp_keys:
+			attributes = event.event_attributes
+			for key in self._start_timestamp_keys:
+				start = attributes.get(key)
+				if start is not None:
+					start_timestamp = start.timestamp()
+					break
+
+		history = self._cases.get(case)
+		if history is None:
+			if self.max_cases is not None and len(self._cases) >= self.max_cases:
+				oldest_case, _ = self._cases.popitem(last=False)
+				self._deviations.pop(oldest_case, None)
+			history = _CaseHistory()
+			self._cases[case] = history
+		else:
+			self._cases.move_to_end(case)
+		end_times = history.end_times
+
+		found = []
+		for previous_activity, mean, std, lower, upper in self._bounds.get(activity, ()):
+			for previous_position, previous_end in end_times.get(previous_activity, ()):
+				if start_timestamp >= previous_end:
+					diff = start_timestamp - previous_end
+					if diff < lower or diff > upper:
+						this_zeta = abs(diff - mean) / std if std > 0 else sys.maxsize
+						found.append((previous_position, (case, previous_activity, activity, diff, this_zeta)))
+		deviations = []
+		if found:
+			# Deviations are reported in the order of the previous events, as pm4py does
+			found.sort(key=lambda deviation: deviation[0])
+			deviations = [deviation for _, deviation in found]
+			self._deviations.setdefault(case, []).extend(deviations)
+
+		times = end_times.get(activity)
+		if times is None:
+			end_times[activity] = times = []
+		times.append((history.events, end_timestamp))
+		history.events += 1
+		return deviations
 
-		protected_keys = {DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY, "start_timestamp"}
-		for k, v in e.event_attributes.items():
-			if k not in protected_keys and k not in start_keys:
-				ev[k] = v
+	def get_deviations(self, case: Optional[Hashable] = None) -> TemporalProfileStreamingConfResults:
+		"""
+		Returns the deviations of all the cases with at least one deviation, or of the given case.
+		"""
+		if case is not None:
+			return {str(case): list(self._deviations[str(case)])} if str(case) in self._deviations else {}
+		return {case: list(deviations) for case, deviations in self._deviations.items()}
 
-		return ev
 
+class _CaseHistory:
+	# Events of a case: their number and, per activity, the (position, end time) of its occurrences
+	__slots__ = ('events', 'end_times')
 
+	def __init__(self):
+		self.events = 0
+		self.end_times: Dict[str, List[Tuple[int, float]]] = dict()
@@ -1,4 +1,5 @@
 import math
+from collections import defaultdict
 from typing import Dict, Tuple, Set, Optional, List
 
 from pybeamline.boevent import BOEvent
@@ -46,11 +47,24 @@ class ActivityEntityRelationMinerLossyCountingMapper(BaseMap[BOEvent, AER]):
 
 
 class ActivityEntityRelationMinerLossyCounting:
+    """
+    Counts, per activity and pair of object types, the cardinalities observed in the events (with
+    lossy counting) and keeps the dominant cardinality of every relation up to date. The model is
+    rebuilt only for the activities that changed since the previous call to get_model, and the same
+    AER is returned as long as nothing changes: the models returned share their unchanged parts and
+    should therefore be treated as read-only.
+    """
+
     def __init__(self, max_approx_error: float = 0.001, control_flow: Optional[Set[str]] = None):
         self.__control_flow = control_flow
         self.__D_C: Dict[str, Dict[Tuple[str, str], Dict[Cardinality, Tuple[int, int]]]] = {}
         self.__D_O: Dict[str, Set[str]] = {}
         self.__D_N: Dict[str, int] = {}
+        self.__dominant: Dict[str, Dict[Tuple[str, str], Cardinality]] = {}  # most frequent cardinality of each relation
+        self.__changed: Set[str] = set()  # activities changed since the last model
+        self.__model_object_types: Dict[str, Set[str]] = {}
+        self.__model_relations: Dict[str, Dict[Tuple[str, str], Cardinality]] = {}
+        self.__model: Optional[AER] = None
         self.__observed_events = 1
         self.__bucket_width = int(1 / max_approx_error)
 
@@ -61,31 +75,56 @@ class ActivityEntityRelationMinerLossyCounting:
         self.__D_N[activity] = self.__D_N.get(activity, 0) + 1
 
         current_bucket = math.ceil(self.__D_N[activity] / self.__bucket_width)
-        obj_types = [t for t in omap if not self.__control_flow or t in self.__control_flow]
+        # Sorted once, so that every pair below is already in the order of the relation keys
+        obj_types = sorted(t for t in omap if not self.__control_flow or t in self.__control_flow)
 
-        self.__D_O.setdefault(activity, set()).update(obj_types)
+        activity_types = self.__D_O.get(activity)
+        if activity_types is None:
+            activity_types = self.__D_O[activity] = set()
+            self.__changed.add(activity)
+        if len(activity_types) < len(obj_types) or not activity_types.issuperset(obj_types):
+            activity_types.update(obj_types)
+            self.__changed.add(activity)
 
         if len(obj_types) >= 2:
             rel_map = self.__D_C.setdefault(activity, {})
+            dominant = self.__dominant.setdefault(activity, {})
+            counts = [len(omap[t]) for t in obj_types]
             for i in range(len(obj_types)):
+                type1, count1 = obj_types[i], counts[i]
                 for j in range(i + 1, len(obj_types)):
-                    type1, type2 = sorted([obj_types[i], obj_types[j]])
-                    key = (type1, type2)
-                    count1, count2 = len(omap[type1]), len(omap[type2])
-                    card = infer_cardinality(count1, count2)
+                    key = (type1, obj_types[j])
+                    card = infer_cardinality(count1, counts[j])
 
-                    card_map = rel_map.setdefault(key, {})
+                    card_map = rel_map.get(key)
+                    if card_map is None:
+                        card_map = rel_map[key] = {}
                     if card in card_map:
                         freq, delta = card_map[card]
                         card_map[card] = (freq + 1, delta)
                     else:
                         card_map[card] = (1, current_bucket)
 
+                    current = dominant.get(key)
+                    if current != card and (current is None or card_map[card][0] >= card_map[current][0]):
+                        self.__update_dominant(activity, key, card_map)
+
         if self.__D_N[activity] % self.__bucket_width == 0:
             self._cleanup(current_bucket, activity)
 
         self.__observed_events+= 1
 
+    def __update_dominant(self, activity: str, key: Tuple[str, str], card_map: Dict[Cardinality, Tuple[int, int]]):
+        # Ties go to the cardinality observed first, in the order of the counts
+        dominant = self.__dominant[activity]
+        card = max(card_map.items(), key=lambda kv: kv[1][0])[0] if card_map else None
+        if dominant.get(key) != card:
+            if card is None:
+                del dominant[key]
+            else:
+                dominant[key] = card
+            self.__changed.add(activity)
+
     def _cleanup(self, current_bucket: int, activity: str):
         if activity not in self.__D_C:
             return
@@ -95,20 +134,28 @@ class ActivityEntityRelationMinerLossyCounting:
             to_remove_cards = [c for c, (freq, delta) in card_map.items() if freq + delta <= current_bucket]
             for c in to_remove_cards:
                 del card_map[c]
+            if to_remove_cards:
+                self.__update_dominant(activity, key, card_map)
 
     def get_model(self) -> AER:
-        diagram = AER()
-        for activity, obj_types in self.__D_O.items():
-            diagram.add_object_types(activity, obj_types)
-
-        for activity, rel_map in self.__D_C.items():
-            for (obj1, obj2), card_map in rel_map.items():
-                most_common_card = max(card_map.items(), key=lambda kv: kv[1][0])[0]
-                diagram.add_relation(activity, obj1, obj2, most_common_card)
-
-        return diagram
+        if self.__model is not None and not self.__changed:
+            return self.__model
+
+        for activity in self.__changed:
+            self.__model_object_types[activity] = set(self.__D_O[activity])
+            rel_map = self.__D_C.get(activity)
+            dominant = self.__dominant.get(activity)
+            if dominant:
+                # In the order of the relations, as they were first observed
+                self.__model_relations[activity] = {key: dominant[key] for key in rel_map if key in dominant}
+            else:
+                self.__model_relations.pop(activity, None)
+        self.__changed = set()
+
+        self.__model = AER(activities=set(self.__D_O),
+                           object_types=defaultdict(set, self.__model_object_types),
+                           relations=defaultdict(dict, self.__model_relations))
+        return self.__model
 
     def observed_events(self) -> int:
         return self.__observed_events
-
-
@@ -0,0 +1,31 @@
+from typing import Union
+
+from pybeamline.abstractevent import AbstractEvent
+from pybeamline.bevent import BEvent
+from pybeamline.boevent import BOEvent, FlattenedBOEvent
+
+
+def to_case_event(value: AbstractEvent) -> Union[BEvent, FlattenedBOEvent]:
+    """
+    Returns the event as seen by the case-based miners, with a single case id.
+    A BOEvent must be flattened (one object): it is wrapped into a BEvent with the object id as case id.
+    """
+    if isinstance(value, FlattenedBOEvent):
+        # Already exposes the object id as case id
+        return value
+    if isinstance(value, BOEvent):
+        # Verify that the event is flattened
+        if len(value.get_object_ids()) != 1:
+            raise ValueError("BOEvent should be flattened before supplied to miner")
+        # Wrapping BOEvent into BEvent
+        trace_name = value.get_object_ids()[0]
+        event = BEvent(
+            activity_name=value.get_event_name(),
+            case_id=trace_name,
+            event_time=value.get_event_time()
+        )
+        event.set_codes(value.get_event_code(), value.get_symbol_table())
+        return event
+    elif isinstance(value, BEvent):
+        return value
+    raise TypeError(f"Unsupported event type: {type(value)}")
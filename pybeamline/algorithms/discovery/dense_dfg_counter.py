@@ -0,0 +1,51 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+class DenseDfgCounter:
+    """
+    Directly-follows counts stored in a square NumPy matrix indexed by activity codes
+    (see SymbolTable). The matrix grows geometrically as new activities are observed and
+    the maximum count is maintained on every increment, so that the relative frequencies
+    can be thresholded with a single vectorized comparison.
+    """
+
+    def __init__(self, initial_size: int = 16):
+        self.counts = np.zeros((max(initial_size, 1),) * 2, dtype=np.int64)
+        self.size = 0  # number of activity codes in use
+        self.max_count = 0
+
+    def _grow(self, code: int) -> None:
+        capacity = self.counts.shape[0]
+        if code >= capacity:
+            new_capacity = max(2 * capacity, code + 1)
+            counts = np.zeros((new_capacity, new_capacity), dtype=np.int64)
+            counts[:capacity, :capacity] = self.counts
+            self.counts = counts
+        self.size = code + 1
+
+    def increment(self, source: int, target: int) -> None:
+        if source >= self.size or target >= self.size:
+            self._grow(max(source, target))
+        count = self.counts[source, target] + 1
+        self.counts[source, target] = count
+        if count > self.max_count:
+            self.max_count = int(count)
+
+    def get_count(self, source: int, target: int) -> int:
+        if source >= self.size or target >= self.size:
+            return 0
+        return int(self.counts[source, target])
+
+    def relative_frequencies(self, min_relative_frequency: float) -> Dict[Tuple[int, int], float]:
+        """
+        Returns the relations whose count, relative to the maximum one, is above the threshold.
+        """
+        if self.max_count == 0:
+            return {}
+        counts = self.counts[:self.size, :self.size]
+        relative = counts / self.max_count
+        sources, targets = np.nonzero((relative > min_relative_frequency) & (counts > 0))
+        values = relative[sources, targets]
+        return {(s, t): v for s, t, v in zip(sources.tolist(), targets.tolist(), values.tolist())}
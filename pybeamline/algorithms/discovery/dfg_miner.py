@@ -1,42 +1,90 @@
+from pybeamline.algorithms.discovery.dense_dfg_counter import DenseDfgCounter
 from pybeamline.bevent import BEvent
 from typing import Optional, List, Tuple, Dict
 
 from pybeamline.stream.base_map import BaseMap
+from pybeamline.symbol_table import SymbolTable
 
 
-def simple_dfg_miner(model_update_frequency=10,min_relative_frequency=0.75) -> BaseMap[BEvent, Tuple[int, Dict]]:
-    return SimpleDfgMiner(model_update_frequency=model_update_frequency, min_relative_frequency=min_relative_frequency)
+def simple_dfg_miner(model_update_frequency=10,min_relative_frequency=0.75, symbol_table: Optional[SymbolTable] = None, backend: str = "dict") -> BaseMap[BEvent, Tuple[int, Dict]]:
+    """
+    Discovers a directly-follows graph, emitting every `model_update_frequency` events the relations
+    whose frequency, relative to the most frequent one, is above `min_relative_frequency`.
+    :param backend: "dict" stores the counts in a dictionary, "dense" in a NumPy matrix indexed by
+        activity codes, which is faster on processes with many relations and frequent model updates
+    """
+    return SimpleDfgMiner(model_update_frequency=model_update_frequency, min_relative_frequency=min_relative_frequency, symbol_table=symbol_table, backend=backend)
 
 
 class SimpleDfgMiner(BaseMap[BEvent, Tuple[int, Dict]]):
 
-    def __init__(self,  model_update_frequency=10, min_relative_frequency=0.75):
+    def __init__(self,  model_update_frequency=10, min_relative_frequency=0.75, symbol_table: Optional[SymbolTable] = None, backend: str = "dict"):
+        if backend not in ("dict", "dense"):
+            raise ValueError(f"Unsupported backend: {backend}")
         self.model_update_frequency = max(model_update_frequency, 2)
         self.min_relative_frequency = min_relative_frequency
+        if backend == "dense" and symbol_table is None:
+            symbol_table = SymbolTable()  # the dense counter needs activity codes
+        self.symbol_table = symbol_table  # if set, activities are keyed by their codes
         self.latest_event = dict()  # latest event for each case
         self.complete_dfg = dict()  # dfg: tuple -> frequency
+        self.dense_dfg = DenseDfgCounter() if backend == "dense" else None
         self.observed_events = 0
 
+    def _keys(self, event: BEvent) -> Tuple:
+        if self.symbol_table is not None:
+            return self.symbol_table.activity_code(event), event.get_trace_name()
+        return event.get_event_name(), event.get_trace_name()
+
     def transform(self, event: BEvent) -> Optional[List[Tuple[int, Dict]]]:
-        activity_name = event.get_event_name()
-        case_id = event.get_trace_name()
+        if self._ingest(event):
+            return self._get_model()
+        return None
+
+    def transform_batch(self, events: List[BEvent]) -> Optional[List[Tuple[int, Dict]]]:
+        ingest = self._ingest
+        results = []
+        for event in events:
+            if ingest(event):
+                model = self._get_model()
+                if model is not None:
+                    results.extend(model)
+        return results
+
+    def _ingest(self, event: BEvent) -> bool:
+        """
+        Updates the directly-follows counts with the event.
+        :return: True if a model is to be emitted after the event
+        """
+        activity_name, case_id = self._keys(event)
 
-        if case_id in self.latest_event:
-            relation = (self.latest_event[case_id], activity_name)
-            if relation in self.complete_dfg:
-                self.complete_dfg[relation] += 1
+        latest_event = self.latest_event
+        if case_id in latest_event:
+            if self.dense_dfg is not None:
+                self.dense_dfg.increment(latest_event[case_id], activity_name)
             else:
-                self.complete_dfg[relation] = 1
-        self.latest_event[case_id] = activity_name
+                relation = (latest_event[case_id], activity_name)
+                complete_dfg = self.complete_dfg
+                complete_dfg[relation] = complete_dfg.get(relation, 0) + 1
+        latest_event[case_id] = activity_name
 
         self.observed_events += 1
-        if self.observed_events % self.model_update_frequency == 0 and len(self.complete_dfg) > 0:
+        return self.observed_events % self.model_update_frequency == 0
+
+    def _get_model(self) -> Optional[List[Tuple[int, Dict]]]:
+        if self.dense_dfg is not None:
+            if self.dense_dfg.max_count > 0:
+                decode = self.symbol_table.decode_activity
+                m = self.dense_dfg.relative_frequencies(self.min_relative_frequency)
+                return [(self.observed_events, {(decode(a), decode(b)): v for (a, b), v in m.items()})]
+            return None
+        if len(self.complete_dfg) > 0:
             max_frequency = max(self.complete_dfg.values())
             if max_frequency > 0:
                 m = {k: v / max_frequency for k, v in self.complete_dfg.items() if
                      v / max_frequency > self.min_relative_frequency}
+                if self.symbol_table is not None:
+                    decode = self.symbol_table.decode_activity
+                    m = {(decode(a), decode(b)): v for (a, b), v in m.items()}
                 return [(self.observed_events, m)]
         return None
-
-
-
@@ -4,66 +4,86 @@ from pm4py.objects.heuristics_net.obj import HeuristicsNet
 from typing_extensions import override
 
 from pybeamline.abstractevent import AbstractEvent
-from pybeamline.bevent import BEvent
+from pybeamline.algorithms.discovery.case_events import to_case_event
+from pybeamline.algorithms.discovery.incremental_heuristics_net import IncrementalHeuristicsNet
 from typing import Optional, List
-from pybeamline.boevent import BOEvent
 from pybeamline.stream.base_map import BaseMap
+from pybeamline.symbol_table import SymbolTable
 
 def heuristics_miner_lossy_counting(
         model_update_frequency=10,
         max_approx_error=0.001,
         dependency_threshold=0.5,
-        and_threshold=0.8) -> BaseMap[AbstractEvent, HeuristicsNet]:
+        and_threshold=0.8,
+        symbol_table: Optional[SymbolTable] = None,
+        emit_on_change=False) -> BaseMap[AbstractEvent, HeuristicsNet]:
+    """
+    :param emit_on_change: if True, every `model_update_frequency` events a model is emitted only if its
+        structure (edges and AND splits/joins) changed since the previous emission
+    """
     return HeuristicsMinerLossyCountingMapper(
         model_update_frequency=model_update_frequency,
         max_approx_error=max_approx_error,
         dependency_threshold=dependency_threshold,
-        and_threshold=and_threshold)
+        and_threshold=and_threshold,
+        symbol_table=symbol_table,
+        emit_on_change=emit_on_change)
 
 
 class HeuristicsMinerLossyCountingMapper(BaseMap[AbstractEvent, HeuristicsNet]):
 
-    def __init__(self, model_update_frequency=10,max_approx_error=0.001,dependency_threshold=0.5,and_threshold=0.85):
+    def __init__(self, model_update_frequency=10,max_approx_error=0.001,dependency_threshold=0.5,and_threshold=0.85,
+                 symbol_table: Optional[SymbolTable] = None, emit_on_change=False):
         self.model_update_frequency = model_update_frequency
+        self.emit_on_change = emit_on_change
         self.hm = HeuristicsMinerLossyCounting(
             max_approx_error=max_approx_error,
             dependency_threshold=dependency_threshold,
-            and_threshold=and_threshold)
+            and_threshold=and_threshold,
+            symbol_table=symbol_table,
+            track_changes=emit_on_change)
 
 
     @override
     def transform(self, value: AbstractEvent) -> Optional[List[HeuristicsNet]]:
-        if isinstance(value, BOEvent):
-            # Verify that the event is flattened
-            if len(value.get_object_ids()) != 1:
-                raise ValueError("BOEvent should be flattened before supplied to miner")
-            # Wrapping BOEvent into BEvent
-            trace_name = value.get_object_ids()[0]
-            b_event = BEvent(
-                activity_name=value.get_event_name(),
-                case_id=trace_name,
-                event_time=value.get_event_time()
-            )
-            self.hm.ingest_event(b_event)
-
-        elif isinstance(value, BEvent):
-            self.hm.ingest_event(value)
-        else:
-            raise TypeError(f"Unsupported event type: {type(value)}")
+        self.hm.ingest_event(to_case_event(value))
 
         if self.hm.observed_events() % self.model_update_frequency == 0:
-            return [self.hm.get_model()]
+            if not self.emit_on_change or self.hm.model_changed():
+                return [self.hm.get_model()]
         return None
 
+    @override
+    def transform_batch(self, values: List[AbstractEvent]) -> Optional[List[HeuristicsNet]]:
+        hm = self.hm
+        ingest_event = hm.ingest_event
+        model_update_frequency = self.model_update_frequency
+        emit_on_change = self.emit_on_change
+        results = []
+        for value in values:
+            ingest_event(to_case_event(value))
+            if hm.observed_events() % model_update_frequency == 0:
+                if not emit_on_change or hm.model_changed():
+                    results.append(hm.get_model())
+        return results
+
 # Class originally developed by Magnus Frederiksen as part of his BSc project at DTU entitled
 # "Development of Process Mining and Complex Event Processing using Python"
 class HeuristicsMinerLossyCounting:
-    def __init__(self, max_approx_error=0.1, dependency_threshold=0.0, and_threshold=0.8):
+    def __init__(self, max_approx_error=0.1, dependency_threshold=0.0, and_threshold=0.8, symbol_table=None, track_changes=False):
         self.__minimum_dependency_threshold = dependency_threshold  # set dependency threshold to be added to the model
         self.__and_threshold = and_threshold  # set the "and" threshold for when 2 edges leave a node on model
+        self.__symbol_table = symbol_table  # if set, activities are stored by their codes
+        # if set, the structure of the model is kept up to date with the relation counts
+        self.__net = IncrementalHeuristicsNet(dependency_threshold, and_threshold) if track_changes else None
 
         self.__D_C = dict()  # set of event
         self.__D_R = dict()  # set of relations
+        # entries indexed by the bucket in which they expire (frequency + bucket), so that a
+        # bucket cleaning only visits the entries to delete
+        self.__D_C_expiry = dict()
+        self.__D_R_expiry = dict()
+        self.__cleaned_bucket = 0  # last bucket whose expired entries were deleted
         self.__observed_events = 1
         self.__bucket_width = int(math.ceil(1 / max_approx_error))  # set bucket width
         self.__modelRefreshRate = self.__bucket_width  # default model refreshrate
@@ -71,13 +91,20 @@ class HeuristicsMinerLossyCounting:
     def ingest_event(self, event):
         current_bucket = int(math.ceil(self.__observed_events / self.__bucket_width))  # calculated bucket
 
-        if event.get_trace_name() in self.__D_C:  # if caseID already exist
-            last_event = self.__D_C[event.get_trace_name()]  # localy save former event
+        case_id = event.get_trace_name()
+        if self.__symbol_table is not None:
+            activity = self.__symbol_table.activity_code(event)
+        else:
+            activity = event.get_event_name()
+
+        if case_id in self.__D_C:  # if caseID already exist
+            last_event = self.__D_C[case_id]  # localy save former event
 
-            del self.__D_C[event.get_trace_name()]  # replace caseID's former event with new event
-            self.__D_C[event.get_trace_name()] = [event.get_event_name(), last_event[1] + 1, last_event[2], event.get_event_time()]
+            del self.__D_C[case_id]  # replace caseID's former event with new event
+            self.__D_C[case_id] = [activity, last_event[1] + 1, last_event[2], event.get_event_time()]
+            self.__move_expiry(self.__D_C_expiry, case_id, last_event[1] + last_event[2])
 
-            r_N = (last_event[0], event.get_event_name())  # save relation localy
+            r_N = (last_event[0], activity)  # save relation localy
 
             if r_N in self.__D_R:  # if relation exists in set
                 last_relation = self.__D_R[r_N]  # localy save former relation
@@ -87,38 +114,60 @@ class HeuristicsMinerLossyCounting:
                 new_time = last_relation[2] + (diff / (last_relation[0] + 1))
 
                 self.__D_R[r_N] = [last_relation[0] + 1, last_relation[1], new_time]
+                self.__move_expiry(self.__D_R_expiry, r_N, last_relation[0] + last_relation[1])
             else:  # the relation doesent exist, create it
                 self.__D_R[r_N] = (1, current_bucket - 1, event.get_event_time() - last_event[3])
+                self.__D_R_expiry.setdefault(current_bucket, set()).add(r_N)
+
+            if self.__net is not None:
+                self.__net.set_count(r_N, self.__D_R[r_N][0])
 
         else:  # caseID doesn't exist, create it
-            self.__D_C[event.get_trace_name()] = (event.get_event_name(), 1, current_bucket - 1, event.get_event_time())
+            self.__D_C[case_id] = (activity, 1, current_bucket - 1, event.get_event_time())
+            self.__D_C_expiry.setdefault(current_bucket, set()).add(case_id)
 
-        # bucket cleaning time
+        # bucket cleaning time: delete the entries with frequency + bucket <= current_bucket
         if self.__observed_events % self.__bucket_width == 0.0:
-            # the 2 lists are needed to avoid messing with the coming loops
-            D_C_del = []
-            D_R_del = []
-
-            for caseID, (eventName, frequency, bucket, time) in self.__D_C.items():
-                if frequency + bucket <= current_bucket:  # if not above the error threshold on all events occured
-                    D_C_del.append(caseID)
-
-            for caseID in D_C_del:  # deleted the event
-                del self.__D_C[caseID]
+            for expiry in range(self.__cleaned_bucket + 1, current_bucket + 1):
+                for caseID in self.__D_C_expiry.pop(expiry, ()):  # deleted the event
+                    del self.__D_C[caseID]
 
-            for relation, (frequency, bucket, time) in self.__D_R.items():
-                if frequency + bucket <= current_bucket:  # if not above the error threshold of all relations
-                    D_R_del.append(relation)
-
-            for relation in D_R_del:  # delete the relations
-                del self.__D_R[relation]
+                for relation in self.__D_R_expiry.pop(expiry, ()):  # delete the relations
+                    del self.__D_R[relation]
+                    if self.__net is not None:
+                        self.__net.remove(relation)
+            self.__cleaned_bucket = current_bucket
 
         self.__observed_events += 1
 
+    @staticmethod
+    def __move_expiry(index, key, expiry):
+        # the frequency of the entry has been incremented, so it now expires one bucket later
+        entries = index[expiry]
+        entries.discard(key)
+        if not entries:
+            del index[expiry]
+        index.setdefault(expiry + 1, set()).add(key)
+
+    def model_changed(self):
+        """
+        Returns True if the structure of the model changed since the previous call.
+        Requires the miner to be created with track_changes=True.
+        """
+        if self.__net is None:
+            raise ValueError("Changes are tracked only if the miner is created with track_changes=True")
+        return self.__net.refresh()
+
     def get_model(self):
+        if self.__net is not None:
+            decode = self.__symbol_table.decode_activity if self.__symbol_table is not None else None
+            return self.__net.get_model(decode)
         dfg = dict()
         for (A, B), (frequency, bucket, time) in self.__D_R.items():
             dfg[(A, B)] = frequency
+        if self.__symbol_table is not None:
+            decode = self.__symbol_table.decode_activity
+            dfg = {(decode(A), decode(B)): frequency for (A, B), frequency in dfg.items()}
         hm = HeuristicsNet(dfg)
         return compute_dfg(hm, dependency_thresh=self.__minimum_dependency_threshold, and_measure_thresh=self.__and_threshold)
 
@@ -1,11 +1,12 @@
+import heapq
 from typing import Optional, List
 from pm4py.algo.discovery.heuristics.variants.classic import calculate as compute_dfg
 from pm4py.objects.heuristics_net.obj import HeuristicsNet
 from typing_extensions import override
 
 from pybeamline.abstractevent import AbstractEvent
-from pybeamline.bevent import BEvent
-from pybeamline.boevent import BOEvent
+from pybeamline.algorithms.discovery.case_events import to_case_event
+from pybeamline.algorithms.discovery.incremental_heuristics_net import IncrementalHeuristicsNet
 from pybeamline.stream.base_map import BaseMap
 
 
@@ -13,56 +14,57 @@ def heuristics_miner_lossy_counting_budget(
         model_update_frequency=10,
         budget=100,
         dependency_threshold=0.5,
-        and_threshold=0.8) -> BaseMap[AbstractEvent, HeuristicsNet]:
+        and_threshold=0.8,
+        emit_on_change=False) -> BaseMap[AbstractEvent, HeuristicsNet]:
+    """
+    :param emit_on_change: if True, every `model_update_frequency` events a model is emitted only if its
+        structure (edges and AND splits/joins) changed since the previous emission
+    """
     return HeuristicsMinerLossyCountingBudgetMapper(model_update_frequency=model_update_frequency,
                                                     budget=budget,
                                                     dependency_threshold=dependency_threshold,
-                                                    and_threshold=and_threshold)
+                                                    and_threshold=and_threshold,
+                                                    emit_on_change=emit_on_change)
 
 
 
 class HeuristicsMinerLossyCountingBudgetMapper(BaseMap[AbstractEvent, HeuristicsNet]):
 
-    def __init__(self, model_update_frequency=10, budget=100, dependency_threshold=0.5, and_threshold=0.8):
+    def __init__(self, model_update_frequency=10, budget=100, dependency_threshold=0.5, and_threshold=0.8, emit_on_change=False):
         self._model_update_frequency = model_update_frequency
+        self._emit_on_change = emit_on_change
         self.hm = HeuristicsMinerLossyCountingBudget(
             budget=budget, dependency_threshold=dependency_threshold,
-            and_threshold=and_threshold)
+            and_threshold=and_threshold, track_changes=emit_on_change)
 
     @override
     def transform(self, value: AbstractEvent) -> Optional[List[HeuristicsNet]]:
-        if isinstance(value, BOEvent):
-            # Verify that the event is flattened
-            if len(value.get_object_ids()) != 1:
-                raise ValueError("BOEvent should be flattened before supplied to miner")
-            trace_name = value.get_object_ids()[0]
-            b_event = BEvent(
-                activity_name=value.get_event_name(),
-                case_id=trace_name,
-                event_time=value.get_event_time()
-            )
-            self.hm.ingest_event(b_event)
-        elif isinstance(value, BEvent):
-            self.hm.ingest_event(value)
-        else:
-            raise TypeError(f"Unsupported event type: {type(value)}")
+        self.hm.ingest_event(to_case_event(value))
 
         if self.hm.observed_events() % self._model_update_frequency == 0:
-            return [self.hm.get_model()]
-        else:
-            return None
+            if not self._emit_on_change or self.hm.model_changed():
+                return [self.hm.get_model()]
+        return None
 
 
 # Class originally developed by Magnus Frederiksen as part of his BSc project at DTU entitled
 # "Development of Process Mining and Complex Event Processing using Python"
 class HeuristicsMinerLossyCountingBudget:
-    def __init__(self, budget=10, dependency_threshold=0.0, and_threshold=0.8):
+    def __init__(self, budget=10, dependency_threshold=0.0, and_threshold=0.8, track_changes=False):
         self.__budget = int(budget)  # max length of stored events and relations
         self.__minimum_dependency_threshold = dependency_threshold
         self.__and_threshold = and_threshold
+        # if set, the structure of the model is kept up to date with the relation counts
+        self.__net = IncrementalHeuristicsNet(dependency_threshold, and_threshold) if track_changes else None
 
         self.__D_C = dict()  # set of event
         self.__D_R = dict()  # set of relations
+        # entries indexed by the bucket in which they expire (frequency + bucket), plus a heap of
+        # those buckets, so that a bucket cleaning only visits the entries to delete
+        self.__D_C_expiry = dict()
+        self.__D_R_expiry = dict()
+        self.__expiries = []
+        self.__expiries_set = set()  # buckets in the heap, so that each is pushed at most once
         self.__observed_events = 1
         self.__current_bucket = 0
 
@@ -75,6 +77,7 @@ class HeuristicsMinerLossyCountingBudget:
             del self.__D_C[event.get_trace_name()]  # replace caseID's former event with new event
             self.__D_C[event.get_trace_name()] = [event.get_event_name(), lastEvent[1] + 1, lastEvent[2],
                                                   event.get_event_time()]
+            self.__move_expiry(self.__D_C_expiry, event.get_trace_name(), lastEvent[1] + lastEvent[2])
 
             r_N = (lastEvent[0], event.get_event_name())  # save relation localy
 
@@ -87,12 +90,17 @@ class HeuristicsMinerLossyCountingBudget:
                 newTime = lastRelation[2] + (diff / (lastRelation[0] + 1))
 
                 self.__D_R[r_N] = [lastRelation[0] + 1, lastRelation[1], newTime]
+                self.__move_expiry(self.__D_R_expiry, r_N, lastRelation[0] + lastRelation[1])
 
             else:  # the relation doesent exist, create it
                 while len(self.__D_R) + len(
                         self.__D_C) >= self.__budget:  # if budget is reached when adding a new key + iten
                     self.__bucket_cleaning()  # bucket cleaning time
                 self.__D_R[r_N] = (1, self.__current_bucket, event.get_event_time() - lastEvent[3])
+                self.__add_expiry(self.__D_R_expiry, r_N, self.__current_bucket + 1)
+
+            if self.__net is not None:
+                self.__net.set_count(r_N, self.__D_R[r_N][0])
 
         else:  # caseID doesnt exist, create it
             while ((len(self.__D_R) + len(
@@ -100,6 +108,7 @@ class HeuristicsMinerLossyCountingBudget:
                 self.__bucket_cleaning()  # bucket cleaning time
             self.__D_C[event.get_trace_name()] = (
             event.get_event_name(), 1, self.__current_bucket, event.get_event_time())
+            self.__add_expiry(self.__D_C_expiry, event.get_trace_name(), self.__current_bucket + 1)
 
         # clean up
         self.__observed_events += 1
@@ -107,24 +116,47 @@ class HeuristicsMinerLossyCountingBudget:
     def __bucket_cleaning(self):
         self.__current_bucket += 1  # increment bucket to clean all items not within the new bucket number
 
-        D_Ctobedel = []  # the 2 lists are needed to avoid messing with the comming loops
-        D_Rtobedel = []
-
-        for caseID, (eventName, frequency, bucket, time) in self.__D_C.items():  # for all caseIDs' occured
-            if frequency + bucket <= self.__current_bucket:  # if not above the bucket threshold on all events occured
-                D_Ctobedel.append(caseID)
+        # every entry expires after the current bucket, so the buckets before the first expiry would
+        # not delete anything: jump directly to it, as repeated cleanings would do
+        while self.__expiries and self.__expiries[0] not in self.__D_C_expiry and self.__expiries[0] not in self.__D_R_expiry:
+            self.__expiries_set.discard(heapq.heappop(self.__expiries))
+        if self.__expiries and self.__expiries[0] > self.__current_bucket:
+            self.__current_bucket = self.__expiries[0]
 
-        for caseID in D_Ctobedel:  # deleted the event
+        for caseID in self.__D_C_expiry.pop(self.__current_bucket, ()):  # deleted the event
             del self.__D_C[caseID]
 
-        for relation, (frequency, bucket, time) in self.__D_R.items():  # for all relations occured
-            if frequency + bucket <= self.__current_bucket:  # if not above the bucket threshold of all relations
-                D_Rtobedel.append(relation)
-
-        for relation in D_Rtobedel:  # delete the relations
+        for relation in self.__D_R_expiry.pop(self.__current_bucket, ()):  # delete the relations
             del self.__D_R[relation]
+            if self.__net is not None:
+                self.__net.remove(relation)
+
+    def __add_expiry(self, index, key, expiry):
+        if expiry not in self.__expiries_set:
+            self.__expiries_set.add(expiry)
+            heapq.heappush(self.__expiries, expiry)
+        index.setdefault(expiry, set()).add(key)
+
+    def __move_expiry(self, index, key, expiry):
+        # the frequency of the entry has been incremented, so it now expires one bucket later
+        entries = index[expiry]
+        entries.discard(key)
+        if not entries:
+            del index[expiry]
+        self.__add_expiry(index, key, expiry + 1)
+
+    def model_changed(self):
+        """
+        Returns True if the structure of the model changed since the previous call.
+        Requires the miner to be created with track_changes=True.
+        """
+        if self.__net is None:
+            raise ValueError("Changes are tracked only if the miner is created with track_changes=True")
+        return self.__net.refresh()
 
     def get_model(self):
+        if self.__net is not None:
+            return self.__net.get_model()
         dfg = dict()
         for (A, B), (frequency, bucket, time) in self.__D_R.items():
             dfg[(A, B)] = frequency
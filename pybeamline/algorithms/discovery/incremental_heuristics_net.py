@@ -0,0 +1,296 @@
+from typing import Dict, Set, Tuple, Hashable, FrozenSet, Iterable
+
+from pm4py.objects.heuristics_net import defaults
+from pm4py.objects.heuristics_net.node import Node
+from pm4py.objects.heuristics_net.obj import HeuristicsNet
+
+Relation = Tuple[Hashable, Hashable]
+
+
+class IncrementalHeuristicsNet:
+    """
+    Keeps the structure of the heuristics net (the edges passing the noise and dependency thresholds,
+    the AND splits and joins) up to date while the directly-follows
+    counts change. Only the relations modified since the last refresh, and the nodes they are connected
+    to, are re-evaluated, so a refresh costs in proportion to the portion of the model touched.
+    The structure is computed as pm4py's classic heuristics miner does with its default parameters,
+    and the HeuristicsNet objects are built from it, without running the miner again.
+    """
+
+    def __init__(self, dependency_threshold=defaults.DEFAULT_DEPENDENCY_THRESH,
+                 and_threshold=defaults.DEFAULT_AND_MEASURE_THRESH,
+                 noise_threshold=defaults.DEFAULT_DFG_PRE_CLEANING_NOISE_THRESH):
+        self.dependency_threshold = dependency_threshold
+        self.and_threshold = and_threshold
+        self.noise_threshold = noise_threshold
+
+        self.dfg: Dict[Relation, int] = dict()
+        self._outgoing: Dict[Hashable, Set[Hashable]] = dict()
+        self._ingoing: Dict[Hashable, Set[Hashable]] = dict()
+        self._out_totals: Dict[Hashable, int] = dict()  # sum of the counts of the outgoing relations
+        self._in_totals: Dict[Hashable, int] = dict()  # sum of the counts of the ingoing relations
+        self._dirty: Set[Relation] = set()
+        self._activities_changed = False
+        self._changed = False  # structural changes not reported by refresh() yet
+
+        # Structure of the model as of the last refresh
+        self._kept: Set[Relation] = set()  # relations surviving the noise cleaning
+        self._accepted: Set[Relation] = set()  # relations also above the dependency threshold
+        self._successors: Dict[Hashable, Set[Hashable]] = dict()  # accepted relations, by source
+        self._predecessors: Dict[Hashable, Set[Hashable]] = dict()  # accepted relations, by target
+        self._and_out: Dict[Hashable, FrozenSet[Relation]] = dict()
+        self._and_in: Dict[Hashable, FrozenSet[Relation]] = dict()
+        self._activities: Set[Hashable] = set()
+
+    def set_count(self, relation: Relation, count: int) -> None:
+        a, b = relation
+        if relation not in self.dfg:
+            if not self._is_activity(a) or not self._is_activity(b):
+                self._activities_changed = True
+            self._outgoing.setdefault(a, set()).add(b)
+            self._ingoing.setdefault(b, set()).add(a)
+        delta = count - self.dfg.get(relation, 0)
+        self._out_totals[a] = self._out_totals.get(a, 0) + delta
+        self._in_totals[b] = self._in_totals.get(b, 0) + delta
+        self.dfg[relation] = count
+        self._dirty.add(relation)
+
+    def remove(self, relation: Relation) -> None:
+        if relation not in self.dfg:
+            return
+        a, b = relation
+        count = self.dfg.pop(relation)
+        self._outgoing[a].discard(b)
+        self._out_totals[a] -= count
+        if not self._outgoing[a]:
+            del self._outgoing[a]
+            del self._out_totals[a]
+        self._ingoing[b].discard(a)
+        self._in_totals[b] -= count
+        if not self._ingoing[b]:
+            del self._ingoing[b]
+            del self._in_totals[b]
+        if not self._is_activity(a) or not self._is_activity(b):
+            self._activities_changed = True
+        self._dirty.add(relation)
+
+    def refresh(self) -> bool:
+        """
+        Re-evaluates the part of the model affected by the changes since the previous refresh.
+        :return: True if the structure of the model changed
+        """
+        self._update()
+        changed = self._changed
+        self._changed = False
+        return changed
+
+    def _update(self) -> None:
+        if not self._dirty:
+            return
+        dirty = self._dirty
+        self._dirty = set()
+        changed = False
+        activities_changed = False
+        if self._activities_changed:
+            self._activities_changed = False
+            activities = set(self._outgoing) | set(self._ingoing)
+            activities_changed = activities != self._activities
+            self._activities = activities
+
+        activities = {a for relation in dirty for a in relation}
+
+        # The noise cleaning depends on the maximum count around each endpoint, so every relation
+        # incident to an affected activity is checked again; the counts they carry in the cleaned
+        # graph (and thus the AND measures) may change as well
+        max_counts = {a: self._max_count(a) for a in activities}
+        count_changed = set(dirty)
+        for a in activities:
+            count_changed.update((a, b) for b in self._outgoing.get(a, ()))
+            count_changed.update((b, a) for b in self._ingoing.get(a, ()))
+        for relation in list(count_changed):
+            kept = relation in self.dfg and self._is_kept(relation, max_counts)
+            if self._toggle(self._kept, relation, kept):
+                count_changed.add(relation)
+            elif relation not in dirty:
+                count_changed.discard(relation)
+
+        # The dependency of a relation depends on the cleaned count of its inverse
+        candidates = set(count_changed)
+        candidates.update((b, a) for a, b in count_changed)
+        accepted_changed = set()
+        for relation in candidates:
+            if self._toggle(self._accepted, relation, self._is_accepted(relation)):
+                accepted_changed.add(relation)
+                a, b = relation
+                if relation in self._accepted:
+                    self._successors.setdefault(a, set()).add(b)
+                    self._predecessors.setdefault(b, set()).add(a)
+                else:
+                    self._successors[a].discard(b)
+                    self._predecessors[b].discard(a)
+        changed |= bool(accepted_changed)
+        # With no accepted relation, every activity becomes a node
+        changed |= activities_changed and not self._accepted
+
+        # AND measures of a node depend on the cleaned counts towards its accepted successors
+        # (predecessors) and among them
+        out_nodes = set()
+        in_nodes = set()
+        for a, b in count_changed | accepted_changed:
+            out_nodes.add(a)
+            in_nodes.add(b)
+            out_nodes.update(self._predecessors.get(a, ()))
+            out_nodes.update(self._predecessors.get(b, ()))
+            in_nodes.update(self._successors.get(a, ()))
+            in_nodes.update(self._successors.get(b, ()))
+        for n in out_nodes:
+            changed |= self._update_and(self._and_out, n, self._and_pairs(n, self._successors.get(n, ()), True))
+        for n in in_nodes:
+            changed |= self._update_and(self._and_in, n, self._and_pairs(n, self._predecessors.get(n, ()), False))
+        self._changed |= changed
+
+    def get_model(self, decode=None) -> HeuristicsNet:
+        """
+        Builds the HeuristicsNet for the current counts, optionally decoding the activities. The net is the one
+        pm4py's classic heuristics miner returns, filled in from the maintained structure.
+        """
+        self._update()
+        names = {a: a if decode is None else decode(a) for a in set(self._outgoing) | set(self._ingoing)}
+        count = self._cleaned_count
+
+        dfg = {(names[a], names[b]): c for (a, b), c in self.dfg.items() if (a, b) in self._kept}
+        occurrences = dict()
+        for a, name in names.items():
+            total = self._out_totals.get(a, 0) + self._in_totals.get(a, 0)
+            occurrences[name] = int(total / 2) if a in self._outgoing and a in self._ingoing else total
+        start_activities = [names[a] for a in self._outgoing if a not in self._ingoing]
+        end_activities = [names[a] for a in self._ingoing if a not in self._outgoing]
+        net = HeuristicsNet(dfg, activities=sorted(occurrences), start_activities=start_activities,
+                            end_activities=end_activities, activities_occurrences=occurrences)
+        net.min_dfg_occurrences = defaults.DEFAULT_MIN_DFG_OCCURRENCES
+        net.performance_matrix = dict()
+
+        # Cleaned counts and dependencies by source, in the order pm4py fills its matrices
+        rows: Dict[Hashable, Dict[Hashable, Tuple[int, float]]] = dict()
+        for (a, b), c in self.dfg.items():
+            if (a, b) not in self._kept:
+                continue
+            if a != b and (b, a) in self._kept:
+                c2 = self.dfg[(b, a)]
+                dependency = (c - c2) / (c + c2 + 1)
+            else:
+                dependency = c / (c + 1)
+            rows.setdefault(a, dict())[b] = (c, dependency)
+
+        # The start and end flags test the nodes against the wrapped lists, exactly as pm4py does
+        def node(a: Hashable) -> Node:
+            name = names[a]
+            if name not in net.nodes:
+                net.nodes[name] = Node(net, name, occurrences[name], is_start_node=name in net.start_activities,
+                                       is_end_node=name in net.end_activities,
+                                       default_edges_color=net.default_edges_color[0], node_type=net.node_type,
+                                       net_name=net.net_name[0], nodes_dictionary=net.nodes)
+            return net.nodes[name]
+
+        for a, row in rows.items():
+            n1 = names[a]
+            net.dfg_matrix[n1] = {names[b]: c for b, (c, _) in row.items()}
+            net.dependency_matrix[n1] = {names[b]: dependency for b, (_, dependency) in row.items()}
+            net.performance_matrix[n1] = dict(net.dfg_matrix[n1])
+            for b, (c, dependency) in row.items():
+                if (a, b) in self._accepted:
+                    source, target = node(a), node(b)
+                    source.add_output_connection(target, dependency, c, repr_value=c)
+                    target.add_input_connection(source, dependency, c, repr_value=c)
+        if not net.nodes:
+            # With no accepted relation, every activity becomes a node
+            for a in sorted(names, key=names.__getitem__):
+                node(a)
+
+        # AND measures of the accepted pairs
+        for a, pairs in self._and_out.items():
+            measures = net.nodes[names[a]].and_measures_out
+            for n1, n2 in pairs:
+                value = (count((n1, n2)) + count((n2, n1))) / (count((a, n1)) + count((a, n2)) + 1)
+                self._put_and_measure(measures, names[n1], names[n2], value)
+        for a, pairs in self._and_in.items():
+            measures = net.nodes[names[a]].and_measures_in
+            for n1, n2 in pairs:
+                value = (count((n1, n2)) + count((n2, n1))) / (count((n1, a)) + count((n2, a)) + 1)
+                self._put_and_measure(measures, names[n1], names[n2], value)
+        return net
+
+    def _is_activity(self, a: Hashable) -> bool:
+        return a in self._outgoing or a in self._ingoing
+
+    def _max_count(self, a: Hashable) -> int:
+        max_count = -1
+        for b in self._outgoing.get(a, ()):
+            max_count = max(max_count, self.dfg[(a, b)])
+        for b in self._ingoing.get(a, ()):
+            max_count = max(max_count, self.dfg[(b, a)])
+        return max_count
+
+    def _is_kept(self, relation: Relation, max_counts: Dict[Hashable, int]) -> bool:
+        if self.noise_threshold <= 0.0:
+            return True
+        a, b = relation
+        max_a = max_counts[a] if a in max_counts else self._max_count(a)
+        max_b = max_counts[b] if b in max_counts else self._max_count(b)
+        return not self.dfg[relation] < min(max_a * self.noise_threshold, max_b * self.noise_threshold)
+
+    def _cleaned_count(self, relation: Relation) -> int:
+        return self.dfg[relation] if relation in self._kept else 0
+
+    def _is_accepted(self, relation: Relation) -> bool:
+        if relation not in self._kept:
+            return False
+        a, b = relation
+        c1 = self.dfg[relation]
+        if a != b and (b, a) in self._kept:
+            c2 = self.dfg[(b, a)]
+            dependency = (c1 - c2) / (c1 + c2 + 1)
+        else:
+            dependency = c1 / (c1 + 1)
+        return dependency >= self.dependency_threshold
+
+    def _and_pairs(self, n: Hashable, neighbours: Iterable[Hashable], outgoing: bool) -> FrozenSet[Relation]:
+        count = self._cleaned_count
+        neighbours = sorted(neighbours, key=str)
+        pairs = set()
+        for i, n1 in enumerate(neighbours):
+            for n2 in neighbours[i + 1:]:
+                if outgoing:
+                    c3, c4 = count((n, n1)), count((n, n2))
+                else:
+                    c3, c4 = count((n1, n)), count((n2, n))
+                if (count((n1, n2)) + count((n2, n1))) / (c3 + c4 + 1) >= self.and_threshold:
+                    pairs.add((n1, n2))
+        return frozenset(pairs)
+
+    @staticmethod
+    def _put_and_measure(measures: Dict[Hashable, Dict[Hashable, float]], n1: Hashable, n2: Hashable,
+                         value: float) -> None:
+        # pm4py keys the pairs in the order of the node names
+        if n2 < n1:
+            n1, n2 = n2, n1
+        measures.setdefault(n1, dict())[n2] = value
+
+    @staticmethod
+    def _update_and(measures: Dict[Hashable, FrozenSet[Relation]], n: Hashable, pairs: FrozenSet[Relation]) -> bool:
+        previous = measures.get(n, frozenset())
+        if pairs:
+            measures[n] = pairs
+        elif n in measures:
+            del measures[n]
+        return previous != pairs
+
+    @staticmethod
+    def _toggle(items: set, item, present: bool) -> bool:
+        if present == (item in items):
+            return False
+        if present:
+            items.add(item)
+        else:
+            items.discard(item)
+        return True
@@ -1,4 +1,6 @@
-from typing import List, Union, Optional
+import math
+from collections import OrderedDict, deque
+from typing import List, Union, Optional, Dict, Tuple, Hashable
 
 from pm4py.algo.discovery.temporal_profile import algorithm as temporal_profile_discovery
 from pm4py.objects.log.obj import EventLog
@@ -8,18 +10,83 @@ from pybeamline.bevent import BEvent, DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY, D
 from pm4py.util.typing import TemporalProfile
 from pybeamline.stream.base_map import BaseMap
 
-def temporal_profile_discovery_mapper() -> BaseMap[List[BEvent], TemporalProfile]:
-    return TemporalProfileDiscoveryMapper()
+def temporal_profile_discovery_mapper(model_update_frequency: int = 1,
+                                      max_case_history: Optional[int] = None,
+                                      max_cases: Optional[int] = None) -> BaseMap[List[BEvent], TemporalProfile]:
+    """
+    Discovers the temporal profile of the stream incrementally.
+    :param model_update_frequency: number of events between two emitted temporal profiles
+    :param max_case_history: if set, only the pairs among the latest events of each case are considered
+    :param max_cases: if set, the least recently updated case is forgotten beyond this number of cases
+    """
+    return TemporalProfileDiscoveryMapper(model_update_frequency, max_case_history, max_cases)
 
 class TemporalProfileDiscoveryMapper(BaseMap[BEvent, TemporalProfile]):
 
-    def __init__(self):
-        self.events = []
+    def __init__(self, model_update_frequency: int = 1, max_case_history: Optional[int] = None,
+                 max_cases: Optional[int] = None):
+        self.model_update_frequency = max(int(model_update_frequency), 1)
+        self.temporal_profile = IncrementalTemporalProfile(max_case_history, max_cases)
+        self.observed_events = 0
 
     def transform(self, value: BEvent) -> Optional[List[TemporalProfile]]:
-        self.events.append(value)
-        tp_discovery = TemporalProfileDiscovery(self.events)
-        return [tp_discovery.apply()]
+        self.temporal_profile.ingest_event(value)
+        self.observed_events += 1
+        if self.observed_events % self.model_update_frequency == 0:
+            return [self.temporal_profile.get_temporal_profile()]
+        return None
+
+
+class IncrementalTemporalProfile:
+    """
+    Temporal profile (mean and standard deviation of the time elapsed between any two events of
+    the same case, per pair of activities) maintained one event at a time, as computed by pm4py:
+    each event is paired with the previous events of its case, in timestamp order, and the
+    durations are accumulated with Welford's running mean and variance.
+    """
+
+    def __init__(self, max_case_history: Optional[int] = None, max_cases: Optional[int] = None):
+        self.max_case_history = max_case_history
+        self.max_cases = max_cases
+        self._cases: OrderedDict[Hashable, deque] = OrderedDict()  # (activity, time) of the events, per case
+        self._statistics: Dict[Tuple[str, str], List[float]] = dict()  # pair -> [count, mean, M2]
+
+    def ingest_event(self, event: BEvent) -> None:
+        case_id = event.get_trace_name()
+        activity = event.get_event_name()
+        time = event.get_event_time()
+
+        history = self._cases.get(case_id)
+        if history is None:
+            if self.max_cases is not None and len(self._cases) >= self.max_cases:
+                self._cases.popitem(last=False)
+            history = deque(maxlen=self.max_case_history)
+            self._cases[case_id] = history
+        else:
+            self._cases.move_to_end(case_id)
+
+        for previous_activity, previous_time in history:
+            if previous_time <= time:
+                self._update((previous_activity, activity), (time - previous_time).total_seconds())
+            else:
+                self._update((activity, previous_activity), (previous_time - time).total_seconds())
+        history.append((activity, time))
+
+    def _update(self, pair: Tuple[str, str], duration: float) -> None:
+        statistics = self._statistics.get(pair)
+        if statistics is None:
+            self._statistics[pair] = [1, duration, 0.0]
+            return
+        count = statistics[0] + 1
+        delta = duration - statistics[1]
+        mean = statistics[1] + delta / count
+        statistics[0] = count
+        statistics[1] = mean
+        statistics[2] += delta * (duration - mean)
+
+    def get_temporal_profile(self) -> TemporalProfile:
+        return {pair: (mean, math.sqrt(m2 / (count - 1)) if count > 1 else 0.0)
+                for pair, (count, mean, m2) in self._statistics.items()}
 
 
 class TemporalProfileDiscovery:
@@ -0,0 +1,152 @@
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from reactivex.subject import Subject
+
+from pybeamline.boevent import BOEvent, FlattenedBOEvent
+from pybeamline.stream.base_map import BaseMap
+from pybeamline.stream.base_operator import BaseOperator
+from pybeamline.stream.stream import Stream
+
+MinerFactory = Callable[[], BaseOperator[Stream[Any], Stream[Any]]]
+
+
+def miner_dispatch(obj_type: str, miner_op: BaseOperator[Stream[Any], Stream[Any]]) -> Callable[[Any], List[Any]]:
+    """
+    Returns a function feeding an event to the miner and returning the models it emitted.
+    BaseMap miners are invoked directly; any other operator is fed through a subject.
+    """
+    if isinstance(miner_op, BaseMap):
+        transform = miner_op.transform
+        return lambda event: transform(event) or []
+
+    obj_subject: Subject = Subject()
+    emitted: List[Any] = []
+    Stream(obj_subject).pipe(miner_op).subscribe(
+        on_next=emitted.append,
+        on_error=lambda e: print(f"[{obj_type}] error:", e),
+        on_completed=lambda: None,
+        blocking=False
+    )
+
+    def dispatch(event) -> List[Any]:
+        obj_subject.on_next(event)
+        models = list(emitted)
+        emitted.clear()
+        return models
+    return dispatch
+
+
+def _worker_loop(connection, control_flow: Dict[str, MinerFactory], default_miner: MinerFactory):
+    # Receives batches of (position, object type, object id, event id, activity, timestamp, vmap) and
+    # replies with the (position, models) of the events for which models were emitted; None terminates the worker
+    dispatchers: Dict[str, Callable[[Any], List[Any]]] = {}
+    try:
+        while True:
+            batch = connection.recv()
+            if batch is None:
+                break
+            try:
+                results = []
+                for position, obj_type, obj_id, event_id, activity, timestamp, vmap in batch:
+                    dispatch = dispatchers.get(obj_type)
+                    if dispatch is None:
+                        miner = control_flow.get(obj_type, default_miner)
+                        dispatch = dispatchers[obj_type] = miner_dispatch(obj_type, miner())
+                    event = FlattenedBOEvent(BOEvent(event_id, activity, {}, timestamp, vmap), obj_type, obj_id)
+                    models = dispatch(event)
+                    if models:
+                        results.append((position, models))
+                connection.send(results)
+            except Exception as e:
+                connection.send(e)
+    except EOFError:
+        pass
+    finally:
+        connection.close()
+
+
+class MinerPool:
+    """
+    Runs the per-object-type miners of an OCOperator in worker processes. Each object type is
+    assigned to a worker (round-robin, as the types are first observed), which owns the state of
+    its miner; the flattened events are sent to the workers in batches and the models come back
+    with the position of the event they were emitted for, so they can be put in the same order as
+    if the miners were run serially. Only the fields of the flattened events read by the miners are
+    sent to the workers (not the parent event, nor its symbol table), so the workers encode the
+    activities with their own tables, if any.
+    The workers are forked, so that the miner factories need not be picklable: this is only
+    available on platforms supporting the fork start method. As forking a multithreaded process is
+    unsafe, the pool should be created before the sources start their threads.
+    The workers are started when the pool is created and run until close() is called (OCOperator
+    creates its pool when the stream is subscribed and closes it when the stream completes or fails).
+    """
+
+    def __init__(self, workers: int, control_flow: Dict[str, MinerFactory], default_miner: MinerFactory):
+        self.check_workers(workers)
+        context = multiprocessing.get_context("fork")
+        self._connections = []
+        self._processes = []
+        for _ in range(workers):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=_worker_loop, args=(child_connection, control_flow, default_miner),
+                                      daemon=True)
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+        self._assignment: Dict[str, int] = {}
+        self._batches: List[List[Tuple]] = [[] for _ in range(workers)]
+
+    @staticmethod
+    def check_workers(workers: int) -> None:
+        """
+        Raises a ValueError if a pool with the given number of workers cannot be created.
+        """
+        if workers < 1:
+            raise ValueError("The number of workers must be positive")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("Mining object types in worker processes requires the fork start method")
+
+    def submit(self, position: int, event: FlattenedBOEvent) -> None:
+        obj_type = event.object_type
+        worker = self._assignment.get(obj_type)
+        if worker is None:
+            worker = self._assignment[obj_type] = len(self._assignment) % len(self._connections)
+        self._batches[worker].append((position, obj_type, event.object_id, event.event_id,
+                                      event.activity_name, event.timestamp, event.vmap))
+
+    def collect(self) -> Dict[int, List[Any]]:
+        """
+        Sends the pending batches to the workers and waits for their models.
+        :return: the models emitted, by position of the event
+        """
+        busy = []
+        for worker, batch in enumerate(self._batches):
+            if batch:
+                self._connections[worker].send(batch)
+                self._batches[worker] = []
+                busy.append(worker)
+        models: Dict[int, List[Any]] = {}
+        error: Optional[Exception] = None
+        for worker in busy:
+            result = self._connections[worker].recv()
+            if isinstance(result, Exception):
+                error = error or result
+            else:
+                models.update(result)
+        if error is not None:
+            raise error
+        return models
+
+    def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections = []
+        self._processes = []
@@ -1,10 +1,11 @@
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Tuple, Set, FrozenSet
 from pm4py.objects.heuristics_net.obj import HeuristicsNet
 
 from pybeamline.stream.base_map import BaseMap
 from pybeamline.utils.commands import Command
 from pybeamline.models.aer import AER
 from pybeamline.models.ocdfg import OCDFG
+from pybeamline.utils.cardinality import Cardinality
 
 def oc_merge_operator() -> BaseMap[Dict[str, Any], Dict[str, Union[OCDFG,AER]]]:
     """
@@ -38,7 +39,7 @@ class OCMergeOperatorMapper(BaseMap[Dict[str, Any], Dict[str,Union[OCDFG,AER]]])
     def transform(self, value: Dict[str, Any]) -> Optional[List[Dict[str,Union[OCDFG,AER]]]]:
         result = self.oc_operator.process(value)
         if result is not None:
-            return [self.oc_operator.process(value)]
+            return [result]
         return None
 
 
@@ -51,21 +52,73 @@ class OCMergeOperator:
     model to include only activities and object-type relations relevant to the current OCDFG.
     This ensures a synchronised and coherent representation of both control-flow
     and structural relationships in the process.
+    The merged models are maintained incrementally: a DFG message only replaces the part of the
+    OCDFG of its object type, and the AER is pruned again only for the activities whose relations
+    changed (or for all of them, when the active object types change). The models emitted share
+    these parts with each other and should therefore be treated as read-only.
     """
     def __init__(self):
         self._obj_dfg_repo: Dict[str, HeuristicsNet] = {}
         self._aer_diagram: Optional[AER] = None
         self._active_object_types: set[str] = set()
 
+        # Per object type: edges, start activities, end activities and all activities of its DFG
+        self._obj_dfg_parts: Dict[str, Tuple[Dict[Tuple[str, str], int], Set[str], Set[str], Set[str]]] = {}
+        # Number of active object types whose DFG contains each activity
+        self._activity_counts: Dict[str, int] = {}
+        # Per activity: the AER entries it was pruned from, and the pruned object types and relations
+        self._pruned_aer: Dict[str, Tuple[Any, Any, Set[str], Dict[Tuple[str, str], Cardinality]]] = {}
+        self._pruned_object_types: FrozenSet[str] = frozenset()  # object types the pruned entries refer to
+
     def _handle_command(self, msg: Dict[str, Any], obj_type: str):
         """
         Handle a command message, which can be either; active or inactive.
         If the command is active, merged OCDFG contains that object type.
         """
         if msg["command"] == Command.ACTIVE:
-            self._active_object_types.add(obj_type)
+            if obj_type not in self._active_object_types:
+                self._active_object_types.add(obj_type)
+                self._count_activities(obj_type, 1)
         elif msg["command"] == Command.INACTIVE:
-            self._active_object_types.discard(obj_type)
+            if obj_type in self._active_object_types:
+                self._active_object_types.discard(obj_type)
+                self._count_activities(obj_type, -1)
+
+    def _count_activities(self, obj_type: str, delta: int):
+        parts = self._obj_dfg_parts.get(obj_type)
+        if parts is None:
+            return
+        counts = self._activity_counts
+        for activity in parts[3]:
+            count = counts.get(activity, 0) + delta
+            if count > 0:
+                counts[activity] = count
+            else:
+                del counts[activity]
+
+    def _update_dfg(self, obj_type: str, dfg_model: HeuristicsNet):
+        """
+        Replaces the part of the OCDFG of the object type.
+        Also record start/end activities using a simple heuristic.
+        """
+        active = obj_type in self._active_object_types
+        if active:
+            self._count_activities(obj_type, -1)
+        self._obj_dfg_repo[obj_type] = dfg_model
+
+        edges = dict(dfg_model.dfg)
+        sources, targets, activities = set(), set(), set()
+        for a1, a2 in edges:
+            activities.add(a1)
+            activities.add(a2)
+            if a1 != a2:
+                sources.add(a1)
+                targets.add(a2)
+        # Simple heuristic to determine start and end activities
+        self._obj_dfg_parts[obj_type] = (edges, sources - targets, targets - sources, activities)
+
+        if active:
+            self._count_activities(obj_type, 1)
 
     def process(self, msg: Dict[str, Any]) -> Optional[Dict[str,Union[OCDFG,AER]]]:
         msg_type = msg.get("type")
@@ -73,7 +126,7 @@ class OCMergeOperator:
 
         if msg_type == "dfg" and obj_type and isinstance(msg.get("model"), HeuristicsNet):
             # Overwrite the DFG for the object type
-            self._obj_dfg_repo[obj_type] = msg["model"]
+            self._update_dfg(obj_type, msg["model"])
         if msg_type == "command" and obj_type and isinstance(msg.get("command"), Command):
             # Handle the command for the object type
             self._handle_command(msg, obj_type)
@@ -94,59 +147,67 @@ class OCMergeOperator:
         if not self._aer_diagram:
             return AER()
 
-        active_object_types = ocdfg.object_types
-        activities = ocdfg.activities
+        active_object_types = frozenset(ocdfg.object_types)
+        if active_object_types != self._pruned_object_types:
+            self._pruned_aer = {}
+            self._pruned_object_types = active_object_types
         pruned_aer = AER()
+        aer = self._aer_diagram
+        activities = ocdfg.activities
+        previously_pruned = self._pruned_aer
+        self._pruned_aer = {}
 
         # Prune activities
-        for activity in self._aer_diagram.activities:
-            if activity not in activities:
-                continue
-            pruned_aer.add_activity(activity)
-
-        # Prune entities
-        for activity, types in self._aer_diagram.object_types.items():
-            if activity not in activities:
-                continue
-            active_types = types.intersection(active_object_types)
+        for activity in aer.activities:
+            if activity in activities:
+                pruned_aer.add_activity(activity)
+        candidates = activities.intersection(aer.object_types.keys() | aer.relations.keys())
+
+        # Prune entities and relations, reusing the pruned entries whose AER entries are unchanged
+        # (AERs are not modified once emitted, so an entry changed if it is a different object)
+        for activity in candidates:
+            types = aer.object_types.get(activity)
+            rels = aer.relations.get(activity)
+            pruned = previously_pruned.get(activity)
+            if pruned is None or pruned[0] is not types or pruned[1] is not rels:
+                pruned = (types, rels) + self._prune_activity(types, rels, active_object_types)
+            self._pruned_aer[activity] = pruned
+            _, _, active_types, active_rels = pruned
             if active_types:
-                pruned_aer.add_object_types(activity, active_types)
-
-        # Prune relations
-        for activity, rels in self._aer_diagram.relations.items():
-            if activity not in activities:
-                continue
-            for (source, target), cardinality in rels.items():
-                if source in active_object_types and target in active_object_types:
-                    pruned_aer.add_relation(activity, source, target, cardinality)
+                pruned_aer.activities.add(activity)
+                pruned_aer.object_types[activity] = active_types
+            if active_rels:
+                pruned_aer.relations[activity] = active_rels
 
         return pruned_aer
 
+    @staticmethod
+    def _prune_activity(types: Optional[Set[str]], rels: Optional[Dict[Tuple[str, str], Cardinality]],
+                        active_object_types: FrozenSet[str]) -> Tuple[Set[str], Dict[Tuple[str, str], Cardinality]]:
+        active_types = types.intersection(active_object_types) if types else set()
+        active_rels = {}
+        for (source, target), cardinality in (rels or {}).items():
+            if source in active_object_types and target in active_object_types:
+                a, b = sorted([source, target])
+                active_rels[(a, b)] = cardinality
+                active_types.update((a, b))
+        return active_types, active_rels
 
     def _build_ocdfg(self) -> OCDFG:
         """
-        Builds the global OCDFG from the stored DFGs per object type.
-        Also record start/end activities per object type using a simple heuristic.
+        Builds the global OCDFG from the parts of the active object types.
         Note:
         Construction is based on description of the OCDFG concept in
         Berti & van der Aalst (2023) "OC-PM: analyzing object-centric event logs and process models"
         """
         ocdfg = OCDFG()
-        # Rebuild the global OCDFG from all stored DFGs
-        for obj_type, dfg_model in self._obj_dfg_repo.items():
+        for obj_type, (edges, start_activities, end_activities, _) in self._obj_dfg_parts.items():
             if obj_type not in self._active_object_types:
                 continue
-            sources, targets = set(), set()
-            for (a1, a2), freq in dfg_model.dfg.items():
-                ocdfg.add_edge(a1, obj_type, a2, freq)
-                if a1 != a2:
-                    sources.add(a1)
-                    targets.add(a2)
-
-            # Simple heuristic to determine start and end activities
-            start_activities = (sources - targets)
-            end_activities = (targets - sources)
-
+            if edges:
+                ocdfg.edges[obj_type] = edges
+                ocdfg.object_types.add(obj_type)
             ocdfg.start_activities[obj_type] = start_activities
             ocdfg.end_activities[obj_type] = end_activities
+        ocdfg.activities = set(self._activity_counts)
         return ocdfg
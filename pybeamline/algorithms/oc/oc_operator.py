@@ -1,16 +1,14 @@
-from typing import Dict, Optional, Protocol, Callable, Any, Union, List
-
-from reactivex.subject import Subject
+from typing import Dict, Optional, Protocol, Callable, Any, List, Tuple
 
 from pybeamline.algorithms.discovery.activity_entity_relation_miner_lossy_counting import activity_entity_relations_miner_lossy_counting
+from pybeamline.algorithms.oc.miner_pool import MinerPool, miner_dispatch
 from pybeamline.algorithms.oc.strategies.base import InclusionStrategy, \
     RelativeFrequencyBasedStrategy
-from pybeamline.boevent import BOEvent
+from pybeamline.boevent import BOEvent, FlattenedBOEvent
 from pybeamline.algorithms.discovery.heuristics_miner_lossy_counting import heuristics_miner_lossy_counting
 from pybeamline.stream.base_map import BaseMap
 from pybeamline.stream.base_operator import BaseOperator
 from pybeamline.stream.stream import Stream
-from reactivex import operators as ops
 
 
 class StreamMiner(Protocol):
@@ -26,6 +24,8 @@ def oc_operator(
     aer_model_update_frequency: Optional[int] = 30,
     aer_model_max_approx_error: Optional[float] = 0.01,
     default_miner: Optional[Callable[[], BaseOperator[Stream[Any], Stream[Any]]]] = None,
+    workers: int = 0,
+    batch_size: int = 100,
 ) -> BaseMap[BOEvent, dict]:
     """
     Factory function to create a configured OCOperator.
@@ -43,6 +43,13 @@ def oc_operator(
     :param default_miner:
         Optional default miner to use for dynamic mode when no control flow is provided.
         All object types will use the miner specifications provided in the `default_miner` callable.
+    :param workers:
+        Number of worker processes the object types are mined in (see MinerPool).
+        With 0, the default, they are mined in the calling thread. The workers are started when the stream
+        is subscribed and stopped when it completes or fails (or when the operator is closed).
+    :param batch_size:
+        With workers, number of events whose flattened events are sent to the workers at once.
+        The outputs of the events are emitted when their batch is complete (or the stream completes).
     :return:
         A callable that takes an `Observable[BOEvent]` as input and returns an `Observable[dict]` containing
         emitted models, AER diagrams, and control commands such as active/inactive.
@@ -61,7 +68,9 @@ def oc_operator(
         control_flow=control_flow or {},
         aer_model_update_frequency=aer_model_update_frequency,
         aer_model_max_approx_error=aer_model_max_approx_error,
-        default_miner=default_miner
+        default_miner=default_miner,
+        workers=workers,
+        batch_size=batch_size
     )
 
 
@@ -71,117 +80,161 @@ class OCOperator(BaseMap[BOEvent, dict]):
     It consumes a stream of BOEvents, dynamically routes and transforms them based on object types, and emits discovered control-flow models
     (DFGs) and AER diagrams at configurable intervals. Supports both static (predefined miners) and dynamic (on-the-fly) miner registration modes,
     and integrates an inclusion strategy to control which object-types to be considered downstream.
+    Miners which are BaseMaps (as the ones provided) are invoked directly on the flattened events; any other
+    operator is fed through a subject. With workers, the miners are run in worker processes instead (see MinerPool),
+    and the outputs are emitted in the same order, once per batch of events. The worker processes are started by
+    open(), which is called when the stream is subscribed (before the sources start their threads, as the workers
+    are forked), and stopped by close(), which is called when the stream completes or fails; if the operator is
+    used again afterwards, new workers are started, with new miners.
     """
     def __init__(self, control_flow: Optional[Dict[str, Callable[[], BaseOperator[Stream[Any], Stream[Any]]]]] = None,
                  inclusion_strategy: InclusionStrategy = None,
                  aer_model_update_frequency: Optional[int] = 30,
                  aer_model_max_approx_error: Optional[float] = 0.01,
-                 default_miner: Optional[Callable[[], BaseOperator[Stream[Any], Stream[Any]]]] = None):
+                 default_miner: Optional[Callable[[], BaseOperator[Stream[Any], Stream[Any]]]] = None,
+                 workers: int = 0,
+                 batch_size: int = 100):
         self.__inclusion_strategy = inclusion_strategy or RelativeFrequencyBasedStrategy()
         self.__dynamic_mode = not bool(control_flow)
         self.__control_flow = control_flow or {}
         self.__default_miner = default_miner or (lambda: heuristics_miner_lossy_counting(20))
-        self.__miner_subjects: Dict[str, Subject[Union[BOEvent, dict]]] = {}
-        self.__output_subject: Subject = Subject()
+        self.__miners: Dict[str, Callable[[BOEvent], List[Any]]] = {}  # object type -> dispatch of the flattened events
         self.__output_buffer: List[dict] = []
 
-        for obj_type, miner in self.__control_flow.items():
-            self._register_stream(obj_type, miner())
+        self.__pool: Optional[MinerPool] = None  # started when the stream is subscribed
+        self.__workers = max(int(workers), 0)
+        if self.__workers > 0:
+            MinerPool.check_workers(self.__workers)
+            self.__batch_size = max(int(batch_size), 1)
+            self.__position = 0  # of the next flattened event
+            self.__pending: List[Tuple[List[Any], List[Tuple[int, str]]]] = []  # per batched event: AER models, routed flattened events
+        else:
+            for obj_type, miner in self.__control_flow.items():
+                self._register_stream(obj_type, miner())
         self._register_aer_stream(aer_model_update_frequency, aer_model_max_approx_error)
         self.__aer_update_frequency = aer_model_update_frequency
 
     def _register_aer_stream(self, model_update_frequency, max_approx_error: float):
         """
-        Register a stream for Activity-Entity Relationship (AER) diagrams using lossy counting.
+        Register the Activity-Entity Relationship (AER) miner, using lossy counting.
         """
-        # Subject for AER miner input
-        aer_subject: Subject = Subject()
-        self.__miner_subjects["AERStream"] = aer_subject
-        miner_op = activity_entity_relations_miner_lossy_counting(
+        self.__aer_mapper = activity_entity_relations_miner_lossy_counting(
             model_update_frequency=model_update_frequency,
             control_flow=self.__control_flow,
             max_approx_error=max_approx_error
         )
-        # Keep reference to AER mapper to allow synchronous emission checks
-        self.__aer_mapper = miner_op
-        # Wrap Rx Subject as Stream and run miner, then map to dicts
-        aer_stream = Stream(aer_subject).pipe(miner_op).map(lambda model: {
-            "type": "aer",
-            "model": model
-        })
-        aer_stream.subscribe(
-            on_next=lambda msg: (self.__output_subject.on_next(msg), self.__output_buffer.append(msg)),
-            on_error=lambda e: print(f"[AER-STREAM] error:", e),
-            on_completed=lambda: None,
-            blocking=False
-        )
-
-        # Collect output subject emissions into buffer with inclusion strategy
-        Stream(self.__output_subject).flat_map(
-            lambda item: self.__inclusion_strategy.evaluate(item).to_observable()
-        ).subscribe(
-            on_next=lambda item: self.__output_buffer.append(item),
-            on_error=lambda e: print(f"[OUTPUT] error:", e),
-            on_completed=lambda: None,
-            blocking=False
-        )
 
     def _register_stream(self, obj_type: str, miner: Optional[BaseOperator[Stream[Any], Stream[Any]]] = None):
         """
-        Register a new miner subject for the given object type.
+        Register a new miner for the given object type.
         If a miner is provided, it will be used; otherwise, a default miner is created.
         """
-        # Subject per object type for DFG miner input
-        obj_subject: Subject = Subject()
-        self.__miner_subjects[obj_type] = obj_subject
-        miner_op = miner or self.__default_miner()
+        self.__miners[obj_type] = miner_dispatch(obj_type, miner or self.__default_miner())
+
+    def _emit(self, msg: dict):
+        """
+        Evaluate a message with the inclusion strategy and buffer the resulting messages.
+        """
+        result = self.__inclusion_strategy.evaluate(msg)
+        if isinstance(result, Stream):
+            # Strategies returning a Stream, as in previous versions
+            result = result.to_list()
+        self.__output_buffer.extend(result)
 
-        # Wrap Rx Subject as Stream and run miner, then map to dicts
-        dfg_stream = Stream(obj_subject).pipe(miner_op).map(lambda model: {
+    def _emit_many(self, msgs: List[dict]):
+        """
+        Evaluate a sequence of messages at once, if the inclusion strategy supports it.
+        """
+        evaluate_many = getattr(self.__inclusion_strategy, "evaluate_many", None)
+        if evaluate_many is None:
+            for msg in msgs:
+                self._emit(msg)
+        else:
+            self.__output_buffer.extend(evaluate_many(msgs))
+
+    @staticmethod
+    def _dfg_messages(obj_type: str, models: List[Any]) -> List[dict]:
+        return [{
             "type": "dfg",
             "object_type": obj_type,
             "model": model
-        })
+        } for model in models]
 
-        dfg_stream.subscribe(
-            on_next=lambda msg: self.__output_subject.on_next(msg),
-            on_error=lambda e: print(f"[{obj_type}] error:", e),
-            on_completed=lambda: None,
-            blocking=False
-        )
+    def _emit_dfg(self, obj_type: str, models: List[Any]):
+        self._emit_many(self._dfg_messages(obj_type, models))
+
+    def _mine_aer(self, event: BOEvent) -> List[Any]:
+        if not self.__aer_update_frequency:
+            return []
+        return self.__aer_mapper.transform(event) or []
 
     def _route_to_miner(self, event: BOEvent):
         """
-        Flatten the incoming BOEvent and route it to its corresponding miner subject.
+        Flatten the incoming BOEvent and route it to its corresponding miner.
         If dynamic mode is enabled, miners are created on-the-fly if not present.
         """
-        self.__miner_subjects["AERStream"].on_next(event)
+        for model in self._mine_aer(event):
+            self._emit({"type": "aer", "model": model})
+
+        miners = self.__miners
         for flat_event in self._flatten(event):
-            obj_type = flat_event.get_omap_types()[0]
+            obj_type = flat_event.object_type
+            dispatch = miners.get(obj_type)
 
-            if obj_type not in self.__miner_subjects and self.__dynamic_mode:
-                # Dynamically create a new miner subject
+            if dispatch is None:
+                if not self.__dynamic_mode:
+                    continue
+                # Dynamically create a new miner
                 self._register_stream(obj_type, self.__default_miner())
-            elif obj_type not in self.__miner_subjects:
+                dispatch = miners[obj_type]
+
+            models = dispatch(flat_event)
+            if models:
+                self._emit_dfg(obj_type, models)
+
+    def _submit_to_pool(self, event: BOEvent):
+        """
+        Flatten the incoming BOEvent and queue it for the worker processes, mining the AER right away.
+        """
+        if self.__pool is None:
+            self.open()  # transform called outside a stream
+        aer_models = self._mine_aer(event)
+        routed = []
+        for flat_event in self._flatten(event):
+            obj_type = flat_event.object_type
+            if not self.__dynamic_mode and obj_type not in self.__control_flow:
                 continue
+            self.__pool.submit(self.__position, flat_event)
+            routed.append((self.__position, obj_type))
+            self.__position += 1
+        self.__pending.append((aer_models, routed))
+
+    def _drain_pool(self):
+        """
+        Collects the models of the batched events and emits them, in the order of the events.
+        """
+        if not self.__pending:
+            return
+        try:
+            models = self.__pool.collect()
+        except Exception:
+            self.close()
+            raise
+        msgs = []
+        for aer_models, routed in self.__pending:
+            for model in aer_models:
+                msgs.append({"type": "aer", "model": model})
+            for position, obj_type in routed:
+                position_models = models.get(position)
+                if position_models:
+                    msgs.extend(self._dfg_messages(obj_type, position_models))
+        self.__pending = []
+        self._emit_many(msgs)
 
-            self.__miner_subjects[obj_type].on_next(flat_event)
-
-    def _flatten(self, event: BOEvent) -> List[BOEvent]:
-        flattened_events = []
-        for obj_type, obj_ids in event.omap.items():
-            for obj_id in obj_ids:
-                new_omap = {obj_type: {obj_id}}  # Single-entry omap
-                flattened_events.append(
-                    BOEvent(
-                        event_id=event.event_id,
-                        activity_name=event.activity_name,
-                        timestamp=event.timestamp,
-                        omap=new_omap,
-                        vmap=event.vmap
-                    )
-                )
-        return flattened_events
+    def _flatten(self, event: BOEvent) -> List[FlattenedBOEvent]:
+        # Views on the event, one per object, sharing the attributes of the event
+        return [FlattenedBOEvent(event, obj_type, obj_id)
+                for obj_type, obj_ids in event.omap.items() for obj_id in obj_ids]
 
     def get_mode(self) -> bool:
         """
@@ -191,17 +244,37 @@ class OCOperator(BaseMap[BOEvent, dict]):
 
     def transform(self, event: BOEvent) -> Optional[List[dict]]:
         # Route incoming event to miners/AER
-        self._route_to_miner(event)
+        if not self.__workers:
+            self._route_to_miner(event)
+        else:
+            self._submit_to_pool(event)
+            if len(self.__pending) >= self.__batch_size:
+                self._drain_pool()
+        return self._drain_output()
 
-        # Synchronously emit AER model at exact update intervals to avoid races
-        try:
-            aer_events = self.__aer_mapper.obj_rel.observed_events()
-            if self.__aer_update_frequency and aer_events % self.__aer_update_frequency == 0:
-                model = self.__aer_mapper.obj_rel.get_model()
-                self.__output_buffer.append({"type": "aer", "model": model})
-        except Exception:
-            pass
+    def flush(self) -> Optional[List[dict]]:
+        if self.__pool is not None:
+            self._drain_pool()
+        return self._drain_output()
+
+    def open(self):
+        """
+        Starts the worker processes, if any and not already running.
+        """
+        if self.__workers and self.__pool is None:
+            self.__pool = MinerPool(self.__workers, self.__control_flow, self.__default_miner)
+
+    def close(self):
+        """
+        Stops the worker processes, if any, discarding the events not yet mined.
+        """
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool = None
+            self.__pending = []
+            self.__position = 0
 
+    def _drain_output(self) -> Optional[List[dict]]:
         # Drain buffered outputs produced up to now
         if self.__output_buffer:
             results = list(self.__output_buffer)
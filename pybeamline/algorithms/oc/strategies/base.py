@@ -1,13 +1,33 @@
+import heapq
 import math
-from typing import Dict, Set, Tuple, Protocol
+from collections import OrderedDict
+from typing import Dict, Set, Tuple, Protocol, List
 
 from pybeamline.stream.stream import Stream
 from pybeamline.utils.commands import Command, create_command
 
 class InclusionStrategy(Protocol):
-    def evaluate(self, model_event: dict) -> Stream[dict]:
+    def evaluate(self, model_event: dict) -> List[dict]:
+        """
+        Returns the messages to emit for a message of the OCOperator: the message itself, preceded by
+        the commands activating or deactivating object types, if any.
+        """
         ... # pragma: no cover
 
+    def evaluate_many(self, model_events: List[dict]) -> List[dict]:
+        """
+        Evaluates a sequence of messages, returning the concatenation of the messages of each one.
+        """
+        evaluate = self.evaluate
+        results = []
+        for model_event in model_events:
+            result = evaluate(model_event)
+            if isinstance(result, Stream):
+                # Strategies returning a Stream, as in previous versions
+                result = result.to_list()
+            results.extend(result)
+        return results
+
 class RelativeFrequencyBasedStrategy(InclusionStrategy):
     """
     Relative Frequency-Based Inclusion Strategy.
@@ -16,16 +36,19 @@ class RelativeFrequencyBasedStrategy(InclusionStrategy):
 
     :param frequency_threshold: Relative frequency threshold for object types to be considered active.
     Utilising global frequency counts to determine when to register or deregister object types.
+    Active object types are kept in a min-heap by count, so that only those which can fall below the
+    threshold (the least frequent ones) are checked.
     """
     def __init__(self, frequency_threshold: float = 0.05):
         self.__threshold = frequency_threshold
         self.__D_F: Dict[str, int] = {}
         self.__N = 0
         self.__D_A: Set[str] = set() # Set of active object types
+        self.__by_count: List[Tuple[int, str]] = [] # (count, object type) of the active object types; entries with an outdated count are skipped
 
-    def evaluate(self, model_event: dict) -> Stream[dict]:
+    def evaluate(self, model_event: dict) -> List[dict]:
         if model_event.get("type") != "dfg":
-            return Stream.of(model_event)
+            return [model_event]
 
         obj_type = model_event["object_type"]
         self.__D_F[obj_type] = self.__D_F.get(obj_type, 0) + 1
@@ -35,18 +58,32 @@ class RelativeFrequencyBasedStrategy(InclusionStrategy):
         total = self.__N
 
         commands = []
+        by_count = self.__by_count
         # Floating point division to avoid early activation and late de-activation
-        if (count / total) >= self.__threshold and obj_type not in self.__D_A:
+        if obj_type in self.__D_A:
+            heapq.heappush(by_count, (count, obj_type))
+        elif (count / total) >= self.__threshold:
             self.__D_A.add(obj_type)
+            heapq.heappush(by_count, (count, obj_type))
             commands.append(create_command(Command.ACTIVE, obj_type))
 
-        for ot in list(self.__D_A):
-            if (self.__D_F.get(ot, 0) / total) < self.__threshold:
+        while by_count:
+            ot_count, ot = by_count[0]
+            if ot not in self.__D_A or self.__D_F[ot] != ot_count:
+                heapq.heappop(by_count)
+            elif (ot_count / total) < self.__threshold:
+                heapq.heappop(by_count)
                 self.__D_A.remove(ot)
                 commands.append(create_command(Command.INACTIVE, ot))
+            else:
+                break
+        if len(by_count) > 2 * len(self.__D_A) + 16:
+            # Drop the outdated entries
+            self.__by_count = [(self.__D_F[ot], ot) for ot in self.__D_A]
+            heapq.heapify(self.__by_count)
 
         commands.append(model_event)
-        return Stream.from_iterable(commands)
+        return commands
 
 
 class LossyCountingStrategy(InclusionStrategy):
@@ -65,9 +102,9 @@ class LossyCountingStrategy(InclusionStrategy):
         self.__observed_emitted_models = 1
         self.__D_C: Dict[str, Tuple[int, int]] = {}  # {object_type: (frequency, delta)}
 
-    def evaluate(self, model_event: dict) -> Stream[dict]:
+    def evaluate(self, model_event: dict) -> List[dict]:
         if model_event.get("type") != "dfg":
-            return Stream.of(model_event)
+            return [model_event]
 
         b_curr = int(math.ceil(self.__observed_emitted_models / self.__bucket_width))
 
@@ -93,7 +130,7 @@ class LossyCountingStrategy(InclusionStrategy):
 
         commands.append(model_event)
         self.__observed_emitted_models += 1
-        return Stream.from_iterable(commands)
+        return commands
 
 class SlidingWindowStrategy(InclusionStrategy):
     """
@@ -104,16 +141,17 @@ class SlidingWindowStrategy(InclusionStrategy):
     The strategy dynamically updates which object types are considered active by checking
     their presence in the current window. This supports responsiveness to recent trends
     and enables concept drift detection over time.
+    Object types are kept in the order they were last seen, so that only those leaving the window are visited.
     :param window_size: The window sized considered in the sliding window.
     """
     def __init__(self, window_size: int = 30):
         self.window_size = window_size
         self.observed_events = 0
-        self.D_W: Dict[str, int] = {}  # Last seen index for each object type
+        self.D_W: OrderedDict[str, int] = OrderedDict()  # Last seen index for each object type, from the least recent
 
-    def evaluate(self, model_event: dict):
+    def evaluate(self, model_event: dict) -> List[dict]:
         if model_event.get("type") != "dfg":
-            return Stream.of(model_event)
+            return [model_event]
 
         self.observed_events += 1
         obj_type = model_event["object_type"]
@@ -122,20 +160,18 @@ class SlidingWindowStrategy(InclusionStrategy):
         # Update last seen
         if obj_type in self.D_W:
             self.D_W[obj_type] = self.observed_events
+            self.D_W.move_to_end(obj_type)
         else:
             self.D_W[obj_type] = self.observed_events
             commands.append(create_command(Command.ACTIVE, obj_type))
 
-
-        to_remove = []
-        # Prune inactive object types
-        for obj_type, last_seen in self.D_W.items():
-            if self.observed_events - last_seen >= self.window_size:
-                commands.append(create_command(Command.INACTIVE, obj_type))
-                to_remove.append(obj_type)
-
-        for obj_type in to_remove:
+        # Prune inactive object types, the least recently seen first
+        while self.D_W:
+            obj_type, last_seen = next(iter(self.D_W.items()))
+            if self.observed_events - last_seen < self.window_size:
+                break
             del self.D_W[obj_type]
+            commands.append(create_command(Command.INACTIVE, obj_type))
 
         commands.append(model_event)
-        return Stream.from_iterable(commands)
+        return commands
@@ -1,4 +1,6 @@
+import sys
 from datetime import datetime
+from typing import Dict, Any, Optional
 from pybeamline.abstractevent import AbstractEvent
 
 # These names are from pm4py.objects.log.util.xes which is not imported for performance reasons
@@ -7,29 +9,99 @@ DEFAULT_TIMESTAMP_KEY = 'time:timestamp'
 DEFAULT_TRACEID_KEY = 'concept:name'
 
 
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
 class BEvent(AbstractEvent):
+    # Events are kept compact: the three attribute dictionaries are only created when they are accessed
+    # (e.g., to store extra attributes) and, once created, become the source of truth for the getters.
+    # Without an explicit time, the event is timestamped when its time is first read.
+    __slots__ = ('_activity_name', '_case_id', '_process_name', '_event_time',
+                 '_process_attributes', '_trace_attributes', '_event_attributes',
+                 '_activity_code', '_symbol_table')
 
     def __init__(self, activity_name, case_id, process_name="ProcessName", event_time=None):
-        self.process_attributes = dict()
-        self.trace_attributes = dict()
-        self.event_attributes = dict()
+        self._activity_name = _intern(activity_name)
+        self._case_id = _intern(case_id)
+        self._process_name = process_name
+        self._event_time = event_time
+        self._process_attributes: Optional[Dict[str, Any]] = None
+        self._trace_attributes: Optional[Dict[str, Any]] = None
+        self._event_attributes: Optional[Dict[str, Any]] = None
+        self._activity_code: Optional[int] = None
+        self._symbol_table = None
+
+    @property
+    def process_attributes(self) -> Dict[str, Any]:
+        if self._process_attributes is None:
+            self._process_attributes = {DEFAULT_NAME_KEY: self._process_name}
+        return self._process_attributes
+
+    @process_attributes.setter
+    def process_attributes(self, value: Dict[str, Any]) -> None:
+        self._process_attributes = value
+
+    @property
+    def trace_attributes(self) -> Dict[str, Any]:
+        if self._trace_attributes is None:
+            self._trace_attributes = {DEFAULT_TRACEID_KEY: self._case_id}
+        return self._trace_attributes
+
+    @trace_attributes.setter
+    def trace_attributes(self, value: Dict[str, Any]) -> None:
+        self._trace_attributes = value
+
+    @property
+    def event_attributes(self) -> Dict[str, Any]:
+        if self._event_attributes is None:
+            self._event_attributes = {DEFAULT_NAME_KEY: self._activity_name, DEFAULT_TIMESTAMP_KEY: self.get_event_time()}
+        return self._event_attributes
 
-        self.process_attributes[DEFAULT_NAME_KEY] = process_name
-        self.trace_attributes[DEFAULT_TRACEID_KEY] = case_id
-        self.event_attributes[DEFAULT_NAME_KEY] = activity_name
-        self.event_attributes[DEFAULT_TIMESTAMP_KEY] = datetime.now() if not event_time else event_time
+    @event_attributes.setter
+    def event_attributes(self, value: Dict[str, Any]) -> None:
+        self._event_attributes = value
 
     def get_process_name(self):
-        return self.process_attributes[DEFAULT_NAME_KEY]
+        if self._process_attributes is None:
+            return self._process_name
+        return self._process_attributes[DEFAULT_NAME_KEY]
 
     def get_trace_name(self):
-        return self.trace_attributes[DEFAULT_TRACEID_KEY]
+        if self._trace_attributes is None:
+            return self._case_id
+        return self._trace_attributes[DEFAULT_TRACEID_KEY]
 
     def get_event_name(self):
-        return self.event_attributes[DEFAULT_NAME_KEY]
+        if self._event_attributes is None:
+            return self._activity_name
+        return self._event_attributes[DEFAULT_NAME_KEY]
 
     def get_event_time(self):
-        return self.event_attributes[DEFAULT_TIMESTAMP_KEY]
+        if self._event_attributes is None:
+            if self._event_time is None:
+                self._event_time = datetime.now()
+            return self._event_time
+        return self._event_attributes[DEFAULT_TIMESTAMP_KEY]
+
+    def get_event_code(self) -> Optional[int]:
+        return self._activity_code
+
+    def get_symbol_table(self):
+        return self._symbol_table
+
+    def set_codes(self, activity_code: Optional[int], symbol_table=None) -> None:
+        """
+        Attaches the code of the activity to the event, with the SymbolTable which assigned it.
+        """
+        self._activity_code = activity_code
+        self._symbol_table = symbol_table
+
+    @staticmethod
+    def _extra_attributes(attributes: Optional[Dict[str, Any]], *keys: str) -> Dict[str, Any]:
+        if attributes is None:
+            return {}
+        return {c: attributes[c] for c in attributes.keys() - set(keys)}
 
     def __str__(self) -> str:
         return "({}, {}, {}, {} - {} - {} - {})".format(
@@ -37,9 +109,9 @@ class BEvent(AbstractEvent):
             self.get_trace_name(),
             self.get_process_name(),
             str(self.get_event_time()),
-            str({c: self.event_attributes[c] for c in self.event_attributes.keys() - {DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY}}),
-            str({c: self.trace_attributes[c] for c in self.trace_attributes.keys() - {DEFAULT_TRACEID_KEY}}),
-            str({c: self.process_attributes[c] for c in self.process_attributes.keys() - {DEFAULT_NAME_KEY}})
+            str(self._extra_attributes(self._event_attributes, DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY)),
+            str(self._extra_attributes(self._trace_attributes, DEFAULT_TRACEID_KEY)),
+            str(self._extra_attributes(self._process_attributes, DEFAULT_NAME_KEY))
         )
 
     def to_dict(self):
@@ -51,5 +123,3 @@ class BEvent(AbstractEvent):
             "trace_attributes": self.trace_attributes,
             "event_attributes": self.event_attributes
         }
-
-
@@ -27,6 +27,8 @@ class BOEvent(AbstractEvent):
         self.timestamp = timestamp or datetime.now()
         self.omap = omap
         self.vmap = vmap or {}
+        self.activity_code: Optional[int] = None  # assigned by a SymbolTable, if any
+        self.symbol_table = None  # the SymbolTable which assigned activity_code, if any
 
 
     def get_event_id(self):
@@ -38,6 +40,12 @@ class BOEvent(AbstractEvent):
     def get_event_time(self):
         return self.timestamp
 
+    def get_event_code(self) -> Optional[int]:
+        return self.activity_code
+
+    def get_symbol_table(self):
+        return self.symbol_table
+
     def get_object_ids(self) -> List[str]:
         return [oid for ids in self.omap.values() for oid in ids]
 
@@ -63,4 +71,54 @@ class BOEvent(AbstractEvent):
             DEFAULT_EVENT_TIMESTAMP: self.timestamp,
             OCEL_OMAP_KEY: self.omap,
             OCEL_VMAP_KEY: self.vmap
-        }
\ No newline at end of file
+        }
+
+class FlattenedBOEvent(BOEvent):
+    """
+    View of a BOEvent restricted to one of its objects, as produced when flattening the event on
+    an object type. The event id, activity, timestamp and vmap are those of the parent event, which
+    are shared rather than copied; the object id acts as the case id of the flattened event.
+    """
+    __slots__ = ('_parent', 'object_type', 'object_id')
+
+    def __init__(self, parent: BOEvent, object_type: str, object_id: str):
+        self._parent = parent
+        self.object_type = object_type
+        self.object_id = object_id
+
+    @property
+    def event_id(self):
+        return self._parent.event_id
+
+    @property
+    def activity_name(self):
+        return self._parent.activity_name
+
+    @property
+    def timestamp(self):
+        return self._parent.timestamp
+
+    @property
+    def vmap(self):
+        return self._parent.vmap
+
+    @property
+    def omap(self) -> Dict[str, Set[str]]:
+        return {self.object_type: {self.object_id}}
+
+    @property
+    def activity_code(self) -> Optional[int]:
+        return self._parent.activity_code
+
+    @property
+    def symbol_table(self):
+        return self._parent.symbol_table
+
+    def get_trace_name(self):
+        return self.object_id
+
+    def get_object_ids(self) -> List[str]:
+        return [self.object_id]
+
+    def get_omap_types(self):
+        return [self.object_type]
@@ -1,9 +1,9 @@
 class IncrementalMean:
     """Apache Commons Math Mean equivalent (empty-safe)."""
 
-    def __init__(self):
-        self._count = 0
-        self._mean = 0.0
+    def __init__(self, count: int = 0, mean: float = 0.0):
+        self._count = count
+        self._mean = mean
 
     def increment(self, value: float) -> None:
         self._count += 1
@@ -0,0 +1,50 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pybeamline.models.pdfa.pdfa import Pdfa
+
+
+class CompiledPdfa:
+    """
+    Read-only form of a Pdfa for scoring: nodes are mapped to consecutive indices and the
+    transition probabilities (and their negated logarithms) are stored in dense matrices,
+    so that scoring a transition is a single array lookup.
+    """
+
+    def __init__(self, nodes: List[str], probabilities: np.ndarray, weight_factor: float = 1.0):
+        self.nodes: List[str] = list(nodes)
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+        self.probabilities: np.ndarray = probabilities
+        with np.errstate(divide="ignore", invalid="ignore"):  # impossible transitions cost an infinite log probability
+            self.neg_log_probabilities: np.ndarray = np.where(
+                probabilities > 0.0, -np.log(probabilities, dtype=np.float64), np.inf)
+        self.weight_factor = weight_factor
+
+    @staticmethod
+    def compile(pdfa: Pdfa) -> 'CompiledPdfa':
+        nodes, probabilities = CompiledPdfa.dense_matrix(pdfa)
+        return CompiledPdfa(nodes, probabilities, getattr(pdfa, "weight_factor", 1.0))
+
+    @staticmethod
+    def dense_matrix(pdfa: Pdfa) -> Tuple[List[str], np.ndarray]:
+        """
+        Returns the sorted nodes of the Pdfa and the matrix of its edge weights (0.0 for missing edges).
+        """
+        nodes = sorted(pdfa.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        probabilities = np.zeros((len(nodes), len(nodes)), dtype=np.float64)
+        for source, targets in pdfa.edges.items():
+            for target, probability in targets.items():
+                probabilities[index[source], index[target]] = probability
+        return nodes, probabilities
+
+    def index_of(self, node: str) -> Optional[int]:
+        return self.index.get(node)
+
+    def get_sequence_probability(self, source: str, target: str) -> float:
+        i = self.index.get(source)
+        j = self.index.get(target)
+        if i is None or j is None:
+            return 0.0
+        return float(self.probabilities[i, j])
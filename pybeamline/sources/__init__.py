@@ -1,4 +1,5 @@
 from pybeamline.sources.xes_log_source import xes_log_source_from_file, XesLogSource
+from pybeamline.sources.streaming_xes_log_source import streaming_xes_log_source_from_file
 from pybeamline.sources.string_test_source import string_test_source
 from pybeamline.sources.mqttxes_source import mqttxes_source
 from typing import Union
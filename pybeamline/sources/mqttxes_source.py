@@ -1,22 +1,25 @@
 import json
+from typing import Optional
 
 import paho.mqtt.client as mqtt
 
 from pybeamline.bevent import BEvent
 from pybeamline.stream.base_source import BaseSource
 from pybeamline.stream.stream import Stream
+from pybeamline.symbol_table import SymbolTable
 
 
-def mqttxes_source(broker: str, port: int, base_topic: str) -> Stream[BEvent]:
-    return Stream.source(MqttSource(broker, port, base_topic))
+def mqttxes_source(broker: str, port: int, base_topic: str, symbol_table: Optional[SymbolTable] = None) -> Stream[BEvent]:
+    return Stream.source(MqttSource(broker, port, base_topic, symbol_table))
 
 
 class MqttSource(BaseSource[BEvent]):
 
-    def __init__(self, broker: str, port: int, base_topic: str) -> None:
+    def __init__(self, broker: str, port: int, base_topic: str, symbol_table: Optional[SymbolTable] = None) -> None:
         self.broker = broker
         self.port = port
         self.base_topic = base_topic
+        self.symbol_table = symbol_table
 
     def execute(self):
         def on_connect(client, userdata, flags, rc):
@@ -46,6 +49,8 @@ class MqttSource(BaseSource[BEvent]):
                         e.event_attributes[k] = attributes[k]
             except json.JSONDecodeError:
                 print("Error decoding JSON")
+            if self.symbol_table is not None:
+                self.symbol_table.encode_event(e)
             self.produce(e)
 
         def on_disconnect(client, userdata, rc):
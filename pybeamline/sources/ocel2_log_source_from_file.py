@@ -1,23 +1,26 @@
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pm4py import OCEL, ocel_sort_by_additional_column, read_ocel2
 from pybeamline.boevent import BOEvent
 from pybeamline.stream.base_source import BaseSource
 from pybeamline.stream.stream import Stream
+from pybeamline.symbol_table import SymbolTable
 
 
-def ocel2_log_source_from_file(log_path: str, ) -> Stream[BOEvent]:
+def ocel2_log_source_from_file(log_path: str, symbol_table: Optional[SymbolTable] = None) -> Stream[BOEvent]:
     """
     Loads an OCEL 2.0 log from a file path and returns it as an Observable of BOEvent objects.
     :param log_path: str
+    :param symbol_table: optional SymbolTable used to assign activity codes to the events
     :return: Observable[BOEvent]
     """
-    return Stream.source(Ocel2LogSource(read_ocel2(log_path)))
+    return Stream.source(Ocel2LogSource(read_ocel2(log_path), symbol_table))
 
 class Ocel2LogSource(BaseSource[BOEvent]):
 
-    def __init__(self, log: OCEL):
+    def __init__(self, log: OCEL, symbol_table: Optional[SymbolTable] = None):
         self.log = log
+        self.symbol_table = symbol_table
         """
         Converts an OCEL object into an Observable stream of BOEvent objects,
         ordered by timestamp if available.
@@ -51,5 +54,8 @@ class Ocel2LogSource(BaseSource[BOEvent]):
                 omap=omap,
                 vmap=vmap
             )
+            if self.symbol_table is not None:
+                bo_event.activity_code = self.symbol_table.encode_activity(bo_event.activity_name)
+                bo_event.symbol_table = self.symbol_table
             self.produce(bo_event)
         self.completed()
\ No newline at end of file
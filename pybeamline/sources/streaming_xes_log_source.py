@@ -0,0 +1,197 @@
+import gzip
+import heapq
+import pickle
+import tempfile
+from typing import Iterator, List, Dict, Any, Optional, IO, Tuple
+from xml.etree.ElementTree import iterparse
+
+from pm4py.util import xes_constants as xes_util
+from pm4py.util.dt_parsing import parser as dt_parser
+
+from pybeamline.bevent import BEvent
+from pybeamline.stream.base_source import BaseSource
+from pybeamline.stream.stream import Stream
+from pybeamline.symbol_table import SymbolTable
+
+_ATTRIBUTE_TAGS = {"string", "date", "int", "float", "boolean", "id"}
+
+
+def streaming_xes_log_source_from_file(log_path: str, sort_by_timestamp: bool = False, chunk_size: int = 100000,
+                                       symbol_table: Optional[SymbolTable] = None) -> Stream[BEvent]:
+    """
+    Replays an XES file (plain or gzipped) while parsing it, without loading the whole log in memory.
+    :param log_path: path of the .xes or .xes.gz file
+    :param sort_by_timestamp: if True, events are emitted ordered by time:timestamp using an external merge sort
+    :param chunk_size: maximum number of events kept in memory (and written to each sorted run) when sorting
+    :param symbol_table: optional SymbolTable used to assign activity codes to the events
+    :return: Stream[BEvent]
+    """
+    return Stream.source(StreamingXesLogSource(log_path, sort_by_timestamp, chunk_size, symbol_table))
+
+
+class StreamingXesLogSource(BaseSource[BEvent]):
+
+    def __init__(self, log_path: str, sort_by_timestamp: bool = False, chunk_size: int = 100000,
+                 symbol_table: Optional[SymbolTable] = None):
+        self.log_path = log_path
+        self.sort_by_timestamp = sort_by_timestamp
+        self.chunk_size = max(int(chunk_size), 1)
+        self.symbol_table = symbol_table
+        self._closed = False
+
+    def execute(self):
+        if self.sort_by_timestamp:
+            events = self._sorted_events()
+        else:
+            events = self._events()
+        for e in events:
+            if self._closed:
+                break
+            if self.symbol_table is not None:
+                self.symbol_table.encode_event(e)
+            self.produce(e)
+        self.completed()
+
+    def close(self):
+        self._closed = True
+
+    def _open(self) -> IO[bytes]:
+        if self.log_path.endswith(".gz"):
+            return gzip.open(self.log_path, "rb")
+        return open(self.log_path, "rb")
+
+    def _events(self) -> Iterator[BEvent]:
+        for trace_attributes, event_attributes in self._records():
+            yield self._to_event(trace_attributes, event_attributes)
+
+    def _records(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Yields the (trace attributes, event attributes) of every event in file order, one trace at a time.
+        Processed elements are cleared, so memory is bounded by the size of a single trace.
+        """
+        date_parser = dt_parser.get()
+        with self._open() as file:
+            root = None
+            stack: List[str] = []
+            trace_attributes: Optional[Dict[str, Any]] = None
+            event_attributes: Optional[Dict[str, Any]] = None
+            trace_events: List[Dict[str, Any]] = []
+
+            for tree_event, elem in iterparse(file, events=("start", "end")):
+                tag = elem.tag.rsplit("}", 1)[-1]
+                if tree_event == "start":
+                    if root is None:
+                        root = elem
+                    stack.append(tag)
+                    if tag == "trace":
+                        trace_attributes = {}
+                        trace_events = []
+                    elif tag == "event" and trace_attributes is not None:
+                        event_attributes = {}
+                    continue
+
+                stack.pop()
+                if tag in _ATTRIBUTE_TAGS and stack:
+                    # Only attributes directly nested in a trace or an event are considered
+                    if stack[-1] == "event" and event_attributes is not None:
+                        self._parse_attribute(elem, tag, event_attributes, date_parser)
+                    elif stack[-1] == "trace" and trace_attributes is not None:
+                        self._parse_attribute(elem, tag, trace_attributes, date_parser)
+                elif tag == "event" and event_attributes is not None:
+                    trace_events.append(event_attributes)
+                    event_attributes = None
+                    elem.clear()
+                elif tag == "trace" and trace_attributes is not None:
+                    for attributes in trace_events:
+                        yield trace_attributes, attributes
+                    trace_attributes = None
+                    trace_events = []
+                    root.clear()
+
+    @staticmethod
+    def _parse_attribute(elem, tag: str, attributes: Dict[str, Any], date_parser) -> None:
+        key = elem.get("key")
+        value = elem.get("value")
+        if key is None:
+            return
+        try:
+            if tag == "date":
+                value = date_parser.apply(value)
+            elif tag == "int":
+                value = int(value)
+            elif tag == "float":
+                value = float(value)
+            elif tag == "boolean":
+                value = str(value).lower() == "true"
+        except (TypeError, ValueError):
+            return
+        attributes[key] = value
+
+    @staticmethod
+    def _to_event(trace_attributes: Dict[str, Any], event_attributes: Dict[str, Any]) -> BEvent:
+        e = BEvent(
+            event_attributes.get(xes_util.DEFAULT_NAME_KEY),
+            trace_attributes.get(xes_util.DEFAULT_TRACEID_KEY),
+            "log-file",
+            event_attributes.get(xes_util.DEFAULT_TIMESTAMP_KEY))
+        for key, value in trace_attributes.items():
+            if key != xes_util.DEFAULT_TRACEID_KEY:
+                e.trace_attributes[key] = value
+        for key, value in event_attributes.items():
+            if key not in (xes_util.DEFAULT_NAME_KEY, xes_util.DEFAULT_TIMESTAMP_KEY):
+                e.event_attributes[key] = value
+        return e
+
+    def _sorted_events(self) -> Iterator[BEvent]:
+        """
+        External merge sort by time:timestamp: the log is split into sorted runs of at most
+        `chunk_size` events, spilled to temporary files, and then lazily merged.
+        Events without timestamp are emitted last, ties keep the file order.
+        """
+        runs: List[IO[bytes]] = []
+        chunk: List[tuple] = []
+        try:
+            for seq, (trace_attributes, event_attributes) in enumerate(self._records()):
+                chunk.append((self._sort_key(event_attributes, seq), trace_attributes, event_attributes))
+                if len(chunk) >= self.chunk_size:
+                    runs.append(self._spill(chunk))
+                    chunk = []
+
+            if runs:
+                if chunk:
+                    runs.append(self._spill(chunk))
+                    chunk = []
+                records = heapq.merge(*[self._read_run(run) for run in runs], key=lambda item: item[0])
+            else:
+                chunk.sort(key=lambda item: item[0])
+                records = iter(chunk)
+
+            for _, trace_attributes, event_attributes in records:
+                yield self._to_event(trace_attributes, event_attributes)
+        finally:
+            for run in runs:
+                run.close()
+
+    @staticmethod
+    def _sort_key(event_attributes: Dict[str, Any], seq: int) -> tuple:
+        time = event_attributes.get(xes_util.DEFAULT_TIMESTAMP_KEY)
+        if time is None:
+            return 1, seq
+        return 0, time, seq
+
+    @staticmethod
+    def _spill(chunk: List[tuple]) -> IO[bytes]:
+        chunk.sort(key=lambda item: item[0])
+        run = tempfile.TemporaryFile()
+        for item in chunk:
+            pickle.dump(item, run, protocol=pickle.HIGHEST_PROTOCOL)
+        run.seek(0)
+        return run
+
+    @staticmethod
+    def _read_run(run: IO[bytes]) -> Iterator[tuple]:
+        while True:
+            try:
+                yield pickle.load(run)
+            except EOFError:
+                return
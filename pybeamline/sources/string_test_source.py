@@ -1,22 +1,27 @@
 from pybeamline.bevent import BEvent
-from typing import Iterable
+from typing import Iterable, Optional
 
 from pybeamline.stream.base_source import BaseSource
 from pybeamline.stream.stream import Stream
+from pybeamline.symbol_table import SymbolTable
 
-def string_test_source(iterable: Iterable[str]) -> Stream[BEvent]:
-    return Stream.source(StringTestSource(iterable))
+def string_test_source(iterable: Iterable[str], symbol_table: Optional[SymbolTable] = None) -> Stream[BEvent]:
+    return Stream.source(StringTestSource(iterable, symbol_table))
 
 
 class StringTestSource(BaseSource[BEvent]):
 
-    def __init__(self, iterable: Iterable[str]):
+    def __init__(self, iterable: Iterable[str], symbol_table: Optional[SymbolTable] = None):
         self._iterable = iterable
+        self._symbol_table = symbol_table
 
     def execute(self) -> None:
         trace_id = 1
         for trace in self._iterable:
             for event in trace:
-                self.produce(BEvent(event, "case_" + str(trace_id), "Process"))
+                e = BEvent(event, "case_" + str(trace_id), "Process")
+                if self._symbol_table is not None:
+                    self._symbol_table.encode_event(e)
+                self.produce(e)
             trace_id += 1
         self.completed()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Union, Optional, Iterator, List, Tuple, Any
 from pm4py.objects.log.obj import EventLog
 from pm4py.util import xes_constants as xes_util
 from pm4py import read_xes, convert_to_dataframe
@@ -7,37 +7,76 @@ import pandas as pd
 from pybeamline.bevent import BEvent
 from pybeamline.stream.base_source import BaseSource
 from pybeamline.stream.stream import Stream
+from pybeamline.symbol_table import SymbolTable
 
-def xes_log_source_from_file(log: str) -> Stream[BEvent]:
-    return Stream.source(XesLogSource(read_xes(log)))
+def xes_log_source_from_file(log: str, batch_size: Optional[int] = None, symbol_table: Optional[SymbolTable] = None) -> Stream[BEvent]:
+    return Stream.source(XesLogSource(read_xes(log), batch_size, symbol_table), batched=batch_size is not None)
 
 
 class XesLogSource(BaseSource[BEvent]):
 
-    def __init__(self, raw_log: Union[EventLog, pd.DataFrame]):
+    def __init__(self, raw_log: Union[EventLog, pd.DataFrame], batch_size: Optional[int] = None, symbol_table: Optional[SymbolTable] = None):
         self.log = raw_log
+        self.batch_size = batch_size
+        self.symbol_table = symbol_table
         if type(self.log) is not pd.DataFrame:
             self.log = convert_to_dataframe(self.log)
         if xes_util.DEFAULT_TIMESTAMP_KEY in self.log.columns:
             self.log = self.log.sort_values(by=[xes_util.DEFAULT_TIMESTAMP_KEY])
 
     def execute(self):
-        for index, event in self.log.iterrows():
-            time = None
-            if xes_util.DEFAULT_TIMESTAMP_KEY in event:
-                time = event[xes_util.DEFAULT_TIMESTAMP_KEY]
+        if self.batch_size is not None:
+            batch = []
+            for e in self._events():
+                batch.append(e)
+                if len(batch) >= self.batch_size:
+                    self.produce_batch(batch)
+                    batch = []
+            if batch:
+                self.produce_batch(batch)
+        else:
+            for e in self._events():
+                self.produce(e)
+        self.completed()
+
+    def _events(self) -> Iterator[BEvent]:
+        # Columns are extracted once and replayed by position, avoiding the materialization of a row per event
+        case_key = "case:" + xes_util.DEFAULT_TRACEID_KEY
+        names = self._column(xes_util.DEFAULT_NAME_KEY)
+        cases = self._column(case_key)
+        times = None
+        if xes_util.DEFAULT_TIMESTAMP_KEY in self.log.columns:
+            times = self._column(xes_util.DEFAULT_TIMESTAMP_KEY)
+
+        attributes: List[Tuple[bool, str, List[Any], Optional[List[bool]]]] = []
+        for col in self.log.columns:
+            if col in [xes_util.DEFAULT_NAME_KEY, case_key, xes_util.DEFAULT_TIMESTAMP_KEY]:
+                continue
+            series = self.log[col]
+            values = series.to_numpy(dtype=object)
+            mask = None  # no missing values in the column
+            if not series.notna().all():
+                mask = (values == values).tolist()  # verify for nan
+            if col.startswith("case:"):
+                attributes.append((True, col[5:], values.tolist(), mask))
+            else:
+                attributes.append((False, col, values.tolist(), mask))
+
+        for i in range(len(names)):
             e = BEvent(
-                event[xes_util.DEFAULT_NAME_KEY],
-                event["case:" + xes_util.DEFAULT_TRACEID_KEY],
+                names[i],
+                cases[i],
                 "log-file",
-                time)
-            for col in self.log.columns:
-                if col not in [xes_util.DEFAULT_NAME_KEY, "case:" + xes_util.DEFAULT_NAME_KEY,
-                               xes_util.DEFAULT_TIMESTAMP_KEY]:
-                    if event[col] == event[col]:  # verify for nan
-                        if col.startswith("case:"):
-                            e.trace_attributes[col[5:]] = event[col]
-                        else:
-                            e.event_attributes[col] = event[col]
-            self.produce(e)
-        self.completed()
\ No newline at end of file
+                times[i] if times is not None else None)
+            for is_trace_attribute, key, values, mask in attributes:
+                if mask is None or mask[i]:
+                    if is_trace_attribute:
+                        e.trace_attributes[key] = values[i]
+                    else:
+                        e.event_attributes[key] = values[i]
+            if self.symbol_table is not None:
+                self.symbol_table.encode_event(e)
+            yield e
+
+    def _column(self, col: str) -> List[Any]:
+        return self.log[col].to_numpy(dtype=object).tolist()
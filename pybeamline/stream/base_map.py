@@ -5,6 +5,7 @@ from typing_extensions import final
 from reactivex import create
 
 from pybeamline.stream.base_operator import BaseOperator
+from pybeamline.stream.event_batch import EventBatch
 from pybeamline.stream.stream import Stream
 
 T = TypeVar('T')
@@ -17,17 +18,90 @@ class BaseMap(Generic[T, R], BaseOperator[Stream[T], Stream[R]], ABC):
     def transform(self, value: T) -> Optional[List[R]]:
         pass
 
+    def transform_batch(self, values: List[T]) -> Optional[List[R]]:
+        """
+        Transforms a batch of values at once, used when the stream is batched.
+        Operators can override it to amortize their bookkeeping over the batch, as long
+        as the results are the same (and in the same order) as calling `transform` on each value.
+        """
+        results: List[R] = []
+        for value in values:
+            r = self.transform(value)
+            if r is not None:
+                results.extend(r)
+        return results
+
+    def flush(self) -> Optional[List[R]]:
+        """
+        Called when the stream completes, to emit the results still pending (e.g., those of
+        values buffered by the operator). By default, there are none.
+        """
+        return None
+
+    def open(self) -> None:
+        """
+        Called when the stream is subscribed, before any value, to acquire the resources of the
+        operator (e.g., worker processes). By default, there are none.
+        """
+        return None
+
+    def close(self) -> None:
+        """
+        Called when the stream terminates, after flush on completion or on error, to release the
+        resources held by the operator (e.g., worker processes). By default, there are none.
+        """
+        return None
+
     @final
     def apply(self, stream: Stream[T]) -> Stream[R]:
+        if stream.batched:
+            return self._apply_batched(stream)
+
         def on_subscribe(observer, scheduler):
+            self.open()
             def on_next(item):
                 results = self.transform(item)
                 if results is not None:
                     for r in results:
                         observer.on_next(r)
             def on_error(e):
+                self.close()
                 observer.on_error(e)
             def on_completed():
+                try:
+                    results = self.flush()
+                finally:
+                    self.close()
+                if results is not None:
+                    for r in results:
+                        observer.on_next(r)
                 observer.on_completed()
             stream.subscribe(on_next=on_next, on_error=on_error, on_completed=on_completed, blocking=False)
         return Stream(create(on_subscribe))
+
+    def _apply_batched(self, stream: Stream[T]) -> Stream[R]:
+        def on_subscribe(observer, scheduler):
+            self.open()
+            def on_next(item):
+                if isinstance(item, EventBatch):
+                    results = self.transform_batch(item)
+                    if results:
+                        observer.on_next(EventBatch(results))
+                else:
+                    results = self.transform(item)
+                    if results is not None:
+                        for r in results:
+                            observer.on_next(r)
+            def on_error(e):
+                self.close()
+                observer.on_error(e)
+            def on_completed():
+                try:
+                    results = self.flush()
+                finally:
+                    self.close()
+                if results:
+                    observer.on_next(EventBatch(results))
+                observer.on_completed()
+            return stream.to_batch_observable().subscribe(on_next, on_error, on_completed, scheduler=scheduler)
+        return Stream(create(on_subscribe), batched=True)
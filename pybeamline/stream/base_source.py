@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, TypeVar, List
 
 from typing_extensions import final
 
@@ -17,6 +17,9 @@ class BaseSource(ABC, Generic[T]):
     @final
     def produce(self, item: T): pass
 
+    @final
+    def produce_batch(self, items: List[T]): pass
+
     @final
     def error(self, e: Exception): pass
 
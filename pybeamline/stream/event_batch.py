@@ -0,0 +1,27 @@
+from typing import TypeVar, List
+
+from reactivex import Observable, create
+
+T = TypeVar('T')
+
+
+class EventBatch(List[T]):
+    """
+    List of values travelling as a single item through a batched stream.
+    """
+    pass
+
+
+def flatten_batches(source: Observable) -> Observable:
+    """
+    Rx operator re-emitting the content of every EventBatch as individual values.
+    """
+    def on_subscribe(observer, scheduler):
+        def on_next(item):
+            if isinstance(item, EventBatch):
+                for value in item:
+                    observer.on_next(value)
+            else:
+                observer.on_next(item)
+        return source.subscribe(on_next, observer.on_error, observer.on_completed, scheduler=scheduler)
+    return create(on_subscribe)
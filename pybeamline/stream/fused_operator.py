@@ -0,0 +1,182 @@
+from typing import TypeVar, Generic, List, Callable, Any, Iterable
+
+from reactivex import create
+from typing_extensions import override
+
+from pybeamline.stream.base_filter import BaseFilter
+from pybeamline.stream.base_map import BaseMap
+from pybeamline.stream.base_operator import BaseOperator
+from pybeamline.stream.event_batch import EventBatch
+from pybeamline.stream.stream import Stream
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def is_fusable(op: Any) -> bool:
+    """
+    Returns True if the operator is a plain synchronous BaseMap or BaseFilter, i.e., one
+    that does not override the default Rx wiring and can therefore be run inline.
+    """
+    if isinstance(op, BaseMap):
+        return type(op).apply is BaseMap.apply
+    if isinstance(op, BaseFilter):
+        return type(op).apply is BaseFilter.apply
+    return False
+
+
+def fuse_operators(operators: Iterable[BaseOperator]) -> List[BaseOperator]:
+    """
+    Groups runs of two or more consecutive fusable operators into a single FusedOperator.
+    Any other operator is kept as is and acts as an asynchronous boundary.
+    """
+    fused: List[BaseOperator] = []
+    run: List[BaseOperator] = []
+
+    def close_run():
+        if len(run) > 1:
+            fused.append(FusedOperator(run))
+        else:
+            fused.extend(run)
+        run.clear()
+
+    for op in operators:
+        if is_fusable(op):
+            run.append(op)
+        else:
+            close_run()
+            fused.append(op)
+    close_run()
+    return fused
+
+
+class FusedOperator(BaseOperator[Stream[T], Stream[R]], Generic[T, R]):
+    """
+    Chain of BaseMap/BaseFilter stages executed within a single Rx subscription.
+    Every incoming value is pushed through all the `condition`/`transform` calls of the
+    chain before the next value is processed, without any intermediate observable.
+    """
+
+    def __init__(self, stages: List[BaseOperator]):
+        for stage in stages:
+            if not is_fusable(stage):
+                raise TypeError(f"Operator {type(stage).__name__} cannot be fused")
+        self.stages: List[BaseOperator] = list(stages)
+
+    def compile(self, emit: Callable[[Any], None]) -> Callable[[Any], None]:
+        return self._compile_stages(self.stages, emit)
+
+    @staticmethod
+    def _compile_stages(stages: List[BaseOperator], emit: Callable[[Any], None]) -> Callable[[Any], None]:
+        downstream = emit
+        for stage in reversed(stages):
+            downstream = FusedOperator._compile_stage(stage, downstream)
+        return downstream
+
+    @staticmethod
+    def _compile_stage(stage: BaseOperator, downstream: Callable[[Any], None]) -> Callable[[Any], None]:
+        if isinstance(stage, BaseFilter):
+            condition = stage.condition
+
+            def step(value):
+                if condition(value):
+                    downstream(value)
+        else:
+            transform = stage.transform
+
+            def step(value):
+                results = transform(value)
+                if results is not None:
+                    for r in results:
+                        downstream(r)
+        return step
+
+    def process(self, value: T) -> List[R]:
+        results: List[R] = []
+        self.compile(results.append)(value)
+        return results
+
+    def process_batch(self, values: List[T]) -> List[R]:
+        for stage in self.stages:
+            if not values:
+                break
+            if isinstance(stage, BaseFilter):
+                condition = stage.condition
+                values = [value for value in values if condition(value)]
+            else:
+                values = stage.transform_batch(values) or []
+        return values
+
+    def flush(self, emit: Callable[[Any], None]) -> None:
+        """
+        Flushes the stages in order, pushing what each one emits through the following stages.
+        """
+        for i, stage in enumerate(self.stages):
+            if isinstance(stage, BaseMap):
+                results = stage.flush()
+                if results:
+                    downstream = self._compile_stages(self.stages[i + 1:], emit)
+                    for r in results:
+                        downstream(r)
+
+    def open(self) -> None:
+        """
+        Opens the BaseMap stages, when the stream is subscribed.
+        """
+        for stage in self.stages:
+            if isinstance(stage, BaseMap):
+                stage.open()
+
+    def close(self) -> None:
+        """
+        Closes the BaseMap stages, when the stream terminates.
+        """
+        for stage in self.stages:
+            if isinstance(stage, BaseMap):
+                stage.close()
+
+    @override
+    def apply(self, stream: Stream[T]) -> Stream[R]:
+        if stream.batched:
+            return self._apply_batched(stream)
+
+        def on_subscribe(observer, scheduler):
+            self.open()
+            on_next = self.compile(observer.on_next)
+            def on_error(e):
+                self.close()
+                observer.on_error(e)
+            def on_completed():
+                try:
+                    self.flush(observer.on_next)
+                finally:
+                    self.close()
+                observer.on_completed()
+            stream.subscribe(on_next=on_next, on_error=on_error, on_completed=on_completed, blocking=False)
+        return Stream(create(on_subscribe))
+
+    def _apply_batched(self, stream: Stream[T]) -> Stream[R]:
+        def on_subscribe(observer, scheduler):
+            self.open()
+            on_value = self.compile(observer.on_next)
+            def on_next(item):
+                if isinstance(item, EventBatch):
+                    results = self.process_batch(item)
+                    if results:
+                        observer.on_next(EventBatch(results))
+                else:
+                    on_value(item)
+            def on_error(e):
+                self.close()
+                observer.on_error(e)
+            def on_completed():
+                results = []
+                try:
+                    self.flush(results.append)
+                finally:
+                    self.close()
+                if results:
+                    observer.on_next(EventBatch(results))
+                observer.on_completed()
+            return stream.to_batch_observable().subscribe(on_next, on_error, on_completed, scheduler=scheduler)
+        return Stream(create(on_subscribe), batched=True)
@@ -10,6 +10,7 @@ from pybeamline.stream.base_operator import BaseOperator
 from pybeamline.stream.base_sink import BaseSink
 from pybeamline.stream.base_source import BaseSource
 from pybeamline.stream.connectable import Connectable
+from pybeamline.stream.event_batch import EventBatch, flatten_batches
 
 T = TypeVar('T')
 R = TypeVar('R')
@@ -17,9 +18,22 @@ R = TypeVar('R')
 
 class Stream(Generic[T]):
 
-    def __init__(self, observable: Observable[T], value_type: type = None):
+    def __init__(self, observable: Observable[T], value_type: type = None, batched: bool = False):
         self._observable: Observable[T] = observable
         self._value_type = value_type
+        self._batched = batched
+
+    @property
+    def batched(self) -> bool:
+        """
+        True if the underlying observable may carry EventBatch items instead of single values.
+        """
+        return self._batched
+
+    def _values(self) -> Observable[T]:
+        if self._batched:
+            return self._observable.pipe(flatten_batches)
+        return self._observable
 
     @staticmethod
     def of(*args: T) -> 'Stream[T]':
@@ -34,7 +48,7 @@ class Stream(Generic[T]):
         return Stream(empty())
 
     @staticmethod
-    def source(base_source: BaseSource[T]) -> 'Stream[T]':
+    def source(base_source: BaseSource[T], batched: bool = False) -> 'Stream[T]':
 
         def on_subscribe(observer, _):
 
@@ -45,6 +59,15 @@ class Stream(Generic[T]):
                 observer.on_completed()
 
             base_source.produce = lambda item: observer.on_next(item)
+            if batched:
+                def _produce_batch(items):
+                    if items:
+                        observer.on_next(EventBatch(items))
+            else:
+                def _produce_batch(items):
+                    for item in items:
+                        observer.on_next(item)
+            base_source.produce_batch = _produce_batch
             base_source.completed = _on_completed
             base_source.error = lambda e: observer.on_error(e)
 
@@ -67,7 +90,7 @@ class Stream(Generic[T]):
 
             return Disposable(dispose)
 
-        return Stream(create(on_subscribe))
+        return Stream(create(on_subscribe), batched=batched)
 
 
     def sink(self, base_sink: BaseSink[T], blocking: bool = True) -> DisposableBase:
@@ -87,7 +110,7 @@ class Stream(Generic[T]):
                 completed_event.set()
             raise e
 
-        subscription = self._observable.subscribe(
+        subscription = self._values().subscribe(
             on_next=on_next,
             on_error=on_error,
             on_completed=on_completed
@@ -99,19 +122,36 @@ class Stream(Generic[T]):
         return subscription
 
     def map(self, func: Callable[[T], R]) -> 'Stream[R]':
+        if self._batched:
+            def map_batch(item):
+                if isinstance(item, EventBatch):
+                    return EventBatch([func(value) for value in item])
+                return func(item)
+            return Stream(self._observable.pipe(ops.map(map_batch)), batched=True)
         return Stream(self._observable.pipe(ops.map(func)))
 
     def filter(self, func: Callable[[T], bool]) -> 'Stream[T]':
+        if self._batched:
+            def on_subscribe(observer, scheduler):
+                def on_next(item):
+                    if isinstance(item, EventBatch):
+                        kept = EventBatch([value for value in item if func(value)])
+                        if kept:
+                            observer.on_next(kept)
+                    elif func(item):
+                        observer.on_next(item)
+                return self._observable.subscribe(on_next, observer.on_error, observer.on_completed, scheduler=scheduler)
+            return Stream(create(on_subscribe), batched=True)
         return Stream(self._observable.pipe(ops.filter(func)))
 
     def flat_map(self, func: Callable[[T], Observable[R]]) -> 'Stream[R]':
-        return Stream(self._observable.pipe(ops.flat_map(func)))
+        return Stream(self._values().pipe(ops.flat_map(func)))
 
     def all_match(self, predicate: Callable[[T], bool]) -> bool:
-        return self._observable.pipe(ops.all(predicate)).run()
+        return self._values().pipe(ops.all(predicate)).run()
 
     def find_first(self) -> Optional[T]:
-        return self._observable.pipe(
+        return self._values().pipe(
             ops.first_or_default(default_value=None)
         ).run()
 
@@ -120,7 +160,7 @@ class Stream(Generic[T]):
 
     def to_list(self) -> List[T]:
         result: List[T] = []
-        self._observable.subscribe(result.append)
+        self._values().subscribe(result.append)
         return result
 
     def subscribe(
@@ -169,7 +209,7 @@ class Stream(Generic[T]):
             scheduler=None
     ) -> DisposableBase:
         # Note: Added return to ensure the subscription object is passed back
-        return self._observable.subscribe(
+        return self._values().subscribe(
             on_next=on_next,
             on_error=on_error,
             on_completed=on_completed,
@@ -177,27 +217,37 @@ class Stream(Generic[T]):
         )
 
     def to_observable(self) -> Observable[T]:
+        return self._values()
+
+    def to_batch_observable(self) -> Observable[Any]:
+        """
+        Returns the underlying observable without flattening, hence items of a batched stream
+        can be EventBatch instances. Used by batch-aware operators.
+        """
         return self._observable
 
     def pipe(self, *operators: BaseOperator['Stream[Any]', 'Stream[Any]']) -> 'Stream[Any]':
+        # Consecutive synchronous maps/filters are fused to run within a single subscription
+        from pybeamline.stream.fused_operator import fuse_operators
+
         stream: Stream[Any] = self
-        for op in operators:
+        for op in fuse_operators(operators):
             stream = op(stream)
         return stream
 
     def merge(self, *others: 'Stream[T]') -> 'Stream[T]':
         observables = [self._observable] + [o._observable for o in others]
         concatenated = merge(*observables)
-        return Stream(concatenated, value_type=self._value_type)
+        return Stream(concatenated, value_type=self._value_type, batched=self._batched or any(o._batched for o in others))
 
     def concat(self, *others: 'Stream[T]') -> 'Stream[T]':
         observables = [self._observable] + [o._observable for o in others]
         concatenated = concat(*observables)
-        return Stream(concatenated, value_type=self._value_type)
+        return Stream(concatenated, value_type=self._value_type, batched=self._batched or any(o._batched for o in others))
 
     def share(self) -> 'Stream[T]':
-        return Stream(self._observable.pipe(ops.share()), value_type=self._value_type)
+        return Stream(self._observable.pipe(ops.share()), value_type=self._value_type, batched=self._batched)
 
     def publish(self) -> tuple['Stream[T]', Connectable]:
         connectable = self._observable.pipe(ops.publish())
-        return Stream(connectable, value_type=self._value_type), Connectable(connectable)
\ No newline at end of file
+        return Stream(connectable, value_type=self._value_type, batched=self._batched), Connectable(connectable)
\ No newline at end of file
@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, List, Hashable, Optional
+
+from pybeamline.abstractevent import AbstractEvent
+
+
+class SymbolTable:
+    """
+    Bidirectional mapping between activities and small consecutive integer codes.
+    A single table can be shared by sources (which attach the codes to the events they produce)
+    and miners (which use the codes as keys and decode them only when a model is emitted).
+    Codes are never released, so only activities are encoded: case ids, which are unbounded on a
+    stream, are kept as they are.
+    Encoding is thread-safe, as sources run in their own threads; the lock is not pickled, so that
+    tables (and the events referring to them) can be sent to other processes.
+    """
+
+    def __init__(self):
+        self._activity_codes: Dict[Hashable, int] = {}
+        self._activities: List[Hashable] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def encode_activity(self, activity: Hashable) -> int:
+        code = self._activity_codes.get(activity)
+        if code is None:
+            with self._lock:
+                code = self._activity_codes.get(activity)
+                if code is None:
+                    code = len(self._activities)
+                    self._activities.append(activity)
+                    self._activity_codes[activity] = code
+        return code
+
+    def decode_activity(self, code: int) -> Hashable:
+        return self._activities[code]
+
+    def get_activity_code(self, activity: Hashable) -> Optional[int]:
+        return self._activity_codes.get(activity)
+
+    def encode_event(self, event) -> None:
+        """
+        Attaches to a BEvent the code of its activity.
+        """
+        event.set_codes(self.encode_activity(event.get_event_name()), self)
+
+    def activity_code(self, event: AbstractEvent) -> int:
+        """
+        Returns the activity code of the event, reusing the one attached by the source if it was
+        assigned by this table (codes assigned by another table are ignored).
+        """
+        code = event.get_event_code() if event.get_symbol_table() is self else None
+        if code is None:
+            code = self.encode_activity(event.get_event_name())
+        return code
+
+    def number_of_activities(self) -> int:
+        return len(self._activities)
@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime, timedelta
+
+from pybeamline.algorithms.conformance.behavioral.behavioral_conformance import BehavioralModelBuilder, \
+    BehavioralConformance, behavioral_conformance, FinalConformance
+from pybeamline.bevent import BEvent
+from pybeamline.stream.stream import Stream
+
+
+class TestBehavioralConformance(unittest.TestCase):
+
+    def setUp(self):
+        builder = BehavioralModelBuilder()
+        for i, trace in enumerate(["ABCD", "ACBD", "ABCD"]):
+            for activity in trace:
+                builder.ingest_event(BEvent(activity, "c" + str(i)))
+        builder.end_xes_to_model()
+        self.model = builder.get_model()
+
+    def test_model(self):
+        B, P, F = self.model
+        self.assertEqual([("A", "B"), ("B", "C"), ("C", "D"), ("A", "C"), ("C", "B"), ("B", "D")], B)
+        self.assertEqual((0, 0), P[("A", "B")])
+        self.assertEqual(0, F[("C", "D")])
+        self.assertEqual(1, F[("A", "B")])
+
+    @staticmethod
+    def build_model(traces):
+        builder = BehavioralModelBuilder()
+        for i, trace in enumerate(traces):
+            for activity in trace:
+                builder.ingest_event(BEvent(activity, "c" + str(i)))
+        builder.end_xes_to_model()
+        return builder.get_model()
+
+    def test_model_distances_acyclic(self):
+        # expected values computed with the original brute-force builder
+        _, P, F = self.build_model(["SABE", "SACDE", "SABDE"])
+        self.assertEqual({("S", "A"): (0, 0), ("A", "B"): (1, 1), ("B", "E"): (2, 2), ("A", "C"): (1, 1),
+                          ("C", "D"): (2, 2), ("D", "E"): (3, 3), ("B", "D"): (2, 2)}, P)
+        self.assertEqual({("S", "A"): 2, ("A", "B"): 1, ("B", "E"): 0, ("A", "C"): 2, ("C", "D"): 1,
+                          ("D", "E"): 0, ("B", "D"): 1}, F)
+
+    def test_model_distances_cyclic(self):
+        # expected values computed with the original brute-force builder
+        _, P, F = self.build_model(["SABCE", "SACBE"])
+        self.assertEqual({("S", "A"): (0, 0), ("A", "B"): (1, 1), ("B", "C"): (2, 4), ("C", "E"): (2, 4),
+                          ("A", "C"): (1, 1), ("C", "B"): (2, 4), ("B", "E"): (2, 4)}, P)
+        self.assertEqual({("S", "A"): 2, ("A", "B"): 1, ("B", "C"): 1, ("C", "E"): 0, ("A", "C"): 1,
+                          ("C", "B"): 1, ("B", "E"): 0}, F)
+
+        _, P, _ = self.build_model(["SAABE"])
+        self.assertEqual({("S", "A"): (0, 0), ("A", "A"): (1, 2), ("A", "B"): (1, 2), ("B", "E"): (2, 3)}, P)
+
+    def test_model_distances_independent_of_trace_order(self):
+        for traces in (["SABCE", "SACBE"], ["SABCBCE", "SACE", "SABE"], ["SABABE", "SBAE"]):
+            _, P, F = self.build_model(traces)
+            _, reversed_P, reversed_F = self.build_model(list(reversed(traces)))
+            self.assertEqual(P, reversed_P)
+            self.assertEqual(F, reversed_F)
+
+    def test_conformance(self):
+        bc = BehavioralConformance(self.model)
+        for activity in "ABXD":
+            bc.ingest_event(BEvent(activity, "t"))
+        self.assertAlmostEqual(1 / 3, bc.get_conformance("t"))
+        self.assertEqual(-1, bc.get_confidence("t"))
+
+        for activity in "ABCD":
+            bc.ingest_event(BEvent(activity, "u"))
+        self.assertEqual(1, bc.get_conformance("u"))
+        self.assertEqual(1, bc.get_completeness("u"))
+        self.assertEqual(1, bc.get_confidence("u"))
+
+    def test_max_cases_eviction(self):
+        evicted = []
+        bc = BehavioralConformance(self.model, max_cases=2, on_case_evicted=lambda c, r: evicted.append((c, r)))
+        for case_id, activity in [("t1", "A"), ("t2", "A"), ("t1", "B"), ("t3", "A")]:
+            bc.ingest_event(BEvent(activity, case_id))
+        self.assertEqual([("t2", None)], evicted)
+        self.assertEqual({"t1"}, set(bc.get_conformance()))
+
+    def test_ttl_eviction_and_close_case(self):
+        start = datetime(2025, 1, 1)
+        events = [BEvent("A", "t1", event_time=start),
+                  BEvent("B", "t1", event_time=start + timedelta(minutes=1)),
+                  BEvent("A", "t2", event_time=start + timedelta(minutes=2)),
+                  BEvent("B", "t2", event_time=start + timedelta(minutes=3)),
+                  BEvent("A", "t3", event_time=start + timedelta(hours=2)),
+                  BEvent("B", "t3", event_time=start + timedelta(hours=2, minutes=1))]
+        checker = behavioral_conformance(self.model, case_ttl=timedelta(hours=1),
+                                         is_case_end=lambda e: e.get_trace_name() == "t3" and e.get_event_name() == "B",
+                                         emit_on_eviction=True)
+        results = Stream.from_iterable(events).pipe(checker).to_list()
+        final = [r for r in results if isinstance(r, FinalConformance)]
+        self.assertEqual(["t1", "t2", "t3"], [r.case_id for r in final])
+        self.assertEqual(1, final[0].conformance)
+        self.assertEqual(3, len(results) - len(final))
+        for result in results:
+            # the final values cannot be mistaken for (unpacked as) the regular results
+            self.assertNotEqual(isinstance(result, FinalConformance), isinstance(result, tuple))
+        with self.assertRaises(TypeError):
+            conformance, confidence, completeness, observed_events = final[0]
+        self.assertEqual(0, len(checker.bc.get_conformance()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,14 @@ import unittest
 from datetime import timedelta, datetime
 from typing import Callable
 
+from pybeamline.algorithms.conformance.soft.columnar_soft_conformance_tracker import ColumnarSoftConformanceTracker
 from pybeamline.algorithms.conformance.soft.pdfa_conformance import PdfaConformanceMapper
-from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport
+from pybeamline.algorithms.conformance.soft.soft_conformance_report import SoftConformanceReport, ReportMode
+from pybeamline.algorithms.conformance.soft.soft_conformance_status import SoftConformanceStatus
+from pybeamline.algorithms.conformance.soft.soft_conformance_tracker import SoftConformanceTracker
+from pybeamline.algorithms.conformance.soft.weights_normalizer import WeightsNormalizer
 from pybeamline.bevent import BEvent
+from pybeamline.models.pdfa.compiled_pdfa import CompiledPdfa
 from pybeamline.models.pdfa.pdfa import Pdfa
 from pybeamline.stream.base_sink import BaseSink
 from pybeamline.stream.stream import Stream
@@ -60,3 +65,146 @@ class TestSoftConformance(unittest.TestCase):
         mapper = PdfaConformanceMapper(reference_model, 0.5, 100, 2)
 
         Stream.from_iterable(self.events).pipe(mapper).sink(AssertSink(self.assertEqual))
+
+    def test_tracker_evicts_least_recently_updated_case(self):
+        tracker = SoftConformanceTracker(self.construct_reference_model(), max_cases_to_store=2)
+        tracker.replay("case-0", "A")
+        tracker.replay("case-1", "A")
+        tracker.replay("case-0", "B")
+        tracker.replay("case-2", "A")
+
+        self.assertEqual(["case-0", "case-2"], list(tracker.keys()))
+        self.assertEqual(0.8, tracker["case-0"].get_last_probability())
+
+    def test_delta_report(self):
+        reference_model = self.construct_reference_model()
+        mapper = PdfaConformanceMapper(reference_model, 0.5, 100, 4, report_mode=ReportMode.DELTA)
+        reports = Stream.from_iterable(self.events).pipe(mapper).to_list()
+
+        self.assertEqual([["case-0"], ["case-0", "case-1"]], [list(report.keys()) for report in reports])
+
+    def test_delta_report_lists_removed_cases(self):
+        model = WeightsNormalizer.compile(self.construct_reference_model(), 0.5)
+        for tracker in [SoftConformanceTracker(model, max_cases_to_store=2),
+                        ColumnarSoftConformanceTracker(model, max_cases_to_store=2)]:
+            tracker.replay("case-0", "A")
+            tracker.replay("case-1", "A")
+            tracker.get_report(ReportMode.DELTA)
+            tracker.replay("case-2", "A")  # evicts case-0
+            del tracker["case-1"]
+            report = tracker.get_report(ReportMode.DELTA)
+            self.assertEqual(["case-2"], list(report.keys()))
+            self.assertEqual({"case-0", "case-1"}, report.removed_keys)
+
+            # a removed case tracked again is reported as updated
+            tracker.replay("case-3", "A")
+            tracker.replay("case-0", "A")  # evicts case-2
+            report = tracker.get_report(ReportMode.DELTA)
+            self.assertEqual(["case-3", "case-0"], list(report.keys()))
+            self.assertEqual({"case-2"}, report.removed_keys)
+            self.assertEqual(set(), tracker.get_report(ReportMode.DELTA).removed_keys)
+
+        tracker = SoftConformanceTracker(model)
+        tracker["case-0"] = SoftConformanceStatus(model, "case-0")
+        self.assertEqual(["case-0"], list(tracker.get_report(ReportMode.DELTA).keys()))
+
+    def test_view_report(self):
+        tracker = SoftConformanceTracker(self.construct_reference_model())
+        tracker.replay("case-0", "A")
+        report = tracker.get_report(ReportMode.VIEW)
+        tracker.replay("case-1", "A")
+
+        self.assertEqual(["case-0", "case-1"], list(report.keys()))
+        with self.assertRaises(TypeError):
+            report["case-2"] = report["case-0"]
+
+    def test_compiled_model_scores_as_normalized_model(self):
+        reference_model = self.construct_reference_model()
+        normalized = WeightsNormalizer.normalize(reference_model, 0.5)
+        compiled = WeightsNormalizer.compile(reference_model, 0.5)
+        for source in ["A", "B", "C", "K"]:
+            for target in ["A", "B", "C", "K"]:
+                self.assertEqual(normalized.get_sequence_probability(source, target),
+                                 compiled.get_sequence_probability(source, target))
+
+        reference_model.weight_factor = 1.0
+        plain = SoftConformanceTracker(reference_model)
+        fast = SoftConformanceTracker(CompiledPdfa.compile(reference_model))
+        for event in self.events:
+            expected = plain.replay(event.get_trace_name(), event.get_event_name())
+            actual = fast.replay(event.get_trace_name(), event.get_event_name())
+            self.assertEqual(expected.get_last_probability(), actual.get_last_probability())
+            self.assertEqual(expected.get_sequence_log_probability(), actual.get_sequence_log_probability())
+            self.assertEqual(expected.get_soft_conformance(), actual.get_soft_conformance())
+
+    def test_columnar_tracker_matches_tracker(self):
+        model = WeightsNormalizer.compile(self.construct_reference_model(), 0.5)
+        tracker = SoftConformanceTracker(model, max_cases_to_store=1)
+        columnar = ColumnarSoftConformanceTracker(model, max_cases_to_store=1)
+        for event in self.events:
+            expected = tracker.replay(event.get_trace_name(), event.get_event_name())
+            actual = columnar.replay(event.get_trace_name(), event.get_event_name())
+            self.assertEqual(expected.get_last_probability(), actual.get_last_probability())
+            self.assertEqual(expected.get_sequence_probability(), actual.get_sequence_probability())
+            self.assertEqual(expected.get_sequence_log_probability(), actual.get_sequence_log_probability())
+            self.assertAlmostEqual(expected.get_soft_conformance(), actual.get_soft_conformance())
+        self.assertEqual(list(tracker.keys()), list(columnar.keys()))
+        self.assertAlmostEqual(tracker["case-1"].get_soft_conformance(), columnar.soft_conformances()[0])
+
+    def test_columnar_real_case_scenario(self):
+        reference_model = self.construct_reference_model()
+        expected = Stream.from_iterable(self.events).pipe(PdfaConformanceMapper(reference_model, 0.5, 100, 2)).to_list()
+        actual = Stream.from_iterable(self.events).pipe(PdfaConformanceMapper(reference_model, 0.5, 100, 2, columnar=True)).to_list()
+        self.assertEqual([list(report.keys()) for report in expected], [list(report.keys()) for report in actual])
+        self.assertAlmostEqual(expected[-1]["case-1"].get_mean_probabilities(), actual[-1]["case-1"].get_mean_probabilities())
+
+        view = ColumnarSoftConformanceTracker(WeightsNormalizer.compile(reference_model, 0.5)).get_report(ReportMode.VIEW)
+        self.assertTrue(view.is_empty())
+
+    def test_columnar_report_survives_eviction(self):
+        tracker = ColumnarSoftConformanceTracker(WeightsNormalizer.compile(self.construct_reference_model(), 0.5),
+                                                 max_cases_to_store=1)
+        tracker.replay("case-0", "A")
+        tracker.replay("case-0", "B")
+        view = tracker["case-0"]
+        report = tracker.get_report(ReportMode.FULL)
+        expected = (report["case-0"].get_last_probability(), report["case-0"].get_mean_probabilities())
+
+        tracker.replay("case-1", "A")
+
+        self.assertEqual(expected, (report["case-0"].get_last_probability(),
+                                    report["case-0"].get_mean_probabilities()))
+        self.assertEqual("case-0", report["case-0"].get_case_id())
+        self.assertEqual(view, report["case-0"])
+        with self.assertRaises(KeyError):
+            view.get_soft_conformance()
+        self.assertEqual("case-1", tracker["case-1"].get_case_id())
+        self.assertEqual(0.0, tracker["case-1"].get_mean_probabilities())
+
+    def test_columnar_report_copies_the_columns(self):
+        model = WeightsNormalizer.compile(self.construct_reference_model(), 0.5)
+        tracker = ColumnarSoftConformanceTracker(model)
+        expected = SoftConformanceTracker(model)
+        for case_id, activity in [("case-0", "A"), ("case-1", "A"), ("case-0", "B")]:
+            tracker.replay(case_id, activity)
+            expected.replay(case_id, activity)
+        tracker.get_report(ReportMode.DELTA)
+        tracker.replay("case-1", "B")
+        expected.replay("case-1", "B")
+        full = tracker.get_report(ReportMode.FULL)
+        tracker.replay("case-0", "C")
+        delta = tracker.get_report(ReportMode.DELTA)
+
+        self.assertEqual(["case-0", "case-1"], list(full.keys()))
+        self.assertEqual(["case-0"], list(delta.keys()))
+        for case_id in ["case-0", "case-1"]:
+            status = full[case_id].snapshot()
+            self.assertEqual(expected[case_id].get_sequence_log_probability(), status.get_sequence_log_probability())
+            self.assertEqual(expected[case_id].get_mean_probabilities(), status.get_mean_probabilities())
+        self.assertEqual("B", full["case-0"].last_act)
+        self.assertEqual("C", delta["case-0"].last_act)
+
+        full["case-2"] = expected["case-0"]
+        self.assertIs(expected["case-0"], full.remove("case-2"))
+        del full["case-1"]
+        self.assertEqual(["case-0"], list(full.keys()))
@@ -1,11 +1,11 @@
 import unittest
 from datetime import datetime, timedelta
 
-import pandas as pd
-
 from pybeamline.bevent import BEvent
 from pybeamline.algorithms.discovery.temporal_profile import TemporalProfileDiscovery
-from pybeamline.algorithms.conformance.temporal_profile.temporal_profile_conformance import temporal_profile_conformance, TemporalProfileConformanceMapper
+from pybeamline.algorithms.conformance.temporal_profile.temporal_profile_conformance import temporal_profile_conformance, TemporalProfileConformanceMapper, TemporalProfileConformance
+from pm4py.streaming.algo.conformance.temporal import algorithm as temporal_conformance_checker
+from pm4py.streaming.algo.conformance.temporal.variants.classic import Parameters
 from pybeamline.stream.stream import Stream
 
 class TestTemporalProfileConformance(unittest.TestCase):
@@ -32,27 +32,63 @@ class TestTemporalProfileConformance(unittest.TestCase):
 
         self.assertEqual(mapper.get_processed_event_num(), len(self.events))
 
-    def test_direct_conversion_helper_single_event(self):
-        mapper = TemporalProfileConformanceMapper(self.profile)
-        ev = mapper._b_event_to_pm4py_event(self.events[0])
-        self.assertIn("concept:name", ev)
-        self.assertIn("time:timestamp", ev)
-        self.assertIn("case:concept:name", ev)
-
-    def test_direct_conversion_helper_multiple_events_monotonic(self):
-        mapper = TemporalProfileConformanceMapper(self.profile)
-        converted = [mapper._b_event_to_pm4py_event(e) for e in self.events]
-        df = pd.DataFrame(converted)
-        self.assertTrue(df["time:timestamp"].is_monotonic_increasing)
-
-    def test_conversion_handles_start_timestamp(self):
-        # Add a start timestamp attribute in different possible keys
-        e = BEvent("X", "cx", event_time=self.events[0].get_event_time() + timedelta(seconds=30))
-        e.event_attributes["start_timestamp"] = self.events[0].get_event_time()
-        mapper = TemporalProfileConformanceMapper(self.profile)
-        ev = mapper._b_event_to_pm4py_event(e)
-        self.assertIn("start_timestamp", ev)
+    def test_start_timestamp_aliases(self):
+        # The start timestamp is found under any of the usual keys when one of them is given
+        e = BEvent("C", "c1", event_time=self.events[0].get_event_time() + timedelta(seconds=30))
+        e.event_attributes["time:start"] = self.events[0].get_event_time() + timedelta(seconds=20)
+        for key in ["start_timestamp", "start:timestamp", "time:start"]:
+            native = TemporalProfileConformance(self.profile, {Parameters.START_TIMESTAMP_KEY: key, "zeta": 0.5})
+            native.ingest_event(self.events[0])
+            native.ingest_event(self.events[1])
+            self.assertEqual([d[1:4] for d in native.ingest_event(e)], [("A", "C", 20.0), ("B", "C", 15.0)])
+        native = TemporalProfileConformance(self.profile, {"zeta": 0.5})
+        native.ingest_event(self.events[0])
+        self.assertEqual([d[1:4] for d in native.ingest_event(e)], [("A", "C", 30.0)])
+
+    def _late_events(self):
+        base_time = datetime(2025, 1, 1, 10, 0, 0)
+        return [
+            BEvent("A", "c3", event_time=base_time),
+            BEvent("B", "c4", event_time=base_time),
+            BEvent("B", "c3", event_time=base_time + timedelta(seconds=50)),
+            BEvent("A", "c4", event_time=base_time + timedelta(seconds=1)),
+            BEvent("C", "c3", event_time=base_time + timedelta(seconds=51)),
+            BEvent("C", "c4", event_time=base_time + timedelta(seconds=90)),
+        ]
+
+    def test_native_engine_matches_pm4py(self):
+        for zeta in [6.0, 0.5]:
+            expected = temporal_conformance_checker.apply(self.profile, parameters={"zeta": zeta})
+            native = TemporalProfileConformance(self.profile, {"zeta": zeta})
+            for event in self.events + self._late_events():
+                expected.receive({"concept:name": event.get_event_name(), "time:timestamp": event.get_event_time(),
+                                  "case:concept:name": event.get_trace_name()})
+                native.ingest_event(event)
+                actual = native.get_deviations()
+                # pm4py serializes the deviations to json, thus turning them into lists
+                self.assertEqual(expected.get(), {case: [list(d) for d in devs] for case, devs in actual.items()})
+        self.assertEqual([d[1:3] for d in native.get_deviations("c3")["c3"]], [("A", "B"), ("A", "C"), ("B", "C")])
+
+    def test_mapper_emits_new_deviations(self):
+        mapper = temporal_profile_conformance(self.profile, {"zeta": 0.5})
+        out = Stream.from_iterable(self._late_events()).pipe(mapper).to_list()
+        self.assertEqual([list(result) for result in out], [[], [], ["c3"], [], ["c3"], ["c4"]])
+        self.assertEqual([d[1:3] for d in out[4]["c3"]], [("A", "C"), ("B", "C")])
+        emitted = {}
+        for result in out:
+            for case, deviations in result.items():
+                emitted.setdefault(case, []).extend(deviations)
+        self.assertEqual(emitted, mapper.get_deviations())
 
+    def test_bounded_cases(self):
+        mapper = temporal_profile_conformance(self.profile, {"zeta": 0.5})
+        Stream.from_iterable(self._late_events()).pipe(mapper).to_list()
+        self.assertEqual(set(mapper.get_deviations()), {"c3", "c4"})
+        # With a single case at a time, c3 and c4 keep evicting each other: every event starts a new case
+        mapper = temporal_profile_conformance(self.profile, {"zeta": 0.5}, max_cases=1)
+        out = Stream.from_iterable(self._late_events()).pipe(mapper).to_list()
+        self.assertEqual(out, [{}] * 6)
+        self.assertEqual(mapper.get_deviations(), {})
 
 if __name__ == "__main__":
     unittest.main()
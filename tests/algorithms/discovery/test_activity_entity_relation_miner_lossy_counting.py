@@ -144,4 +144,36 @@ class TestActivityEntityRelationMinerLossyCounting(unittest.TestCase):
         model = miner.get_model()
         relations = model.get_relations("Register")
         self.assertIn(("Customer","Order"), relations)
-        self.assertEqual(relations[("Customer","Order")], Cardinality.ONE_TO_ONE)
\ No newline at end of file
+        self.assertEqual(relations[("Customer","Order")], Cardinality.ONE_TO_ONE)
+
+    def test_model_reused_until_changed(self):
+        miner = ActivityEntityRelationMinerLossyCounting(max_approx_error=0.1)
+        ts = datetime.now()
+
+        miner.ingest_event(BOEvent("e1", "Pack", {"Order": {"o1"}, "Item": {"i1", "i2"}}, ts))
+        miner.ingest_event(BOEvent("e2", "Ship", {"Order": {"o1"}}, ts))
+        model_1 = miner.get_model()
+        self.assertIs(model_1, miner.get_model())
+
+        # Same cardinality: nothing changes
+        miner.ingest_event(BOEvent("e3", "Pack", {"Order": {"o2"}, "Item": {"i3", "i4"}}, ts))
+        self.assertIs(model_1, miner.get_model())
+
+        miner.ingest_event(BOEvent("e4", "Ship", {"Order": {"o1"}, "Truck": {"t1"}}, ts))
+        model_2 = miner.get_model()
+        self.assertIsNot(model_1, model_2)
+        self.assertEqual(model_1.get_relations("Ship"), {})
+        self.assertEqual(model_2.get_relations("Ship"), {("Order", "Truck"): Cardinality.ONE_TO_ONE})
+        self.assertEqual(model_2.get_relations("Pack"), {("Item", "Order"): Cardinality.MANY_TO_ONE})
+
+    def test_pruned_relation_is_omitted(self):
+        miner = ActivityEntityRelationMinerLossyCounting(max_approx_error=0.5)
+        ts = datetime.now()
+
+        miner.ingest_event(BOEvent("e1", "Pack", {"Order": {"o1"}, "Item": {"i1"}}, ts))
+        for i in range(2, 5):
+            miner.ingest_event(BOEvent(f"e{i}", "Pack", {"Order": {f"o{i}"}}, ts))
+
+        model = miner.get_model()
+        self.assertEqual(model.get_relations("Pack"), {})
+        self.assertEqual(model.get_object_types("Pack"), {"Item", "Order"})
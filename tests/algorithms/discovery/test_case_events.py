@@ -0,0 +1,39 @@
+import unittest
+from datetime import datetime
+
+from pybeamline.algorithms.discovery.case_events import to_case_event
+from pybeamline.bevent import BEvent
+from pybeamline.boevent import BOEvent, FlattenedBOEvent
+from pybeamline.symbol_table import SymbolTable
+
+
+class TestCaseEvents(unittest.TestCase):
+
+    def test_bevent_is_returned_as_is(self):
+        event = BEvent("A", "c1")
+        self.assertIs(event, to_case_event(event))
+
+    def test_flattened_boevent_is_returned_as_is(self):
+        event = FlattenedBOEvent(BOEvent("e1", "A", {"order": {"o1"}}, datetime(2025, 1, 1)), "order", "o1")
+        self.assertIs(event, to_case_event(event))
+
+    def test_boevent_is_wrapped(self):
+        table = SymbolTable()
+        event = BOEvent("e1", "A", {"order": {"o1"}}, datetime(2025, 1, 1))
+        event.activity_code = table.encode_activity("A")
+        event.symbol_table = table
+        wrapped = to_case_event(event)
+        self.assertIsInstance(wrapped, BEvent)
+        self.assertEqual(("A", "o1", datetime(2025, 1, 1)),
+                         (wrapped.get_event_name(), wrapped.get_trace_name(), wrapped.get_event_time()))
+        self.assertEqual(event.activity_code, table.activity_code(wrapped))
+
+    def test_unsupported_events(self):
+        with self.assertRaises(ValueError):
+            to_case_event(BOEvent("e1", "A", {"order": {"o1", "o2"}}))
+        with self.assertRaises(TypeError):
+            to_case_event("A")
+
+
+if __name__ == '__main__':
+    unittest.main()
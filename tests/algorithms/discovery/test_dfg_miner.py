@@ -0,0 +1,52 @@
+import unittest
+
+from pybeamline.algorithms.discovery.dense_dfg_counter import DenseDfgCounter
+from pybeamline.algorithms.discovery.dfg_miner import SimpleDfgMiner, simple_dfg_miner
+from pybeamline.bevent import BEvent
+from pybeamline.stream.stream import Stream
+
+
+def _events():
+    traces = ["ABCD", "ACBD", "ABCD", "AED", "ABCD", "AFGHIJKLMNOPQRSTUVWXYZ"]
+    return [BEvent(activity, "c" + str(i)) for i, trace in enumerate(traces) for activity in trace]
+
+
+class TestSimpleDfgMiner(unittest.TestCase):
+
+    def test_dense_backend_matches_dict_backend(self):
+        for min_relative_frequency in [0, 0.3, 0.75]:
+            expected = Stream.from_iterable(_events()).pipe(
+                simple_dfg_miner(model_update_frequency=3, min_relative_frequency=min_relative_frequency)).to_list()
+            actual = Stream.from_iterable(_events()).pipe(
+                simple_dfg_miner(model_update_frequency=3, min_relative_frequency=min_relative_frequency, backend="dense")).to_list()
+            self.assertEqual(expected, actual)
+
+    def test_batch_matches_transform(self):
+        expected = Stream.from_iterable(_events()).pipe(simple_dfg_miner(model_update_frequency=3, min_relative_frequency=0)).to_list()
+        for backend in ["dict", "dense"]:
+            miner = SimpleDfgMiner(model_update_frequency=3, min_relative_frequency=0, backend=backend)
+            self.assertEqual(expected, miner.transform_batch(_events()))
+
+    def test_unsupported_backend(self):
+        with self.assertRaises(ValueError):
+            SimpleDfgMiner(backend="sparse")
+
+
+class TestDenseDfgCounter(unittest.TestCase):
+
+    def test_growth_and_max(self):
+        counter = DenseDfgCounter(initial_size=2)
+        counter.increment(0, 1)
+        counter.increment(5, 0)
+        counter.increment(5, 0)
+        self.assertEqual(counter.size, 6)
+        self.assertEqual(counter.get_count(0, 1), 1)
+        self.assertEqual(counter.get_count(5, 0), 2)
+        self.assertEqual(counter.get_count(9, 9), 0)
+        self.assertEqual(counter.max_count, 2)
+        self.assertEqual(counter.relative_frequencies(0.5), {(5, 0): 1.0})
+        self.assertEqual(counter.relative_frequencies(-1), {(0, 1): 0.5, (5, 0): 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import math
+import random
 import unittest
 from datetime import datetime, timedelta
 from typing import Any, Callable
@@ -82,4 +84,58 @@ class TestHeuristicsMinerLossyCounting(unittest.TestCase):
         # Check that the 'A' → 'D' edge was pruned
         self.assertNotIn(('A', 'D'), final_model.dfg)
         # 'A' → 'B' is present
-        self.assertIn(('A', 'B'), final_model.dfg, msg="Expected edge A → B to remain due to high support")
\ No newline at end of file
+        self.assertIn(('A', 'B'), final_model.dfg, msg="Expected edge A → B to remain due to high support")
+
+    def test_emit_on_change(self):
+        traces = ["ABCD", "ACBD", "ABCD", "ABCD", "AED", "ABCD", "ACBD", "ABCD"] * 5
+        events = [BEvent(activity, "c" + str(i)) for i, trace in enumerate(traces) for activity in trace]
+
+        def structure(model):
+            return {name: (sorted(n.node_name for n in node.output_connections),
+                           sorted((a, b) for a, d in node.and_measures_out.items() for b in d))
+                    for name, node in model.nodes.items()}
+
+        all_models = Stream.from_iterable(events).pipe(
+            heuristics_miner_lossy_counting(model_update_frequency=4, max_approx_error=0.01)).to_list()
+        changed_models = Stream.from_iterable(events).pipe(
+            heuristics_miner_lossy_counting(model_update_frequency=4, max_approx_error=0.01, emit_on_change=True)).to_list()
+
+        expected = []
+        for model in all_models:
+            if not expected or structure(model) != structure(expected[-1]):
+                expected.append(model)
+        self.assertLess(len(changed_models), len(all_models))
+        self.assertEqual([structure(m) for m in expected], [structure(m) for m in changed_models])
+
+    def test_expiry_buckets_match_full_scan_cleaning(self):
+        # Reference: the original cleaning, scanning all the entries at the end of every bucket
+        def full_scan(events, bucket_width):
+            cases, relations, states = {}, {}, []
+            for observed, event in enumerate(events, start=1):
+                bucket = math.ceil(observed / bucket_width)
+                case_id, activity = event.get_trace_name(), event.get_event_name()
+                if case_id in cases:
+                    last_activity, frequency, case_bucket = cases.pop(case_id)
+                    cases[case_id] = (activity, frequency + 1, case_bucket)
+                    relation = (last_activity, activity)
+                    frequency, relation_bucket = relations.pop(relation, (0, bucket - 1))
+                    relations[relation] = (frequency + 1, relation_bucket)
+                else:
+                    cases[case_id] = (activity, 1, bucket - 1)
+                if observed % bucket_width == 0:
+                    cases = {k: v for k, v in cases.items() if v[1] + v[2] > bucket}
+                    relations = {k: v for k, v in relations.items() if v[0] + v[1] > bucket}
+                states.append((set(cases), {r: v[0] for r, v in relations.items()}))
+            return states
+
+        rng = random.Random(7)
+        events = [BEvent(rng.choice("ABCDEFG"), "c" + str(rng.randrange(30))) for _ in range(600)]
+        miner = HeuristicsMinerLossyCounting(max_approx_error=0.05)
+        expected = full_scan(events, 20)
+        for event, (cases, relations) in zip(events, expected):
+            miner.ingest_event(event)
+            self.assertEqual(cases, set(miner._HeuristicsMinerLossyCounting__D_C))
+            self.assertEqual(relations, {r: v[0] for r, v in miner._HeuristicsMinerLossyCounting__D_R.items()})
+        # relations were deleted over several buckets
+        cleanings = {i for i in range(1, len(expected)) if set(expected[i - 1][1]) - set(expected[i][1])}
+        self.assertGreater(len(cleanings), 3)
@@ -1,3 +1,4 @@
+import random
 import unittest
 from datetime import datetime, timedelta
 from typing import Any, Callable
@@ -80,3 +81,47 @@ class TestHeuristicsMinerLossyCountingBudget(unittest.TestCase):
         self.assertNotIn(('A', 'D'), final_model.dfg, msg="Expected edge A → D to be pruned due to budget constraints")
         self.assertIn(('A', 'B'), final_model.dfg, msg="Expected edge A → B to remain due to repeated support")
 
+    def test_heap_eviction_matches_linear_scan(self):
+        # Reference: the original cleaning, scanning all the entries at every bucket increment
+        def linear_scan(events, budget):
+            cases, relations, states = {}, {}, []
+            current_bucket = 0
+
+            def clean():
+                nonlocal cases, relations, current_bucket
+                current_bucket += 1
+                cases = {k: v for k, v in cases.items() if v[1] + v[2] > current_bucket}
+                relations = {k: v for k, v in relations.items() if v[0] + v[1] > current_bucket}
+
+            for event in events:
+                case_id, activity = event.get_trace_name(), event.get_event_name()
+                if case_id in cases:
+                    last_activity, frequency, case_bucket = cases.pop(case_id)
+                    cases[case_id] = (activity, frequency + 1, case_bucket)
+                    relation = (last_activity, activity)
+                    if relation in relations:
+                        frequency, relation_bucket = relations.pop(relation)
+                        relations[relation] = (frequency + 1, relation_bucket)
+                    else:
+                        while len(cases) + len(relations) >= budget:
+                            clean()
+                        relations[relation] = (1, current_bucket)
+                else:
+                    while len(cases) + len(relations) >= budget:
+                        clean()
+                    cases[case_id] = (activity, 1, current_bucket)
+                states.append((set(cases), {r: v[0] for r, v in relations.items()}, current_bucket))
+            return states
+
+        rng = random.Random(11)
+        events = [BEvent(rng.choice("ABCDEF"), "c" + str(rng.randrange(12))) for _ in range(500)]
+        hm = HeuristicsMinerLossyCountingBudget(budget=25)
+        expected = linear_scan(events, 25)
+        for event, (cases, relations, bucket) in zip(events, expected):
+            hm.ingest_event(event)
+            self.assertEqual(cases, set(hm._HeuristicsMinerLossyCountingBudget__D_C))
+            self.assertEqual(relations, {r: v[0] for r, v in hm._HeuristicsMinerLossyCountingBudget__D_R.items()})
+            self.assertEqual(bucket, hm._HeuristicsMinerLossyCountingBudget__current_bucket)
+        # entries were evicted, over several buckets
+        self.assertGreater(expected[-1][2], 3)
+
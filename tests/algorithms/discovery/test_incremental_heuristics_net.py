@@ -0,0 +1,82 @@
+import random
+import unittest
+
+from pm4py.algo.discovery.heuristics.variants.classic import calculate as compute_dfg
+from pm4py.objects.heuristics_net.obj import HeuristicsNet
+
+from pybeamline.algorithms.discovery.incremental_heuristics_net import IncrementalHeuristicsNet
+
+
+def _structure(model):
+    return {name: (frozenset(n.node_name for n in node.output_connections),
+                   frozenset((a, b) for a, d in node.and_measures_out.items() for b in d),
+                   frozenset((a, b) for a, d in node.and_measures_in.items() for b in d))
+            for name, node in model.nodes.items()}
+
+
+def _net(model):
+    def edges(connections):
+        return {n.node_name: [(e.dependency_value, e.dfg_value, e.repr_value) for e in es]
+                for n, es in connections.items()}
+    return (model.dfg, model.activities, sorted(model.start_activities[0]), sorted(model.end_activities[0]),
+            model.activities_occurrences, model.dfg_matrix, model.dependency_matrix, list(model.nodes),
+            {name: (node.node_occ, edges(node.output_connections), edges(node.input_connections),
+                    node.and_measures_out, node.and_measures_in) for name, node in model.nodes.items()})
+
+
+class TestIncrementalHeuristicsNet(unittest.TestCase):
+
+    def test_refresh_reports_structural_changes(self):
+        for seed in range(50):
+            rnd = random.Random(seed)
+            activities = "ABCDEFGH"[:rnd.randint(2, 8)]
+            net = IncrementalHeuristicsNet(dependency_threshold=rnd.choice([0, 0.5, 0.9]),
+                                           and_threshold=rnd.choice([0.1, 0.65]))
+            previous = None
+            for step in range(100):
+                relation = (rnd.choice(activities), rnd.choice(activities))
+                if rnd.random() < 0.15:
+                    net.remove(relation)
+                else:
+                    net.set_count(relation, net.dfg.get(relation, 0) + rnd.randint(1, 20))
+                if rnd.random() < 0.3:
+                    current = _structure(net.get_model()) if net.dfg else None
+                    self.assertEqual(net.refresh(), current != previous, msg=f"seed {seed}, step {step}")
+                    previous = current
+
+    def test_model_matches_pm4py(self):
+        for seed in range(50):
+            rnd = random.Random(seed)
+            activities = "ABCDEFGH"[:rnd.randint(1, 8)]
+            dependency_threshold, and_threshold = rnd.choice([0, 0.5, 0.9]), rnd.choice([0.1, 0.65])
+            net = IncrementalHeuristicsNet(dependency_threshold=dependency_threshold, and_threshold=and_threshold)
+            decode = str.lower if seed % 2 else None
+            for step in range(100):
+                relation = (rnd.choice(activities), rnd.choice(activities))
+                if rnd.random() < 0.15:
+                    net.remove(relation)
+                else:
+                    net.set_count(relation, net.dfg.get(relation, 0) + rnd.randint(1, 20))
+                if rnd.random() < 0.3:
+                    dfg = {(a.lower(), b.lower()) if decode else (a, b): c for (a, b), c in net.dfg.items()}
+                    expected = compute_dfg(HeuristicsNet(dfg), dependency_thresh=dependency_threshold,
+                                           and_measure_thresh=and_threshold)
+                    self.assertEqual(_net(net.get_model(decode)), _net(expected), msg=f"seed {seed}, step {step}")
+
+    def test_model_does_not_consume_changes(self):
+        net = IncrementalHeuristicsNet()
+        net.set_count(("A", "B"), 3)
+        net.get_model()
+        self.assertTrue(net.refresh())
+
+    def test_refresh_without_changes(self):
+        net = IncrementalHeuristicsNet()
+        self.assertFalse(net.refresh())
+        net.set_count(("A", "B"), 3)
+        self.assertTrue(net.refresh())
+        net.set_count(("A", "B"), 4)
+        self.assertFalse(net.refresh())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,10 @@ from datetime import datetime, timedelta
 
 from pybeamline.bevent import BEvent, DEFAULT_NAME_KEY, DEFAULT_TIMESTAMP_KEY, DEFAULT_TRACEID_KEY
 from pybeamline.algorithms.discovery.temporal_profile import (
+    IncrementalTemporalProfile,
     TemporalProfileDiscovery,
     TemporalProfileDiscoveryMapper,
+    temporal_profile_discovery_mapper,
 )
 from pybeamline.stream.stream import Stream
 
@@ -50,6 +52,43 @@ class TestTemporalProfileDiscovery(unittest.TestCase):
         self.assertEqual(len(out), 3)
         self.assertIsNotNone(out[0])
 
+    def test_incremental_profile_matches_batch_discovery(self):
+        base = datetime(2024, 1, 1, 9, 0, 0)
+        offsets = {"c1": [("A", 0), ("B", 5), ("C", 12), ("B", 20)],
+                   "c2": [("A", 3), ("C", 4), ("B", 30)],
+                   "c3": [("B", 1), ("A", 2)]}
+        events = [BEvent(activity, case_id, event_time=base + timedelta(seconds=seconds))
+                  for case_id, trace in offsets.items() for activity, seconds in trace]
+        # Out of order arrivals are paired in timestamp order
+        events.append(BEvent("A", "c3", event_time=base))
+
+        profile = IncrementalTemporalProfile()
+        for event in events:
+            profile.ingest_event(event)
+        expected = TemporalProfileDiscovery(events).apply()
+        actual = profile.get_temporal_profile()
+
+        self.assertEqual(set(expected), set(actual))
+        for pair in expected:
+            self.assertAlmostEqual(expected[pair][0], actual[pair][0])
+            self.assertAlmostEqual(expected[pair][1], actual[pair][1])
+
+    def test_mapper_cadence_and_bounds(self):
+        base = datetime(2024, 1, 1, 9, 0, 0)
+        events = [BEvent(activity, "c1", event_time=base + timedelta(seconds=i)) for i, activity in enumerate("ABCD")]
+        out = Stream.from_iterable(events).pipe(temporal_profile_discovery_mapper(model_update_frequency=2)).to_list()
+        self.assertEqual(len(out), 2)
+        self.assertEqual(out[-1][("A", "D")], (3.0, 0.0))
+
+        out = Stream.from_iterable(events).pipe(temporal_profile_discovery_mapper(max_case_history=2)).to_list()
+        self.assertEqual(set(out[-1]), {("A", "B"), ("A", "C"), ("B", "C"), ("B", "D"), ("C", "D")})
+
+        profile = IncrementalTemporalProfile(max_cases=1)
+        profile.ingest_event(BEvent("A", "c1", event_time=base))
+        profile.ingest_event(BEvent("A", "c2", event_time=base))
+        profile.ingest_event(BEvent("B", "c1", event_time=base + timedelta(seconds=1)))
+        self.assertEqual(profile.get_temporal_profile(), {})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -15,6 +15,11 @@ from pybeamline.sources.dict_ocel_test_source import dict_test_ocel_source
 from pybeamline.algorithms.oc.oc_merge_operator import OCMergeOperator
 from pybeamline.stream.base_sink import BaseSink
 from pybeamline.stream.rx_operator import RxOperator
+from pybeamline.models.aer import AER
+from pm4py.objects.heuristics_net.obj import HeuristicsNet
+from pybeamline.utils.cardinality import Cardinality
+from pybeamline.utils.commands import Command, create_command
+from pybeamline.algorithms.oc.oc_merge_operator import OCMergeOperatorMapper
 
 class CollectorSink(BaseSink[Any]):
 
@@ -157,3 +162,42 @@ class TestOCMergeOperator(unittest.TestCase):
         self.assertTrue({'Create Order', 'Register Customer', 'Add Item', 'Cancel Order'}.issubset(emitted_aer_diagrams[0].get_activities()))
         self.assertTrue({"Create Booking", "Check In", "Check Out", "Register Guest", "Reserve Room"}.issubset(emitted_aer_diagrams[-1].get_activities()))
 
+    def test_oc_merger_updates_object_types_incrementally(self):
+        merger = OCMergeOperator()
+        order_dfg = HeuristicsNet({("Create", "Pack"): 3, ("Pack", "Ship"): 2})
+        item_dfg = HeuristicsNet({("Add", "Pack"): 4})
+        aer = AER()
+        aer.add_relation("Pack", "Order", "Item", Cardinality.ONE_TO_MANY)
+        aer.add_object_types("Create", {"Order"})
+
+        merger.process(create_command(Command.ACTIVE, "Order"))
+        merger.process({"type": "dfg", "object_type": "Order", "model": order_dfg})
+        merger.process({"type": "aer", "model": aer})
+        merger.process({"type": "dfg", "object_type": "Item", "model": item_dfg})
+        self.assertIsNone(merger.process(create_command(Command.ACTIVE, "Item")))
+        result = merger.process({"type": "aer", "model": aer})
+
+        self.assertEqual({"Order", "Item"}, result["ocdfg"].object_types)
+        self.assertEqual({"Create", "Pack", "Ship", "Add"}, result["ocdfg"].activities)
+        self.assertEqual({"Create"}, result["ocdfg"].start_activities["Order"])
+        self.assertEqual({("Item", "Order"): Cardinality.ONE_TO_MANY}, result["aer"].get_relations("Pack"))
+
+        # Replacing the DFG of Order drops the activities only it contained
+        result = merger.process({"type": "dfg", "object_type": "Order", "model": HeuristicsNet({("Create", "Pack"): 5})})
+        self.assertEqual({"Create", "Pack", "Add"}, result["ocdfg"].activities)
+        self.assertEqual({"Pack"}, result["ocdfg"].end_activities["Order"])
+
+        merger.process(create_command(Command.INACTIVE, "Order"))
+        result = merger.process({"type": "aer", "model": aer})
+        self.assertEqual({"Item"}, result["ocdfg"].object_types)
+        self.assertEqual({"Pack", "Add"}, result["ocdfg"].activities)
+        self.assertEqual({}, result["aer"].get_relations("Pack"))
+        self.assertEqual({"Item"}, result["aer"].get_object_types("Pack"))
+
+    def test_oc_merger_mapper_processes_each_message_once(self):
+        mapper = OCMergeOperatorMapper()
+        calls = []
+        process = mapper.oc_operator.process
+        mapper.oc_operator.process = lambda msg: calls.append(msg) or process(msg)
+        mapper.transform({"type": "dfg", "object_type": "Order", "model": HeuristicsNet({("A", "B"): 1})})
+        self.assertEqual(1, len(calls))
@@ -1,3 +1,4 @@
+import multiprocessing
 import threading
 import unittest
 
@@ -5,11 +6,14 @@ from pm4py.objects.heuristics_net.obj import HeuristicsNet
 from pybeamline.algorithms.discovery.heuristics_miner_lossy_counting import heuristics_miner_lossy_counting
 from pybeamline.algorithms.discovery.heuristics_miner_lossy_counting_budget import heuristics_miner_lossy_counting_budget
 from pybeamline.algorithms.oc.strategies.base import LossyCountingStrategy, RelativeFrequencyBasedStrategy, \
-    SlidingWindowStrategy
+    SlidingWindowStrategy, InclusionStrategy
 from pybeamline.stream.rx_operator import RxOperator
+from pybeamline.symbol_table import SymbolTable
 from pybeamline.utils.commands import Command
 from pybeamline.algorithms.oc.oc_operator import OCOperator, oc_operator
+from pybeamline.stream.stream import Stream
 from pybeamline.models.aer import AER
+from pybeamline.boevent import BOEvent
 from pybeamline.sources.dict_ocel_test_source import dict_test_ocel_source
 from reactivex import operators as ops
 
@@ -279,4 +283,123 @@ class TestOCOperator(unittest.TestCase):
 
         for msg in emitted_commands:
             if msg["command"] == Command.INACTIVE:
-                self.assertIn(msg["object_type"], should_be_inactive)
\ No newline at end of file
+                self.assertIn(msg["object_type"], should_be_inactive)
+
+    def test_flatten_shares_event_attributes(self):
+        event = BOEvent("e1", "Ship Order", {"Item": {"i1", "i2"}, "Order": {"o1"}}, vmap={"weight": "10"})
+        flattened = self.operator_without_cf._flatten(event)
+
+        self.assertEqual(sorted((e.object_type, e.get_trace_name()) for e in flattened),
+                         [("Item", "i1"), ("Item", "i2"), ("Order", "o1")])
+        for flat_event in flattened:
+            self.assertEqual(flat_event.get_event_id(), "e1")
+            self.assertEqual(flat_event.get_event_name(), "Ship Order")
+            self.assertIs(flat_event.get_event_time(), event.get_event_time())
+            self.assertIs(flat_event.get_vmap(), event.get_vmap())
+            self.assertEqual(flat_event.get_omap(), {flat_event.object_type: {flat_event.object_id}})
+
+    def test_aer_emitted_once_per_update(self):
+        operator = oc_operator(aer_model_update_frequency=3)
+        outputs = [operator.transform(BOEvent(f"e{i}", "Pack", {"Order": {"o1"}, "Item": {"i1"}})) or []
+                   for i in range(9)]
+        aer_counts = [len([msg for msg in out if msg["type"] == "aer"]) for out in outputs]
+        self.assertEqual([0, 1, 0, 0, 1, 0, 0, 1, 0], aer_counts)
+
+    def test_strategies_return_lists(self):
+        model_event = {"type": "dfg", "object_type": "Order", "model": None}
+        for strategy in [RelativeFrequencyBasedStrategy(0.5), LossyCountingStrategy(0.5), SlidingWindowStrategy(2)]:
+            messages = strategy.evaluate(model_event)
+            self.assertIsInstance(messages, list)
+            self.assertEqual(Command.ACTIVE, messages[0]["command"])
+            self.assertIs(model_event, messages[-1])
+            self.assertEqual([{"type": "aer"}], strategy.evaluate({"type": "aer"}))
+
+    def test_strategy_returning_stream(self):
+        class StreamStrategy(InclusionStrategy):
+            def evaluate(self, model_event: dict):
+                return Stream.of(model_event)
+
+        operator = OCOperator(control_flow={"Order": lambda: RxOperator(ops.map(lambda event: event.get_trace_name()))},
+                              inclusion_strategy=StreamStrategy())
+        out = operator.transform(BOEvent("e1", "Pack", {"Order": {"o1"}, "Item": {"i1"}}))
+        self.assertEqual(["o1"], [msg["model"] for msg in out if msg["type"] == "dfg"])
+
+    def test_operator_miner_is_fed_through_subject(self):
+        operator = OCOperator(control_flow={"Order": lambda: RxOperator(ops.map(lambda event: event.get_trace_name()))})
+        out = operator.transform(BOEvent("e1", "Pack", {"Order": {"o1"}, "Item": {"i1"}}))
+        self.assertEqual(["o1"], [msg["model"] for msg in out if msg["type"] == "dfg"])
+
+    def test_oc_operator_with_workers_matches_serial(self):
+        def run(**kwargs):
+            operator = oc_operator(inclusion_strategy=LossyCountingStrategy(0.2), aer_model_update_frequency=7, **kwargs)
+            messages = Stream.from_iterable(self.flow_events).pipe(operator).to_list()
+            return [(m["type"], m.get("object_type"), m.get("command"),
+                     m["model"].dfg_matrix if m["type"] == "dfg" else repr(m.get("model"))) for m in messages]
+
+        self.flow_events = dict_test_ocel_source([(self.events, 10)]).to_list()
+        expected = run(default_miner=lambda: heuristics_miner_lossy_counting_budget(5))
+        self.assertTrue(any(message[0] == "dfg" for message in expected))
+        # The last, incomplete, batch is emitted on completion
+        self.assertEqual(expected, run(default_miner=lambda: heuristics_miner_lossy_counting_budget(5),
+                                       workers=2, batch_size=4))
+
+    def test_oc_operator_with_workers_on_coded_source(self):
+        def coded_events():
+            table = SymbolTable()
+            events = dict_test_ocel_source([(self.events, 10)]).to_list()
+            for event in events:
+                # as coded by the OCEL 2.0 source
+                event.activity_code = table.encode_activity(event.activity_name)
+                event.symbol_table = table
+                event.source_handle = threading.Lock()  # the parent events are not sent to the workers
+            return events
+
+        def run(**kwargs):
+            operator = oc_operator(inclusion_strategy=LossyCountingStrategy(0.2),
+                                   default_miner=lambda: heuristics_miner_lossy_counting(5, symbol_table=SymbolTable()),
+                                   **kwargs)
+            messages = Stream.from_iterable(coded_events()).pipe(operator).to_list()
+            return [(m["object_type"], m["model"].dfg) for m in messages if m["type"] == "dfg"]
+
+        expected = run()
+        self.assertTrue(expected)
+        self.assertEqual(expected, run(workers=2, batch_size=4))
+
+    def test_oc_operator_workers_lifecycle(self):
+        self.flow_events = dict_test_ocel_source([(self.events, 2)]).to_list()
+        operator = oc_operator(workers=2, batch_size=4, aer_model_update_frequency=2)
+        # The workers are started when the stream is subscribed and stopped when it completes
+        self.assertEqual([], multiprocessing.active_children())
+        Stream.from_iterable(self.flow_events).pipe(operator).to_list()
+        self.assertEqual([], multiprocessing.active_children())
+
+        # and when it fails
+        failing = Stream.from_iterable(self.flow_events).pipe(RxOperator(ops.map(lambda event: 1 / 0)))
+        workers, errors = [], []
+        Stream.from_iterable(self.flow_events).concat(failing).pipe(operator).subscribe(
+            on_next=lambda msg: workers.append(len(multiprocessing.active_children())), on_error=errors.append)
+        self.assertEqual(2, max(workers))
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+        self.assertEqual([], multiprocessing.active_children())
+
+    def test_strategies_deactivate_least_frequent_types(self):
+        def commands(messages):
+            return [(msg["command"], msg["object_type"]) for msg in messages if msg["type"] == "command"]
+
+        def dfg(obj_type):
+            return {"type": "dfg", "object_type": obj_type, "model": None}
+
+        strategy = RelativeFrequencyBasedStrategy(0.3)
+        self.assertEqual([(Command.ACTIVE, "A")], commands(strategy.evaluate_many([dfg("A"), dfg("A")])))
+        self.assertEqual([(Command.ACTIVE, "B")], commands(strategy.evaluate_many([dfg("B")])))
+        # B drops to 1/4, then comes back over the threshold
+        self.assertEqual([(Command.INACTIVE, "B")], commands(strategy.evaluate(dfg("A"))))
+        self.assertEqual([], commands(strategy.evaluate(dfg("A"))))
+        self.assertEqual([(Command.ACTIVE, "B")], commands(strategy.evaluate(dfg("B"))))
+
+        strategy = SlidingWindowStrategy(window_size=3)
+        messages = strategy.evaluate_many([dfg("A"), dfg("B"), dfg("A"), dfg("C")])
+        self.assertEqual([(Command.ACTIVE, "A"), (Command.ACTIVE, "B"), (Command.ACTIVE, "C")], commands(messages))
+        self.assertEqual([(Command.INACTIVE, "B")], commands(strategy.evaluate(dfg("C"))))
+        self.assertEqual([(Command.INACTIVE, "A")], commands(strategy.evaluate(dfg("C"))))
+        self.assertEqual(["C"], list(strategy.D_W))
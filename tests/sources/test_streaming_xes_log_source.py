@@ -0,0 +1,53 @@
+import gzip
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+
+from pybeamline.sources.streaming_xes_log_source import streaming_xes_log_source_from_file
+from pybeamline.sources.xes_log_source import xes_log_source_from_file
+from pybeamline.stream.base_sink import BaseSink
+
+
+class CollectorSink(BaseSink[Any]):
+    def __init__(self):
+        self.elements = []
+
+    def consume(self, item: Any) -> None:
+        self.elements.append(item)
+
+
+class TestStreamingXesLogSource(unittest.TestCase):
+
+    def setUp(self):
+        self.log_path = str(Path(__file__).parent.parent / "running-example.xes")
+
+    def test_file_order_replay(self):
+        collector = CollectorSink()
+        streaming_xes_log_source_from_file(self.log_path).sink(collector)
+
+        self.assertEqual(42, len(collector.elements))
+        # Events are emitted trace by trace
+        self.assertEqual(["3"] * 9, [e.get_trace_name() for e in collector.elements[:9]])
+        self.assertEqual("register request", collector.elements[0].get_event_name())
+        self.assertEqual("Fluxicon Nitro", collector.elements[0].trace_attributes["creator"])
+        self.assertEqual("Pete", collector.elements[0].event_attributes["org:resource"])
+
+    def test_sorted_replay_matches_in_memory_source(self):
+        expected = CollectorSink()
+        xes_log_source_from_file(self.log_path).sink(expected)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            gz_path = str(Path(tmp) / "running-example.xes.gz")
+            with open(self.log_path, "rb") as f, gzip.open(gz_path, "wb") as g:
+                shutil.copyfileobj(f, g)
+
+            collector = CollectorSink()
+            # A small chunk size forces several sorted runs to be merged
+            streaming_xes_log_source_from_file(gz_path, sort_by_timestamp=True, chunk_size=5).sink(collector)
+
+        self.assertEqual([e.get_event_time() for e in expected.elements], [e.get_event_time() for e in collector.elements])
+        # Events sharing the same timestamp may be in a different order
+        self.assertEqual(sorted((e.get_event_time(), e.get_trace_name(), e.get_event_name()) for e in expected.elements),
+                         sorted((e.get_event_time(), e.get_trace_name(), e.get_event_name()) for e in collector.elements))
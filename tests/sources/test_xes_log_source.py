@@ -0,0 +1,40 @@
+from pathlib import Path
+import unittest
+from typing import Any
+
+from pybeamline.bevent import BEvent
+from pybeamline.sources.xes_log_source import xes_log_source_from_file
+from pybeamline.stream.base_sink import BaseSink
+
+
+class CollectorSink(BaseSink[Any]):
+    def __init__(self):
+        self.elements = []
+
+    def consume(self, item: Any) -> None:
+        self.elements.append(item)
+
+
+class TestXesLogSource(unittest.TestCase):
+
+    def setUp(self):
+        self.log_path = str(Path(__file__).parent.parent / "running-example.xes")
+
+    def test_replay_is_time_ordered(self):
+        collector = CollectorSink()
+        xes_log_source_from_file(self.log_path).sink(collector)
+
+        self.assertEqual(42, len(collector.elements))
+        for event in collector.elements:
+            self.assertIsInstance(event, BEvent)
+            self.assertIn("org:resource", event.event_attributes)
+        times = [e.get_event_time() for e in collector.elements]
+        self.assertEqual(times, sorted(times))
+
+    def test_batched_replay_matches_single_replay(self):
+        single = CollectorSink()
+        xes_log_source_from_file(self.log_path).sink(single)
+        batched = CollectorSink()
+        xes_log_source_from_file(self.log_path, batch_size=10).sink(batched)
+
+        self.assertEqual([e.to_dict() for e in single.elements], [e.to_dict() for e in batched.elements])
@@ -7,6 +7,7 @@ from pybeamline.stream.base_filter import BaseFilter
 from pybeamline.stream.base_map import BaseMap
 from pybeamline.stream.base_sink import BaseSink
 from pybeamline.stream.base_source import BaseSource, T
+from pybeamline.stream.fused_operator import FusedOperator, fuse_operators
 from pybeamline.stream.stream import Stream
 
 class TestStream(unittest.TestCase):
@@ -281,6 +282,107 @@ class TestStream(unittest.TestCase):
 
         self.assertEqual(lst, [6, 12])
 
+    def test_flush_on_completion(self):
+
+        class PairMap(BaseMap[int, List[int]]):
+
+            def __init__(self):
+                self.pending: List[int] = []
+
+            def transform(self, value: int) -> Optional[List[List[int]]]:
+                self.pending.append(value)
+                if len(self.pending) == 2:
+                    pair, self.pending = self.pending, []
+                    return [pair]
+                return None
+
+            def flush(self) -> Optional[List[List[int]]]:
+                return [self.pending] if self.pending else None
+
+            def close(self) -> None:
+                self.closed = True
+
+        class LengthMap(BaseMap[List[int], int]):
+            def transform(self, value: List[int]) -> Optional[List[int]]:
+                return [len(value)]
+
+        pair_map = PairMap()
+        self.assertEqual(Stream.of(1, 2, 3).pipe(pair_map).to_list(), [[1, 2], [3]])
+        self.assertTrue(pair_map.closed)
+        # Flushed values go through the following stages of a fused chain
+        pair_map = PairMap()
+        self.assertEqual(Stream.of(1, 2, 3).pipe(pair_map, LengthMap()).to_list(), [2, 1])
+        self.assertTrue(pair_map.closed)
+
+    def test_pipe_fuses_consecutive_operators(self):
+
+        class EvenFilter(BaseFilter[int]):
+            def condition(self, value: int) -> bool:
+                return value % 2 == 0
+
+        class DuplicateMap(BaseMap[int, int]):
+            def transform(self, value: int) -> Optional[List[int]]:
+                return [value, value]
+
+        class ToStringMap(BaseMap[int, str]):
+            def transform(self, value: int) -> Optional[List[str]]:
+                return [str(value)]
+
+        operators = fuse_operators([EvenFilter(), DuplicateMap(), ToStringMap()])
+        self.assertEqual(len(operators), 1)
+        self.assertIsInstance(operators[0], FusedOperator)
+        self.assertEqual(operators[0].process(4), ['4', '4'])
+        self.assertEqual(operators[0].process(3), [])
+
+        lst = Stream.of(1, 2, 3, 4).pipe(EvenFilter(), DuplicateMap(), ToStringMap()).to_list()
+        self.assertEqual(lst, ['2', '2', '4', '4'])
+
+    def test_batched_source(self):
+
+        class BatchSource(BaseSource[int]):
+
+            def __init__(self, items: list[int], batch_size: int):
+                self._items = items
+                self._batch_size = batch_size
+
+            def execute(self) -> None:
+                for i in range(0, len(self._items), self._batch_size):
+                    self.produce_batch(self._items[i:i + self._batch_size])
+                self.completed()
+
+        class EvenFilter(BaseFilter[int]):
+            def condition(self, value: int) -> bool:
+                return value % 2 == 0
+
+        class BatchCountMap(BaseMap[int, int]):
+
+            def __init__(self):
+                self.batches = 0
+
+            def transform(self, value: int) -> Optional[List[int]]:
+                return [value * 10]
+
+            def transform_batch(self, values: List[int]) -> Optional[List[int]]:
+                self.batches += 1
+                return [value * 10 for value in values]
+
+        class CollectorSink(BaseSink[int]):
+            def __init__(self):
+                self.items: list[int] = []
+
+            def consume(self, item: int) -> None:
+                self.items.append(item)
+
+        counter = BatchCountMap()
+        batched_sink = CollectorSink()
+        Stream.source(BatchSource(list(range(10)), 4), batched=True).pipe(EvenFilter(), counter).sink(batched_sink)
+        self.assertEqual(batched_sink.items, [0, 20, 40, 60, 80])
+        self.assertEqual(counter.batches, 3)
+
+        unbatched_sink = CollectorSink()
+        Stream.source(BatchSource(list(range(10)), 4)).pipe(EvenFilter(), BatchCountMap()).sink(unbatched_sink)
+        self.assertEqual(unbatched_sink.items, [0, 20, 40, 60, 80])
+
     def test_concat(self):
 
         stream1 = Stream.of(1,2,3)
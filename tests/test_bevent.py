@@ -1,3 +1,4 @@
+import pickle
 from datetime import datetime
 from unittest import TestCase
 
@@ -24,6 +25,13 @@ class TestBEvent(TestCase):
         e = BEvent("act-a", "case-id", event_time=t)
         self.assertEqual(e.get_event_time(), t)
 
+    def test_event_time_is_resolved_once(self):
+        e = BEvent("act-a", "case-id")
+        t = e.get_event_time()
+        self.assertIsInstance(t, datetime)
+        self.assertIs(e.get_event_time(), t)
+        self.assertIs(e.event_attributes["time:timestamp"], t)
+
     def test_get_event_string(self):
         t = datetime.now()
         e = BEvent("act-a", "case-id", event_time=t)
@@ -35,3 +43,27 @@ class TestBEvent(TestCase):
         event_dict = e.to_dict()
         self.assertIsNotNone(event_dict)
         self.assertEqual(event_dict["concept:name"], "case-id")
+
+    def test_attributes_are_created_on_demand(self):
+        t = datetime.now()
+        e = BEvent("act-a", "case-id", event_time=t)
+        self.assertFalse(hasattr(e, "__dict__"))
+        self.assertEqual(e.event_attributes, {"concept:name": "act-a", "time:timestamp": t})
+        self.assertEqual(e.trace_attributes, {"concept:name": "case-id"})
+        self.assertEqual(e.process_attributes, {"concept:name": "ProcessName"})
+
+    def test_attribute_updates_are_visible_to_getters(self):
+        e = BEvent("act-a", "case-id")
+        e.event_attributes["concept:name"] = "act-b"
+        e.event_attributes["org:resource"] = "Pete"
+        e.trace_attributes["concept:name"] = "case-2"
+        self.assertEqual(e.get_event_name(), "act-b")
+        self.assertEqual(e.get_trace_name(), "case-2")
+        self.assertIn("'org:resource': 'Pete'", str(e))
+
+    def test_pickle_roundtrip(self):
+        t = datetime.now()
+        e = BEvent("act-a", "case-id", event_time=t)
+        e.event_attributes["org:resource"] = "Pete"
+        copy = pickle.loads(pickle.dumps(e))
+        self.assertEqual(copy.to_dict(), e.to_dict())
@@ -0,0 +1,84 @@
+import pickle
+import unittest
+from datetime import datetime, timedelta
+
+from pybeamline.algorithms.discovery.dfg_miner import SimpleDfgMiner
+from pybeamline.algorithms.discovery.heuristics_miner_lossy_counting import HeuristicsMinerLossyCounting
+from pybeamline.bevent import BEvent
+from pybeamline.symbol_table import SymbolTable
+
+
+def _events():
+    base_time = datetime(2024, 1, 1)
+    traces = ["ABCD", "ACBD", "ABCD", "AED", "ABCD"]
+    events = []
+    for i, trace in enumerate(traces):
+        for j, activity in enumerate(trace):
+            events.append(BEvent(activity, "c" + str(i), event_time=base_time + timedelta(minutes=10 * i + j)))
+    return events
+
+
+class TestSymbolTable(unittest.TestCase):
+
+    def test_encode_decode(self):
+        table = SymbolTable()
+        self.assertEqual(table.encode_activity("A"), 0)
+        self.assertEqual(table.encode_activity("B"), 1)
+        self.assertEqual(table.encode_activity("A"), 0)
+        self.assertEqual(table.decode_activity(1), "B")
+        self.assertIsNone(table.get_activity_code("C"))
+        self.assertEqual(table.number_of_activities(), 2)
+
+    def test_encode_event(self):
+        table = SymbolTable()
+        e = BEvent("A", "c1")
+        table.encode_event(e)
+        self.assertEqual(e.get_event_code(), 0)
+        self.assertEqual(table.activity_code(e), 0)
+        self.assertEqual(table.activity_code(BEvent("B", "c2")), 1)
+
+    def test_codes_of_another_table_are_not_reused(self):
+        other = SymbolTable()
+        other.encode_activity("X")
+        e = BEvent("A", "c1")
+        other.encode_event(e)
+
+        table = SymbolTable()
+        table.encode_activity("A")
+        table.encode_activity("B")
+        self.assertIs(e.get_symbol_table(), other)
+        self.assertEqual(table.activity_code(e), 0)
+
+    def test_pickle_round_trip(self):
+        table = SymbolTable()
+        e = BEvent("B", "c1")
+        table.encode_activity("A")
+        table.encode_event(e)
+        copy = pickle.loads(pickle.dumps(e))
+        copied_table = copy.get_symbol_table()
+        self.assertEqual(1, copy.get_event_code())
+        self.assertEqual("B", copied_table.decode_activity(copied_table.activity_code(copy)))
+        self.assertEqual(2, copied_table.encode_activity("C"))
+
+    def test_dfg_miner_with_symbol_table(self):
+        plain = SimpleDfgMiner(model_update_frequency=5, min_relative_frequency=0)
+        coded = SimpleDfgMiner(model_update_frequency=5, min_relative_frequency=0, symbol_table=SymbolTable())
+        expected = [m for e in _events() for m in (plain.transform(e) or [])]
+        actual = [m for e in _events() for m in (coded.transform(e) or [])]
+        self.assertEqual(expected, actual)
+
+    def test_heuristics_miner_with_symbol_table(self):
+        plain = HeuristicsMinerLossyCounting(max_approx_error=0.1)
+        table = SymbolTable()
+        coded = HeuristicsMinerLossyCounting(max_approx_error=0.1, symbol_table=table)
+        for e in _events():
+            plain.ingest_event(e)
+        for e in _events():
+            table.encode_event(e)
+            coded.ingest_event(e)
+        self.assertEqual(plain.get_model().dfg, coded.get_model().dfg)
+        self.assertEqual(plain.get_model().dependency_matrix, coded.get_model().dependency_matrix)
+
+
+if __name__ == '__main__':
+    unittest.main()